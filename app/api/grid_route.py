@@ -0,0 +1,31 @@
+"""
+API route class decoding request grids while the JSON body is parsed.
+"""
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.grid_codec import loads_with_grid
+
+
+class GridJSONRequest(Request):
+    """Request whose JSON body has ``environment.grid`` already decoded into a Grid."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            body = await self.body()
+            self._json = loads_with_grid(body)
+        return self._json
+
+
+class GridJSONRoute(APIRoute):
+    """Route class using GridJSONRequest, so body models receive a decoded Grid."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def grid_route_handler(request: Request) -> Response:
+            return await original_route_handler(GridJSONRequest(request.scope, request.receive))
+
+        return grid_route_handler
@@ -4,7 +4,7 @@ Health check endpoints for Mouse AI API.
 from fastapi import APIRouter
 
 from app.core.config import settings
-from app.models.schemas import HealthResponse
+from app.models.frontend import HealthResponse
 
 router = APIRouter(tags=["health"])
 
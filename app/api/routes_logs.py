@@ -1,15 +1,15 @@
 """
 Server-Sent Events endpoint for server logs streaming.
 """
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, HTTPException, Response
 from fastapi.responses import StreamingResponse
 import asyncio
-import json
 import logging
 from typing import AsyncGenerator
-from datetime import datetime
 
+from app.core.serialization import FastJSONResponse, iso_timestamp, sse_frame
 from app.services.log_service import log_service
+from app.services.log_subscriber import DROP_OLDEST, POLICIES
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["logs"])
@@ -18,29 +18,47 @@ router = APIRouter(tags=["logs"])
 
 
 @router.get("/logs/stream")
-async def stream_logs():
+async def stream_logs(policy: str = DROP_OLDEST, maxQueue: int = 100, sampleEvery: int = 1, client: str = ""):
     """
     Stream server logs using Server-Sent Events (SSE).
     
+    Args:
+        policy: Backpressure policy of this connection (drop_oldest, coalesce or sample)
+        maxQueue: Maximum number of entries buffered for this connection
+        sampleEvery: Keep one entry out of this many (sample policy)
+        client: Label of the connection in the log service stats
+    
     Returns:
         StreamingResponse: SSE stream of server logs
+    
+    Raises:
+        HTTPException: 400 on an unknown policy or invalid sizes
     """
-    async def event_generator() -> AsyncGenerator[str, None]:
+    if policy not in POLICIES:
+        raise HTTPException(status_code=400, detail=f"Unknown policy '{policy}', expected one of {list(POLICIES)}")
+    if maxQueue < 1 or sampleEvery < 1:
+        raise HTTPException(status_code=400, detail="maxQueue and sampleEvery must be positive")
+    
+    async def event_generator() -> AsyncGenerator[bytes, None]:
         """Generate SSE events for server logs."""
+        frame_cache = log_service.frame_cache
         try:
             # Envoyer un événement de connexion
-            yield f"data: {json.dumps({'type': 'connection', 'message': 'Connected to server logs stream', 'timestamp': datetime.now().isoformat()})}\n\n"
+            yield sse_frame({'type': 'connection', 'message': 'Connected to server logs stream', 'timestamp': iso_timestamp()})
             
-            # S'abonner aux logs du service
-            async for log_entry in log_service.get_logs_stream():
-                yield f"data: {json.dumps(log_entry)}\n\n"
+            # S'abonner aux logs du service (trames encodées une seule fois pour tous les clients)
+            async for log_entry in log_service.get_logs_stream(policy, maxQueue, sampleEvery, client):
+                if log_entry.get('type') in ('heartbeat', 'gap'):
+                    yield sse_frame(log_entry)
+                else:
+                    yield frame_cache.frame(log_entry)
                 
         except asyncio.CancelledError:
             logger.info("Client disconnected from logs stream")
-            yield f"data: {json.dumps({'type': 'disconnection', 'message': 'Disconnected from server logs stream', 'timestamp': datetime.now().isoformat()})}\n\n"
+            yield sse_frame({'type': 'disconnection', 'message': 'Disconnected from server logs stream', 'timestamp': iso_timestamp()})
         except Exception as e:
             logger.error(f"Error in logs stream: {e}")
-            yield f"data: {json.dumps({'type': 'error', 'message': f'Stream error: {str(e)}', 'timestamp': datetime.now().isoformat()})}\n\n"
+            yield sse_frame({'type': 'error', 'message': f'Stream error: {str(e)}', 'timestamp': iso_timestamp()})
     
     return StreamingResponse(
         event_generator(),
@@ -64,16 +82,17 @@ async def get_logs_history():
     """
     try:
         logs = log_service.get_recent_logs()
-        return {
+        # Rendu direct : les horodatages des entrées sont formatés par le sérialiseur partagé
+        return FastJSONResponse({
             "success": True,
             "logs": logs,
             "count": len(logs),
-            "timestamp": datetime.now().isoformat()
-        }
+            "timestamp": iso_timestamp()
+        })
     except Exception as e:
         logger.error(f"Error getting logs history: {e}")
         return {
             "success": False,
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_timestamp()
         }
@@ -1,22 +1,74 @@
 """
 Mouse movement endpoints compatible with the frontend.
 """
-from fastapi import APIRouter, HTTPException
-from typing import Dict, List, Any
+from fastapi import APIRouter, Header, HTTPException, Response
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, List, Any, Optional, Tuple, Union
 import logging
+import re
+import time
 
+from app.api.grid_route import GridJSONRoute
+from app.core.config import settings
+from app.core.grid import Grid
+from app.core.serialization import FastJSONResponse
+from app.core.utils import is_valid_position
+from app.models.frontend import ALL_DIRECTIONS, MouseMoveRequest, MouseMoveResponse, ResyncResponse
+from app.services.components import NO_COMPONENT, ComponentIndex
+from app.services.coordinator import CheeseCoordinator
+from app.services.distance_fields import DistanceFieldStore
+from app.services.environment_store import EnvironmentStore, ResyncNeeded
+from app.services.maze_cache import MazeDiskCache
+from app.services.shared_mazes import SharedMazeRegistry
+from app.services.single_flight import SingleFlight
 from app.services.mouse_ai_service import MouseAIService
+from app.services.path_trees import PathTreeStore
+from app.services.planner import ASTAR, PATH_TREE, PlannerSelector
+from app.services.reservations import ReservationRegistry, ReservationTable
 from app.services.log_service import log_service
 
 logger = logging.getLogger(__name__)
-router = APIRouter(tags=["mouse"])
+router = APIRouter(tags=["mouse"], route_class=GridJSONRoute)
+
+# Cell offset (dx, dy) of each move
+DIRECTION_STEPS: Dict[str, Tuple[int, int]] = {"north": (0, -1), "south": (0, 1), "east": (1, 0), "west": (-1, 0)}
 
 # Dictionary to store separate AI service instances for each mouse
 mouse_ai_services: Dict[str, MouseAIService] = {}
 
+# Versioned environments for delta updates, and the path cache shared by all mice
+environment_store = EnvironmentStore()
+# Identical concurrent path searches (same layout, start and goal) run once
+path_flight = SingleFlight()
+# Shortest-path tree of each cheese, shared by every mouse of a layout
+path_trees = PathTreeStore(flight=path_flight)
+environment_store.add_rebase_hook(path_trees.rebase)
+# Connected components of each layout, to skip the searches of unreachable cheeses
+components = ComponentIndex()
+
+maze_disk_cache = None
+if settings.MAZE_CACHE_DIR:
+    # Distance fields shared on disk by all the workers
+    maze_disk_cache = MazeDiskCache(settings.MAZE_CACHE_DIR, settings.MAZE_CACHE_MAX_MB * 1024 * 1024)
+# Layouts and distance fields published once for all the workers of the host
+shared_mazes = SharedMazeRegistry() if settings.SHARED_MAZES else None
+distance_fields = DistanceFieldStore(disk=maze_disk_cache, shared=shared_mazes)
+environment_store.add_rebase_hook(distance_fields.rebase)
+# Cooperative cheese assignment when the request lists the other mice
+cheese_coordinator = CheeseCoordinator(distance_fields)
+
+# Planning strategy of each move under the latency budget
+planner = PlannerSelector(settings.MOVE_BUDGET_MS)
 
-@router.post("/move")
-async def get_mouse_move(request: Dict[str, Any]) -> Dict[str, Any]:
+# Space-time reservations by simulation, to keep mice from walking into each other
+reservation_registry = ReservationRegistry()
+
+
+@router.post("/move", response_model=MouseMoveResponse, responses={409: {"model": ResyncResponse}})
+async def get_mouse_move(
+    request: MouseMoveRequest,
+    x_move_budget_ms: Optional[float] = Header(None, gt=0)
+) -> Union[MouseMoveResponse, Response]:
     """
     Get next move for a mouse based on the frontend request format.
     
@@ -25,7 +77,8 @@ async def get_mouse_move(request: Dict[str, Any]) -> Dict[str, Any]:
         "mouseId": "string",
         "position": {"x": int, "y": int},
         "environment": {
-            "grid": [["wall", "path", ...], ...],
+            "grid": [["wall", "path", ...], ...] or a compact encoding
+                    ({"format": "bitmask"|"rle", ...}, see app.core.grid_codec),
             "width": int,
             "height": int,
             "cheesePositions": [{"x": int, "y": int}, ...],
@@ -42,32 +95,91 @@ async def get_mouse_move(request: Dict[str, Any]) -> Dict[str, Any]:
         "availableMoves": ["north", "south", "east", "west"]
     }
     
+    The grid is decoded into a compact Grid while the request is validated.
+    
+    Delta updates: a request with "simulationId" and "environmentVersion"
+    and a full grid lets the server keep that environment. Following requests
+    may then replace "grid" with "cellDiffs": [{"x", "y", "cell"}, ...]
+    relative to "baseVersion" (environmentVersion - 1 by default). If the
+    server does not hold that version, it answers 409 with
+    {"status": "resync_needed", "environmentVersion": <held version>} and the
+    client must send the full grid again.
+    
     Returns:
     {
         "mouseId": "string",
         "move": "north|south|east|west",
-        "reasoning": "string"
+        "reasoning": "string",
+        "gridFormat": "cells|bitmask|rle|delta",
+        "status": "ok",
+        "environmentVersion": int | null,
+        "moves": ["north", ...] | null,
+        "planToken": "string" | null,
+        "strategy": "path_tree|astar|bounded|greedy",
+        "optimalityBound": float | null
     }
+    
+    Lookahead: with "horizon": K, "moves" holds up to K moves along the
+    planned path (the first one is "move") and "planToken" identifies the
+    environment version, goal and layout they were planned for. The client
+    may play them without calling again until the token no longer matches
+    (new environment version or goal cheese gone).
+    
+    Latency budget: the "X-Move-Budget-Ms" header (MOVE_BUDGET_MS by
+    default) lets the server trade accuracy for time on large mazes;
+    "strategy" reports the planner that ran (see app.services.planner), and
+    "optimalityBound" how much longer than the shortest path the planned
+    path may be (1.0 for a shortest path, null for a partial path or a
+    greedy move).
+    """
+    # Off the event loop: concurrent moves overlap, so identical searches can be coalesced
+    result = await run_in_threadpool(compute_move, request, budget_ms=x_move_budget_ms)
+    if isinstance(result, ResyncResponse):
+        return FastJSONResponse(status_code=409, content=result.model_dump())
+    return result
+
+
+def compute_move(
+    request: MouseMoveRequest,
+    environment: Optional[Tuple[Grid, List[List[int]], Optional[int]]] = None,
+    budget_ms: Optional[float] = None
+) -> Union[MouseMoveResponse, ResyncResponse]:
     """
+    Compute the move of one mouse; shared by POST /api/move and the WebSocket channel.
+    
+    Args:
+        request: Parsed move request
+        environment: (grid, cheeses, version) already resolved by the caller,
+            instead of the environment of the request
+        budget_ms: Latency budget of the move, MOVE_BUDGET_MS when None
+    
+    Returns:
+        MouseMoveResponse, or ResyncResponse when cell diffs do not apply
+        to the environment held by the server
+    
+    Raises:
+        HTTPException: If the delta fields are incomplete or out of the grid
+    """
+    mouse_id = request.mouseId
+    mouse_tag = _mouse_tag(mouse_id, request.mouseState.tag)
+    grid_format = request.environment.gridFormat
+    
     try:
-        # Extract data from request
-        mouse_id = request.get("mouseId", "unknown")
-        position = request.get("position", {"x": 0, "y": 0})
-        environment = request.get("environment", {})
-        mouse_state = request.get("mouseState", {})
-        available_moves = request.get("availableMoves", ["north", "south", "east", "west"])
-        
-        # Extract mouse tag from mouse_state or use mouse_id as fallback
-        mouse_tag = mouse_state.get("tag", mouse_id)
-        if isinstance(mouse_tag, str) and mouse_tag.isdigit():
-            mouse_tag = int(mouse_tag)
-        elif isinstance(mouse_tag, str):
-            # Try to extract number from mouse_id (e.g., "souris1" -> 1)
-            import re
-            match = re.search(r'(\d+)', mouse_id)
-            mouse_tag = int(match.group(1)) if match else 1
-        else:
-            mouse_tag = mouse_tag if isinstance(mouse_tag, int) else 1
+        python_grid, cheese_list, environment_version = environment or _resolve_environment(request)
+    except ResyncNeeded as e:
+        log_service.add_custom_log(
+            message=f"Thread {mouse_tag} - Resync needed for simulation {e.simulation_id}: {e}",
+            level="WARNING",
+            mouse_id=mouse_id,
+            mouse_tag=mouse_tag,
+            action="resync_needed"
+        )
+        return ResyncResponse(mouseId=mouse_id, environmentVersion=e.server_version, reasoning=str(e))
+    
+    try:
+        position = request.position.model_dump()
+        mouse_state = request.mouseState.model_dump(exclude_none=True)
+        available_moves = request.availableMoves or ALL_DIRECTIONS
             
         logger.info(f"- Thread {mouse_tag} - Received move request for mouse: {mouse_id}")
         
@@ -83,7 +195,10 @@ async def get_mouse_move(request: Dict[str, Any]) -> Dict[str, Any]:
         
         # Create or get AI service instance for this specific mouse
         if mouse_id not in mouse_ai_services:
-            mouse_ai_services[mouse_id] = MouseAIService(f"Thread {mouse_tag}")
+            mouse_ai_services[mouse_id] = MouseAIService(
+                f"Thread {mouse_tag}", path_cache=environment_store.path_cache,
+                path_flight=path_flight, path_trees=path_trees, components=components
+            )
             logger.info(f"- Thread {mouse_tag} - Created new AI service instance for mouse: {mouse_id}")
             
             # Log de création du service
@@ -97,62 +212,103 @@ async def get_mouse_move(request: Dict[str, Any]) -> Dict[str, Any]:
         
         mouse_ai_service = mouse_ai_services[mouse_id]
         
-        # Convert frontend grid format to Python format
-        grid = environment.get("grid", [])
-        python_grid = []
-        for row in grid:
-            python_row = []
-            for cell in row:
-                if cell == "wall":
-                    python_row.append(1)  # 1 = wall (impassable)
-                else:  # path, cheese, start = 0 (passable)
-                    python_row.append(0)
-            python_grid.append(python_row)
-        
-        # Debug: Log the grid conversion
-        print(f"Frontend grid: {grid}")
-        print(f"Python grid: {python_grid}")
-        print(f"Mouse position: {position}")
+        # Grid already decoded during validation or rebuilt from the held version (1 = wall, 0 = passable)
         
         # Find the nearest cheese as goal
-        cheese_positions = environment.get("cheesePositions", [])
-        if not cheese_positions:
+        if not cheese_list:
             # No cheese, use random movement
             import random
             move = random.choice(available_moves)
-            return {
-                "mouseId": mouse_id,
-                "move": move,
-                "reasoning": "No cheese found, random movement"
-            }
+            return MouseMoveResponse(
+                mouseId=mouse_id,
+                move=move,
+                reasoning="No cheese found, random movement",
+                gridFormat=grid_format,
+                environmentVersion=environment_version
+            )
+        
+        # Trees of the cheeses eaten in every simulation on this layout are no longer needed;
+        # without a simulation id, the LRU alone bounds the trees
+        if request.simulationId:
+            path_trees.retain(request.simulationId, python_grid.digest, cheese_list)
         
         # Find closest cheese
-        current_pos = [position["x"], position["y"]]
+        current_pos = request.position.to_list()
         
         # Check if mouse is already on a cheese
-        for cheese in cheese_positions:
-            if current_pos[0] == cheese["x"] and current_pos[1] == cheese["y"]:
-                return {
-                    "mouseId": mouse_id,
-                    "move": "north",  # Use a valid direction but the frontend should handle this
-                    "reasoning": f"Mouse is already on cheese at ({cheese['x']}, {cheese['y']}) - staying in place"
-                }
+        for cheese_x, cheese_y in cheese_list:
+            if current_pos[0] == cheese_x and current_pos[1] == cheese_y:
+                return MouseMoveResponse(
+                    mouseId=mouse_id,
+                    move="north",  # Use a valid direction but the frontend should handle this
+                    reasoning=f"Mouse is already on cheese at ({cheese_x}, {cheese_y}) - staying in place",
+                    gridFormat=grid_format,
+                    environmentVersion=environment_version
+                )
         
-        closest_cheese = cheese_positions[0]
-        min_distance = abs(current_pos[0] - closest_cheese["x"]) + abs(current_pos[1] - closest_cheese["y"])
+        # Only the cheeses of the mouse's component can be reached; a mouse on a wall
+        # or outside the grid has no component, and all the cheeses stay candidates
+        if components.component(python_grid, current_pos) == NO_COMPONENT:
+            candidates = cheese_list
+        else:
+            candidates = components.reachable(python_grid, current_pos, cheese_list)
         
-        for cheese in cheese_positions[1:]:
-            distance = abs(current_pos[0] - cheese["x"]) + abs(current_pos[1] - cheese["y"])
+        if not candidates:
+            # Every cheese is walled off: explore in case the maze opens, stay when boxed in
+            exploration = _exploration_move(python_grid, current_pos, available_moves)
+            # Like a planned move, so that back-and-forth detection sees it on the next request
+            mouse_ai_service.position_history.append(current_pos)
+            reasoning = "No reachable cheese, exploring" if exploration else "No reachable cheese, staying in place"
+            log_service.add_custom_log(
+                message=f"Thread {mouse_tag} - No reachable cheese for mouse {mouse_id}",
+                level="INFO",
+                mouse_id=mouse_id,
+                mouse_tag=mouse_tag,
+                action="no_reachable_cheese"
+            )
+            return MouseMoveResponse(
+                mouseId=mouse_id,
+                move=exploration or "north",  # Same placeholder as the other stay-in-place answers
+                reasoning=reasoning,
+                gridFormat=grid_format,
+                environmentVersion=environment_version
+            )
+        
+        closest_cheese = candidates[0]
+        min_distance = abs(current_pos[0] - closest_cheese[0]) + abs(current_pos[1] - closest_cheese[1])
+        
+        for cheese in candidates[1:]:
+            distance = abs(current_pos[0] - cheese[0]) + abs(current_pos[1] - cheese[1])
             if distance < min_distance:
                 min_distance = distance
                 closest_cheese = cheese
         
-        goal_position = [closest_cheese["x"], closest_cheese["y"]]
+        goal_position = list(closest_cheese)
+        
+        # Cheese positions in list format for AI optimization
+        available_cheeses_list = candidates
+        
+        # With the other mice known, target the cheese assigned to this mouse
+        mice_positions = request.environment.other_mouse_positions()
+        reservations, tick = None, 0
+        if mice_positions:
+            # Ticks only mean the same time step for all the mice of a versioned simulation
+            if request.simulationId and environment_version is not None:
+                reservations, tick = _reserve_other_mice(request.simulationId, mice_positions, environment_version)
+            mice_positions[mouse_id] = current_pos
+            assigned = cheese_coordinator.assign(python_grid, mice_positions, cheese_list).get(mouse_id)
+            if assigned is not None:
+                goal_position = assigned
+                available_cheeses_list = [assigned]
+                min_distance = abs(current_pos[0] - assigned[0]) + abs(current_pos[1] - assigned[1])
         
-        # Convert cheese positions to list format for AI optimization
-        available_cheeses_list = []
-        for cheese in cheese_positions:
-            available_cheeses_list.append([cheese["x"], cheese["y"]])
+        # Strategy expected to fit the budget, from the maze size and the measured costs
+        cells = python_grid.width * python_grid.height
+        missing_trees = path_trees.missing(python_grid.digest, available_cheeses_list)
+        strategy, node_limit = planner.select(cells, len(available_cheeses_list), missing_trees, budget_ms)
+        nodes_before = mouse_ai_service.nodes_expanded
+        started = time.perf_counter()
+        budget = budget_ms if budget_ms is not None else planner.default_budget_ms
         
         # Get next move using the AI service with available cheeses
         next_position = mouse_ai_service.calculate_next_position(
@@ -160,27 +316,39 @@ async def get_mouse_move(request: Dict[str, Any]) -> Dict[str, Any]:
             current_position=current_pos,
             goal_position=goal_position,
             mouse_id=mouse_id,
-            available_cheeses=available_cheeses_list
+            available_cheeses=available_cheeses_list,
+            reservations=reservations,
+            tick=tick,
+            strategy=strategy,
+            node_limit=node_limit,
+            deadline=started + budget / 1000 if budget is not None else None
         )
         
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if strategy == PATH_TREE:
+            planner.record(PATH_TREE, cells * missing_trees, elapsed_ms)
+        else:
+            planner.record(ASTAR, mouse_ai_service.nodes_expanded - nodes_before, elapsed_ms)
+        
         # Convert position change to direction
         move = _position_to_direction(current_pos, next_position)
         
         # Generate intelligent reasoning
-        distance_to_cheese = abs(current_pos[0] - closest_cheese['x']) + abs(current_pos[1] - closest_cheese['y'])
+        distance_to_cheese = min_distance
+        cheese_x, cheese_y = goal_position
         
         if next_position == current_pos:
             reasoning = f"Staying in place - no valid moves available"
-        elif move == "north":
-            reasoning = f"Moving north towards cheese at ({closest_cheese['x']}, {closest_cheese['y']}) - distance: {distance_to_cheese}"
-        elif move == "south":
-            reasoning = f"Moving south towards cheese at ({closest_cheese['x']}, {closest_cheese['y']}) - distance: {distance_to_cheese}"
-        elif move == "east":
-            reasoning = f"Moving east towards cheese at ({closest_cheese['x']}, {closest_cheese['y']}) - distance: {distance_to_cheese}"
-        elif move == "west":
-            reasoning = f"Moving west towards cheese at ({closest_cheese['x']}, {closest_cheese['y']}) - distance: {distance_to_cheese}"
+        elif move in ALL_DIRECTIONS:
+            reasoning = f"Moving {move} towards cheese at ({cheese_x}, {cheese_y}) - distance: {distance_to_cheese}"
         else:
-            reasoning = f"Moving {move} towards cheese at ({closest_cheese['x']}, {closest_cheese['y']})"
+            reasoning = f"Moving {move} towards cheese at ({cheese_x}, {cheese_y})"
+        
+        # Lookahead: the next moves along the A* path, valid while the plan token holds
+        moves, plan_token = None, None
+        if request.horizon is not None:
+            moves, plan_goal = _plan_moves(mouse_ai_service, current_pos, next_position, goal_position, request.horizon)
+            plan_token = _plan_token(python_grid, environment_version, plan_goal)
         
         logger.info(f"- Thread {mouse_tag} - Returning move: {move} - {reasoning}")
         
@@ -194,15 +362,21 @@ async def get_mouse_move(request: Dict[str, Any]) -> Dict[str, Any]:
             current_position=current_pos,
             next_position=next_position,
             reasoning=reasoning,
-            cheese_target=closest_cheese,
+            cheese_target={"x": cheese_x, "y": cheese_y},
             distance_to_cheese=distance_to_cheese
         )
         
-        return {
-            "mouseId": mouse_id,
-            "move": move,
-            "reasoning": reasoning
-        }
+        return MouseMoveResponse(
+            mouseId=mouse_id,
+            move=move,
+            reasoning=reasoning,
+            gridFormat=grid_format,
+            environmentVersion=environment_version,
+            moves=moves,
+            planToken=plan_token,
+            strategy=mouse_ai_service.last_strategy,
+            optimalityBound=mouse_ai_service.last_bound
+        )
         
     except Exception as e:
         logger.error(f"Error processing mouse move request: {str(e)}")
@@ -219,8 +393,7 @@ async def get_mouse_move(request: Dict[str, Any]) -> Dict[str, Any]:
         
         # Fallback to random movement
         import random
-        available_moves = request.get("availableMoves", ["north", "south", "east", "west"])
-        move = random.choice(available_moves)
+        move = random.choice(request.availableMoves or ALL_DIRECTIONS)
         
         # Log du mouvement de fallback
         log_service.add_custom_log(
@@ -232,11 +405,133 @@ async def get_mouse_move(request: Dict[str, Any]) -> Dict[str, Any]:
             action="random_fallback"
         )
         
-        return {
-            "mouseId": request.get("mouseId", "unknown"),
-            "move": move,
-            "reasoning": f"Error occurred, using random movement: {str(e)}"
-        }
+        return MouseMoveResponse(
+            mouseId=mouse_id,
+            move=move,
+            reasoning=f"Error occurred, using random movement: {str(e)}",
+            gridFormat=grid_format,
+            environmentVersion=environment_version
+        )
+
+
+def _resolve_environment(request: MouseMoveRequest) -> Tuple[Grid, List[List[int]], Optional[int]]:
+    """
+    Return the grid, cheese positions and environment version of a move request.
+    
+    Full environments sent with a simulationId and environmentVersion are
+    stored; cell diffs are applied on top of the stored version.
+    
+    Raises:
+        ResyncNeeded: If the diffs do not apply to the stored version
+        HTTPException: If the delta fields are incomplete or out of the grid
+    """
+    environment = request.environment
+    cheeses = [cheese.to_list() for cheese in environment.cheesePositions]
+    simulation_id = request.simulationId
+    version = request.environmentVersion
+    
+    if environment.cellDiffs is not None:
+        if simulation_id is None or version is None:
+            raise HTTPException(status_code=422, detail="cellDiffs require simulationId and environmentVersion")
+        base_version = request.baseVersion if request.baseVersion is not None else version - 1
+        diffs = [(diff.x, diff.y, diff.cell) for diff in environment.cellDiffs]
+        try:
+            session = environment_store.apply_diffs(simulation_id, base_version, version, diffs)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if "cheesePositions" not in environment.model_fields_set:
+            cheeses = session.cheese_positions()
+        return session.grid, cheeses, session.version
+    
+    if simulation_id is not None and version is not None:
+        environment_store.put(simulation_id, version, environment.grid, cheeses)
+    return environment.grid, cheeses, version
+
+
+def _reserve_other_mice(
+    simulation_id: str,
+    others: Dict[str, List[int]],
+    environment_version: int
+) -> Tuple[ReservationTable, int]:
+    """
+    Get the reservation table of a simulation and hold the cells of the other mice.
+
+    The tick is the environment version, shared by all the mice of the
+    simulation (requests without simulationId or environmentVersion make no
+    reservation). Mice that have not reserved a plan for the next tick keep
+    their current cell.
+
+    Returns:
+        Tuple[ReservationTable, int]: Table and current tick
+    """
+    table = reservation_registry.table(simulation_id)
+    tick = environment_version
+    table.advance(tick)
+    for other_id, position in others.items():
+        if not table.has_plan(other_id, tick + 1):
+            table.reserve_position(other_id, position, tick)
+    return table, tick
+
+
+def _plan_moves(
+    mouse_ai_service: MouseAIService,
+    current_pos: List[int],
+    next_position: List[int],
+    goal_position: List[int],
+    horizon: int
+) -> Tuple[List[str], List[int]]:
+    """
+    Return up to ``horizon`` moves starting with the computed one, and the goal they lead to.
+    
+    The following moves come from the A* path of the decision, when the
+    computed move follows it (not after an avoidance or exploration move).
+    """
+    path = mouse_ai_service.last_path
+    if next_position == current_pos:
+        return [_position_to_direction(current_pos, next_position)], goal_position
+    if len(path) > 1 and path[0] == current_pos and path[1] == next_position:
+        positions = path[:horizon + 1]
+        goal = path[-1]
+    else:
+        positions = [current_pos, next_position]
+        goal = goal_position
+    moves = [_position_to_direction(a, b) for a, b in zip(positions, positions[1:])]
+    return moves, list(goal)
+
+
+def _plan_token(grid: Grid, environment_version: Optional[int], goal: List[int]) -> str:
+    """
+    Validity token of a plan: ``"<environmentVersion>:<goal x>,<goal y>:<layout digest>"``.
+    
+    The plan holds while the environment version (or, for unversioned
+    clients, the layout digest) is unchanged and the goal cheese is still there.
+    """
+    version = "" if environment_version is None else str(environment_version)
+    return f"{version}:{goal[0]},{goal[1]}:{grid.digest[:16]}"
+
+
+def _mouse_tag(mouse_id: str, tag: Optional[Union[int, str]]) -> int:
+    """Extract the numeric mouse tag from mouse_state or from the mouse id (e.g. "souris1" -> 1)."""
+    if tag is None:
+        tag = mouse_id
+    if isinstance(tag, int):
+        return tag
+    if tag.isdigit():
+        return int(tag)
+    match = re.search(r'(\d+)', mouse_id)
+    return int(match.group(1)) if match else 1
+
+
+def _exploration_move(grid: Grid, current_pos: List[int], available_moves: List[str]) -> Optional[str]:
+    """Random available move to a free cell, None when every neighbor is blocked."""
+    import random
+    moves = [
+        move for move in available_moves
+        if move in DIRECTION_STEPS and is_valid_position(
+            [current_pos[0] + DIRECTION_STEPS[move][0], current_pos[1] + DIRECTION_STEPS[move][1]], grid
+        )
+    ]
+    return random.choice(moves) if moves else None
 
 
 def _position_to_direction(current_pos: List[int], next_pos: List[int]) -> str:
@@ -266,6 +561,19 @@ async def cleanup_mouse_services() -> Dict[str, str]:
     return {"status": "cleaned", "instances_removed": str(count)}
 
 
+@router.get("/pathfinding/stats")
+async def pathfinding_stats() -> Dict[str, Any]:
+    """Path cache, search coalescing, path tree, distance field and planner counters."""
+    return {
+        "path_cache": environment_store.path_cache.stats(),
+        "coalescing": path_flight.stats(),
+        "path_trees": path_trees.stats(),
+        "distance_fields": distance_fields.stats(),
+        "components": components.stats(),
+        "planner": planner.stats()
+    }
+
+
 @router.get("/health")
 async def health_check() -> Dict[str, str]:
     """Health check endpoint."""
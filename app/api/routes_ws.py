@@ -0,0 +1,184 @@
+"""
+WebSocket move channel: one persistent connection per frontend simulation.
+
+The client registers its maze once, then streams move requests for any
+number of mice on the same socket. Moves are computed concurrently and
+answered as soon as they are ready, possibly out of order, each response
+carrying the ``requestId`` of its request.
+
+Messages (JSON text frames):
+    {"type": "register", "simulationId": str, "environmentVersion": int, "environment": {...}}
+        -> {"type": "registered", "simulationId": str, "environmentVersion": int}
+    {"type": "update", "environmentVersion": int, "baseVersion": int, "cellDiffs": [...]}
+        -> {"type": "updated", "environmentVersion": int}
+    {"type": "move", "requestId": any, "mouseId": str, "position": {...}, ...}
+        -> {"type": "move", "requestId": any, "mouseId": str, "move": str, ...}
+
+A move without a grid uses the registered environment (its ``environment``
+may still carry ``otherMice``); a move with a full environment is handled
+exactly like POST /api/move. Errors are answered with
+{"type": "error", "requestId": any, "status": int, "detail": str}, and with
+{"type": "resync_needed", ...} when the held environment is not the
+expected version.
+"""
+import asyncio
+import itertools
+import logging
+from typing import Any, Dict, Optional, Set
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.grid_codec import loads_with_grid
+from app.core.serialization import dumps
+from app.models.frontend import MouseMoveRequest, RegisterMessage, ResyncResponse, UpdateMessage
+from app.api.routes_mouse import compute_move, environment_store
+from app.services.environment_store import ResyncNeeded
+
+logger = logging.getLogger(__name__)
+router = APIRouter(tags=["mouse"])
+
+# Moves computed at the same time for one connection; reading waits beyond that
+MAX_IN_FLIGHT = 256
+
+_connection_ids = itertools.count(1)
+
+
+@router.websocket("/ws/move")
+async def move_channel(websocket: WebSocket):
+    """Persistent move channel (see the module docstring for the protocol)."""
+    await websocket.accept()
+    channel = MoveChannel(websocket)
+    try:
+        await channel.run()
+    except WebSocketDisconnect:
+        logger.info(f"Move channel {channel.simulation_id} disconnected")
+    finally:
+        await channel.close()
+
+
+class MoveChannel:
+    """State of one WebSocket move connection."""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.simulation_id = f"ws-{next(_connection_ids)}"
+        self._send_lock = asyncio.Lock()
+        self._mouse_locks: Dict[str, asyncio.Lock] = {}
+        self._in_flight = asyncio.Semaphore(MAX_IN_FLIGHT)
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def run(self):
+        """Read messages until the client disconnects."""
+        while True:
+            message = await self.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            raw = message.get("bytes") or (message.get("text") or "").encode("utf-8")
+            try:
+                data = loads_with_grid(raw)
+            except ValueError as e:
+                await self.send({"type": "error", "requestId": None, "status": 400, "detail": f"Invalid JSON: {e}"})
+                continue
+            if not isinstance(data, dict):
+                await self.send({"type": "error", "requestId": None, "status": 400, "detail": "Messages must be JSON objects"})
+                continue
+
+            kind = data.get("type", "move")
+            if kind == "move":
+                await self._in_flight.acquire()
+                task = asyncio.create_task(self._move(data))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            elif kind == "register":
+                await self._register(data)
+            elif kind == "update":
+                await self._update(data)
+            else:
+                await self.send({"type": "error", "requestId": data.get("requestId"), "status": 400, "detail": f"Unknown message type '{kind}'"})
+
+    async def send(self, payload: Dict[str, Any]):
+        """Send one message; sends from concurrent moves are serialized."""
+        frame = dumps(payload).decode("utf-8")
+        async with self._send_lock:
+            await self.websocket.send_text(frame)
+
+    async def close(self):
+        """Cancel the moves still being computed."""
+        for task in list(self._tasks):
+            task.cancel()
+
+    async def _register(self, data: Dict[str, Any]):
+        try:
+            message = RegisterMessage.model_validate(data)
+        except ValidationError as e:
+            await self.send({"type": "error", "requestId": data.get("requestId"), "status": 422, "detail": str(e)})
+            return
+        if message.simulationId:
+            self.simulation_id = message.simulationId
+        cheeses = [cheese.to_list() for cheese in message.environment.cheesePositions]
+        environment_store.put(self.simulation_id, message.environmentVersion, message.environment.grid, cheeses)
+        await self.send({
+            "type": "registered",
+            "simulationId": self.simulation_id,
+            "environmentVersion": message.environmentVersion,
+            "gridFormat": message.environment.gridFormat
+        })
+
+    async def _update(self, data: Dict[str, Any]):
+        try:
+            message = UpdateMessage.model_validate(data)
+            base_version = message.baseVersion if message.baseVersion is not None else message.environmentVersion - 1
+            diffs = [(diff.x, diff.y, diff.cell) for diff in message.cellDiffs]
+            session = environment_store.apply_diffs(self.simulation_id, base_version, message.environmentVersion, diffs)
+        except ResyncNeeded as e:
+            await self.send({"type": "resync_needed", "environmentVersion": e.server_version, "reasoning": str(e)})
+            return
+        except (ValidationError, ValueError) as e:
+            await self.send({"type": "error", "requestId": data.get("requestId"), "status": 422, "detail": str(e)})
+            return
+        await self.send({"type": "updated", "environmentVersion": session.version})
+
+    async def _move(self, data: Dict[str, Any]):
+        request_id = data.get("requestId")
+        try:
+            payload = await self._compute(data)
+        except HTTPException as e:
+            payload = {"type": "error", "status": e.status_code, "detail": e.detail}
+        except ValidationError as e:
+            payload = {"type": "error", "status": 422, "detail": str(e)}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error in move channel {self.simulation_id}: {e}")
+            payload = {"type": "error", "status": 500, "detail": str(e)}
+        finally:
+            self._in_flight.release()
+        payload["requestId"] = request_id
+        try:
+            await self.send(payload)
+        except (WebSocketDisconnect, RuntimeError):
+            pass  # Client gone before the answer
+
+    async def _compute(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        environment_data = data.get("environment") or {}
+        registered = environment_data.get("grid") is None and environment_data.get("cellDiffs") is None
+        if registered:
+            data = {**data, "simulationId": self.simulation_id}
+        request = MouseMoveRequest.model_validate(data)
+
+        resolved = None
+        if registered:
+            session = environment_store.get(self.simulation_id)
+            if session is None:
+                raise HTTPException(status_code=409, detail="Register an environment before sending moves without a grid")
+            resolved = (session.grid, session.cheese_positions(), session.version)
+
+        # Moves of one mouse are computed in order, other mice run concurrently
+        lock = self._mouse_locks.setdefault(request.mouseId, asyncio.Lock())
+        async with lock:
+            result = await run_in_threadpool(compute_move, request, resolved)
+        if isinstance(result, ResyncResponse):
+            return {"type": "resync_needed", **result.model_dump()}
+        return {"type": "move", **result.model_dump()}
@@ -15,6 +15,8 @@ class Settings:
     # Server settings
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8000"))
+    # Processus uvicorn en mode production (start_server.py --production)
+    WORKERS: int = int(os.getenv("WORKERS", "1"))
     
     # CORS settings
     CORS_ORIGINS: list = os.getenv("CORS_ORIGINS", "*").split(",")
@@ -23,6 +25,22 @@ class Settings:
     MODEL_PATH: Optional[str] = os.getenv("MODEL_PATH")
     USE_AI_AGENT: bool = os.getenv("USE_AI_AGENT", "false").lower() == "true"
     
+    # Lifecycle settings (see app.services.container)
+    # Directory of known mazes (*.json) used to warm the pathfinding caches at startup
+    WARM_CACHE_DIR: Optional[str] = os.getenv("WARM_CACHE_DIR")
+    # Periodic demo server logs (ServerLogThread)
+    SERVER_LOG_THREAD: bool = os.getenv("SERVER_LOG_THREAD", "false").lower() == "true"
+    
+    # Preprocessed maze artifacts shared by the workers (app.services.maze_cache), disabled when unset
+    MAZE_CACHE_DIR: Optional[str] = os.getenv("MAZE_CACHE_DIR")
+    MAZE_CACHE_MAX_MB: int = int(os.getenv("MAZE_CACHE_MAX_MB", "256"))
+    
+    # Mazes and distance fields published in shared memory for all the workers (app.services.shared_mazes)
+    SHARED_MAZES: bool = os.getenv("SHARED_MAZES", "false").lower() == "true"
+    
+    # Latency budget of a move in ms (app.services.planner), overridden by the X-Move-Budget-Ms header; no limit when unset
+    MOVE_BUDGET_MS: Optional[float] = float(os.environ["MOVE_BUDGET_MS"]) if os.getenv("MOVE_BUDGET_MS") else None
+    
     # API settings
     MAX_LABYRINTH_SIZE: int = int(os.getenv("MAX_LABYRINTH_SIZE", "100"))
     
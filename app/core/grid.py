@@ -0,0 +1,95 @@
+"""
+Compact labyrinth representation.
+"""
+import hashlib
+from typing import Iterable, List, Optional
+
+FREE = 0
+WALL = 1
+
+
+class Grid(list):
+    """
+    Labyrinth stored as one ``bytes`` object per row (0=free, 1=wall).
+
+    ``grid[y][x]`` returns an int exactly like the ``List[List[int]]``
+    labyrinths used across the services, so a Grid can be passed anywhere a
+    labyrinth is expected. Grids are meant to be treated as immutable: the
+    content digest is computed once and cached.
+    """
+
+    __slots__ = ("width", "height", "_digest")
+
+    def __init__(self, rows: Iterable[bytes] = ()):
+        """
+        Build a grid from its rows.
+
+        Args:
+            rows: One bytes-like object per row, all of the same length
+
+        Raises:
+            ValueError: If rows have different widths
+        """
+        super().__init__(bytes(row) for row in rows)
+        self.height = len(self)
+        self.width = len(self[0]) if self else 0
+        self._digest: Optional[str] = None
+        for row in self:
+            if len(row) != self.width:
+                raise ValueError("All grid rows must have the same width")
+
+    @classmethod
+    def from_cells(cls, cells: List[List[str]]) -> "Grid":
+        """
+        Decode the frontend grid format (``"wall"``, ``"path"``, ``"cheese"``...).
+
+        Only ``"wall"`` cells are impassable.
+        """
+        return cls(bytes([cell == "wall" for cell in row]) for row in cells)
+
+    @classmethod
+    def from_buffer(cls, buffer: memoryview, width: int, digest: Optional[str] = None) -> "Grid":
+        """
+        Wrap cells stored row by row in a buffer, without copying them.
+
+        The rows are memoryviews (``grid[y][x]`` is still an int); the
+        buffer must outlive the grid and must not change.
+
+        Args:
+            buffer: width * height cells
+            width: Row length
+            digest: Known layout digest, computed on demand otherwise
+        """
+        grid = cls.__new__(cls)
+        view = memoryview(buffer)
+        list.__init__(grid, (view[start:start + width] for start in range(0, len(view), width)))
+        grid.height = len(grid)
+        grid.width = width if grid.height else 0
+        grid._digest = digest
+        return grid
+
+    @classmethod
+    def from_labyrinth(cls, labyrinth: List[List[int]]) -> "Grid":
+        """Convert a ``List[List[int]]`` labyrinth (0=free, 1=wall)."""
+        if isinstance(labyrinth, Grid):
+            return labyrinth
+        return cls(bytes(row) for row in labyrinth)
+
+    @property
+    def digest(self) -> str:
+        """Content hash identifying the maze layout."""
+        if self._digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            hasher.update(f"{self.width}x{self.height}:".encode())
+            for row in self:
+                hasher.update(row)
+            self._digest = hasher.hexdigest()
+        return self._digest
+
+    def to_bytes(self) -> bytes:
+        """Return all cells row by row as a single bytes object."""
+        return b"".join(self)
+
+    def to_cells(self) -> List[List[str]]:
+        """Encode back to the frontend grid format."""
+        return [["wall" if cell == WALL else "path" for cell in row] for row in self]
@@ -0,0 +1,299 @@
+"""
+Decoding of request grids.
+
+A frontend grid is a list of rows of cell names ("wall", "path",
+"cheese"...). Decoding it through ``json.loads`` builds one Python string
+per cell before it is converted; on a 100x100 maze that dominates request
+parsing. Here the grid array is located in the body bytes and decoded with
+vectorized NumPy operations into a Grid, while the rest of the body (a few
+hundred bytes) goes through the regular JSON decoder.
+
+Clients may also send one of the compact encodings below instead of the
+cell names (``environment.grid`` is then an object):
+
+- ``{"format": "bitmask", "width": W, "height": H, "data": "<base64>"}``:
+  one bit per cell, row-major, most significant bit first, 1 = wall, the
+  last byte padded with zeros.
+- ``{"format": "rle", "width": W, "height": H, "rows": ["3,1,96", ...]}``:
+  per row, comma-separated lengths of alternating runs of free cells and
+  walls, starting with free cells (a row starting with a wall begins with
+  0). Rows are strings so that JSON decoding does not build one int per run.
+
+The declared width and height are bounded by ``settings.MAX_LABYRINTH_SIZE``
+before anything is allocated: a few bytes of RLE would otherwise describe
+a grid of hundreds of megabytes.
+"""
+import base64
+import binascii
+import json
+import re
+import secrets
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.grid import Grid
+
+_ENVIRONMENT_KEY = re.compile(rb'"environment"\s*:\s*\{')
+_GRID_KEY = re.compile(rb'"grid"\s*:\s*\[')
+_GRID_END = re.compile(rb'\]\s*\]')
+
+_QUOTE = ord('"')
+_BACKSLASH = ord('\\')
+_WALL = np.frombuffer(b'wall', dtype=np.uint8)
+_WHITESPACE = b' \t\r\n'
+
+_RLE_TEXT = re.compile(r"[0-9,]*")
+
+CELLS_FORMAT = "cells"
+BITMASK_FORMAT = "bitmask"
+RLE_FORMAT = "rle"
+GRID_FORMATS = (CELLS_FORMAT, BITMASK_FORMAT, RLE_FORMAT)
+# Reported when the request carries cell diffs instead of a grid
+DELTA_FORMAT = "delta"
+
+# Below this body size, NumPy call overhead outweighs the per-cell savings
+FAST_PATH_MIN_BYTES = 16 * 1024
+
+
+def _skeleton(width: int, height: int) -> bytes:
+    """Expected structure of a grid once cell names and whitespace are removed."""
+    row = b'[' + b','.join([b'""'] * width) + b']'
+    return b'[' + b','.join([row] * height) + b']'
+
+
+def decode_grid_span(span: bytes) -> Optional[Grid]:
+    """
+    Decode the JSON text of a grid array (``[["wall","path"],...]``).
+
+    Args:
+        span: JSON text of the array, brackets included
+
+    Returns:
+        Optional[Grid]: Decoded grid, or None if the text is not a plain
+        rectangular array of strings (the caller then falls back to the
+        regular JSON decoder)
+    """
+    data = np.frombuffer(span, dtype=np.uint8)
+    is_quote = data == _QUOTE
+    if (data == _BACKSLASH).any():
+        return None
+
+    quotes = np.flatnonzero(is_quote)
+    if len(quotes) % 2:
+        return None
+    opening, closing = quotes[0::2], quotes[1::2]
+
+    # Without escapes, quote parity tells cell names apart from the structure,
+    # which must then be exactly a rectangular array of strings
+    inside = np.logical_xor.accumulate(is_quote) & ~is_quote
+    skeleton = data[~inside].tobytes().translate(None, _WHITESPACE)
+    first_row_end = skeleton.find(b']')
+    if first_row_end < 0:
+        return None
+    width = skeleton.count(b'"', 0, first_row_end) // 2
+    height = len(opening) // width if width else skeleton.count(b'[') - 1
+    if height < 1 or skeleton != _skeleton(width, height):
+        return None
+
+    walls = closing - opening == len(_WALL) + 1
+    for offset, char in enumerate(_WALL, start=1):
+        walls &= data[np.minimum(opening + offset, len(data) - 1)] == char
+
+    cells = walls.view(np.uint8).tobytes()
+    return Grid(cells[y * width:(y + 1) * width] for y in range(height))
+
+
+def split_grid(body: bytes, placeholder: bytes = b"null") -> Optional[Tuple[bytes, Grid]]:
+    """
+    Extract and decode the first ``"grid"`` array after the ``"environment"`` key of a JSON body.
+
+    The array found may still belong to another field (a nested object of
+    the environment): callers check where the placeholder ends up.
+
+    Args:
+        body: Raw JSON body
+        placeholder: JSON value put in place of the grid
+
+    Returns:
+        Optional[Tuple[bytes, Grid]]: Body with the grid replaced by the
+        placeholder and the decoded grid, or None when no plain grid was found
+    """
+    environment = _ENVIRONMENT_KEY.search(body)
+    if environment is None:
+        return None
+    match = _GRID_KEY.search(body, environment.end())
+    if match is None:
+        return None
+    start = match.end() - 1
+    end_match = _GRID_END.search(body, start)
+    if end_match is None:
+        return None
+    end = end_match.end()
+
+    grid = decode_grid_span(body[start:end])
+    if grid is None:
+        return None
+    return body[:start] + placeholder + body[end:], grid
+
+
+def loads_with_grid(body: bytes) -> Any:
+    """
+    Decode a JSON request body, decoding ``environment.grid`` into a Grid.
+
+    Small bodies, and bodies where the fast path does not apply, go through
+    ``json.loads`` unchanged; the grid is then decoded by the request model.
+    The grid span is replaced by a random marker string, and the decoded
+    grid is only used when the marker is found at ``environment.grid``: a
+    span cut from any other field falls back to the regular decoder.
+
+    Args:
+        body: Raw request body
+
+    Returns:
+        Any: Decoded JSON document
+    """
+    if len(body) < FAST_PATH_MIN_BYTES:
+        return json.loads(body)
+    marker = f"\u0000grid:{secrets.token_hex(8)}"
+    split = split_grid(body, json.dumps(marker).encode())
+    if split is not None:
+        rest, grid = split
+        try:
+            data = json.loads(rest)
+        except ValueError:
+            data = None
+        environment = data.get("environment") if isinstance(data, dict) else None
+        if isinstance(environment, dict) and environment.get("grid") == marker:
+            environment["grid"] = grid
+            return data
+
+    return json.loads(body)
+
+
+def grid_format(value: Any) -> str:
+    """Return the wire format of a request grid value (cells when not an encoded object)."""
+    if isinstance(value, dict):
+        return str(value.get("format"))
+    return CELLS_FORMAT
+
+
+def _check_size(width: Any, height: Any) -> Tuple[int, int]:
+    if not isinstance(width, int) or not isinstance(height, int) or width < 0 or height < 0:
+        raise ValueError("Encoded grid needs non-negative integer width and height")
+    limit = settings.MAX_LABYRINTH_SIZE
+    if width > limit or height > limit or width * height > limit * limit:
+        raise ValueError(f"Encoded grid of {width}x{height} exceeds the maximum size of {limit}x{limit}")
+    return width, height
+
+
+def decode_bitmask(width: int, height: int, data: str) -> Grid:
+    """
+    Decode a base64 bit-packed wall mask.
+
+    Args:
+        width: Grid width
+        height: Grid height
+        data: Base64 of the row-major mask, most significant bit first
+
+    Returns:
+        Grid: Decoded grid
+
+    Raises:
+        ValueError: If the data is not valid base64 or has the wrong length
+    """
+    width, height = _check_size(width, height)
+    try:
+        packed = base64.b64decode(data, validate=True)
+    except (binascii.Error, TypeError) as e:
+        raise ValueError(f"Invalid base64 grid data: {e}")
+    if len(packed) != (width * height + 7) // 8:
+        raise ValueError(f"Bitmask of {len(packed)} bytes does not match a {width}x{height} grid")
+
+    cells = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=width * height).tobytes()
+    return Grid(cells[y * width:(y + 1) * width] for y in range(height))
+
+
+def decode_rle(width: int, height: int, rows: List[str]) -> Grid:
+    """
+    Decode run-length encoded rows.
+
+    Args:
+        width: Grid width
+        height: Grid height
+        rows: Per row, comma-separated lengths of alternating free and wall
+            runs, starting with free cells (``"3,1,96"``)
+
+    Returns:
+        Grid: Decoded grid
+
+    Raises:
+        ValueError: If the runs do not describe a width x height grid
+    """
+    width, height = _check_size(width, height)
+    if not isinstance(rows, list) or len(rows) != height or not all(isinstance(row, str) for row in rows):
+        raise ValueError(f"RLE grid must be a list of {height} row strings")
+    if not height:
+        return Grid()
+
+    # All rows are parsed and expanded at once: run i of a row is a wall run when i is odd
+    text = ",".join(rows)
+    if not _RLE_TEXT.fullmatch(text) or ",," in text or text[0] == "," or text[-1] == ",":
+        raise ValueError("RLE rows must be comma-separated run lengths")
+    runs = np.fromstring(text, dtype=np.int64, sep=",")
+    # Runs longer than a row could overflow the sums below
+    if (runs > width).any():
+        raise ValueError(f"RLE runs must not exceed the width of {width} cells")
+    counts = np.array([row.count(",") + 1 for row in rows])
+    starts = np.cumsum(counts) - counts
+    if not (np.add.reduceat(runs, starts) == width).all():
+        raise ValueError(f"RLE rows must each describe {width} cells")
+    # Only now is the expanded grid (width * height bytes, within the size limit) allocated
+
+    index_in_row = np.arange(runs.size) - np.repeat(starts, counts)
+    cells = np.repeat((index_in_row & 1).astype(np.uint8), runs).tobytes()
+    return Grid(cells[y * width:(y + 1) * width] for y in range(height))
+
+
+def decode_encoded_grid(value: Dict[str, Any]) -> Grid:
+    """
+    Decode a compact grid object (see the module docstring).
+
+    Raises:
+        ValueError: If the format is unknown or the payload invalid
+    """
+    encoding = value.get("format")
+    if encoding == BITMASK_FORMAT:
+        width, height = _check_size(value.get("width"), value.get("height"))
+        return decode_bitmask(width, height, value.get("data", ""))
+    if encoding == RLE_FORMAT:
+        width, height = _check_size(value.get("width"), value.get("height"))
+        return decode_rle(width, height, value.get("rows", []))
+    raise ValueError(f"Unknown grid format: {encoding!r} (expected one of {', '.join(GRID_FORMATS[1:])})")
+
+
+def encode_bitmask(grid: Grid) -> Dict[str, Any]:
+    """Encode a grid as a base64 bit-packed wall mask object."""
+    bits = np.frombuffer(grid.to_bytes(), dtype=np.uint8)
+    return {
+        "format": BITMASK_FORMAT,
+        "width": grid.width,
+        "height": grid.height,
+        "data": base64.b64encode(np.packbits(bits).tobytes()).decode("ascii")
+    }
+
+
+def encode_rle(grid: Grid) -> Dict[str, Any]:
+    """Encode a grid as run-length encoded rows."""
+    rows = []
+    for row in grid:
+        runs, current, length = [], 0, 0
+        for cell in row:
+            if cell != current:
+                runs.append(length)
+                current, length = cell, 0
+            length += 1
+        runs.append(length)
+        rows.append(",".join(map(str, runs)))
+    return {"format": RLE_FORMAT, "width": grid.width, "height": grid.height, "rows": rows}
@@ -0,0 +1,187 @@
+"""
+Random maze generation for offline simulations and datasets.
+
+Mazes use the same representation as the API labyrinth: a list of rows
+where 0 = free cell and 1 = wall, indexed as ``labyrinth[y][x]``.
+"""
+import random
+from typing import List, Optional, Sequence
+
+
+def generate_dfs_maze(
+    width: int,
+    height: int,
+    rng: random.Random,
+    loop_factor: float = 0.0
+) -> List[List[int]]:
+    """
+    Carve a perfect maze with a randomized depth-first search.
+
+    Corridors are carved on odd coordinates, so even dimensions are
+    rounded down to the next odd value and the outer border stays walled.
+
+    Args:
+        width: Maze width in cells (minimum 3)
+        height: Maze height in cells (minimum 3)
+        rng: Random generator used for carving
+        loop_factor: Share of inner walls knocked down afterwards to create loops
+
+    Returns:
+        List[List[int]]: Generated labyrinth (0=free, 1=wall)
+    """
+    width = max(3, width if width % 2 else width - 1)
+    height = max(3, height if height % 2 else height - 1)
+    labyrinth = [[1] * width for _ in range(height)]
+
+    start = (1, 1)
+    labyrinth[1][1] = 0
+    stack = [start]
+
+    while stack:
+        x, y = stack[-1]
+        neighbors = []
+        for dx, dy in ((0, -2), (2, 0), (0, 2), (-2, 0)):
+            nx, ny = x + dx, y + dy
+            if 0 < nx < width - 1 and 0 < ny < height - 1 and labyrinth[ny][nx] == 1:
+                neighbors.append((nx, ny))
+
+        if not neighbors:
+            stack.pop()
+            continue
+
+        nx, ny = rng.choice(neighbors)
+        labyrinth[(y + ny) // 2][(x + nx) // 2] = 0
+        labyrinth[ny][nx] = 0
+        stack.append((nx, ny))
+
+    if loop_factor > 0:
+        _knock_down_walls(labyrinth, rng, loop_factor)
+
+    return labyrinth
+
+
+def generate_open_rooms(
+    width: int,
+    height: int,
+    rng: random.Random,
+    room_size: int = 6
+) -> List[List[int]]:
+    """
+    Build a grid of open rooms separated by walls with random doorways.
+
+    Doorways follow a random spanning tree over the rooms plus a few
+    extra openings, so every room is reachable.
+
+    Args:
+        width: Maze width in cells
+        height: Maze height in cells
+        rng: Random generator
+        room_size: Inner size of a room in cells
+
+    Returns:
+        List[List[int]]: Generated labyrinth (0=free, 1=wall)
+    """
+    step = room_size + 1
+    width = max(step + 1, width - (width - 1) % step)
+    height = max(step + 1, height - (height - 1) % step)
+    labyrinth = [
+        [1 if x % step == 0 or y % step == 0 else 0 for x in range(width)]
+        for y in range(height)
+    ]
+
+    rooms_x = (width - 1) // step
+    rooms_y = (height - 1) // step
+    visited = {(0, 0)}
+    stack = [(0, 0)]
+    doors = []
+    while stack:
+        rx, ry = stack[-1]
+        neighbors = [
+            (rx + dx, ry + dy)
+            for dx, dy in ((0, -1), (1, 0), (0, 1), (-1, 0))
+            if 0 <= rx + dx < rooms_x and 0 <= ry + dy < rooms_y and (rx + dx, ry + dy) not in visited
+        ]
+        if not neighbors:
+            stack.pop()
+            continue
+        neighbor = rng.choice(neighbors)
+        visited.add(neighbor)
+        stack.append(neighbor)
+        doors.append(((rx, ry), neighbor))
+
+    # A few extra doors create alternative routes between rooms
+    for _ in range(max(1, len(doors) // 4)):
+        rx, ry = rng.randrange(rooms_x), rng.randrange(rooms_y)
+        if rx + 1 < rooms_x:
+            doors.append(((rx, ry), (rx + 1, ry)))
+
+    for (ax, ay), (bx, by) in doors:
+        offset = rng.randrange(1, step)
+        if ax != bx:
+            labyrinth[ay * step + offset][max(ax, bx) * step] = 0
+        else:
+            labyrinth[max(ay, by) * step][ax * step + offset] = 0
+
+    return labyrinth
+
+
+def seal_cell(labyrinth: List[List[int]], position: List[int]) -> None:
+    """
+    Wall off every neighbor of a free cell so it cannot be reached.
+
+    Args:
+        labyrinth: 2D maze representation, modified in place
+        position: Free cell [x, y] to isolate
+    """
+    x, y = position
+    height = len(labyrinth)
+    width = len(labyrinth[0])
+    for nx, ny in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)):
+        if 0 <= nx < width and 0 <= ny < height:
+            labyrinth[ny][nx] = 1
+
+
+def random_free_cells(
+    labyrinth: List[List[int]],
+    count: int,
+    rng: random.Random,
+    exclude: Optional[Sequence[List[int]]] = None
+) -> List[List[int]]:
+    """
+    Pick distinct random free cells.
+
+    Args:
+        labyrinth: 2D maze representation
+        count: Number of cells to pick
+        rng: Random generator
+        exclude: Positions [x, y] that must not be picked
+
+    Returns:
+        List[List[int]]: Up to ``count`` positions [x, y]
+    """
+    excluded = {tuple(pos) for pos in exclude or []}
+    free_cells = [
+        [x, y]
+        for y, row in enumerate(labyrinth)
+        for x, cell in enumerate(row)
+        if cell == 0 and (x, y) not in excluded
+    ]
+    return rng.sample(free_cells, min(count, len(free_cells)))
+
+
+def _knock_down_walls(labyrinth: List[List[int]], rng: random.Random, loop_factor: float) -> None:
+    """Remove inner walls separating two corridors to create loops."""
+    height = len(labyrinth)
+    width = len(labyrinth[0])
+    candidates = []
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            if labyrinth[y][x] != 1:
+                continue
+            horizontal = labyrinth[y][x - 1] == 0 and labyrinth[y][x + 1] == 0
+            vertical = labyrinth[y - 1][x] == 0 and labyrinth[y + 1][x] == 0
+            if horizontal != vertical:
+                candidates.append((x, y))
+
+    for x, y in rng.sample(candidates, int(len(candidates) * loop_factor)):
+        labyrinth[y][x] = 0
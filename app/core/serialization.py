@@ -0,0 +1,198 @@
+"""
+Shared JSON serialization for responses and the log stream.
+
+orjson is used when it is installed, with the standard library ``json``
+module as a fallback producing the same compact output. SSE frames are
+encoded once per log entry and shared by every connected client, and log
+timestamps are stored as integers and formatted from a per-second cached
+ISO prefix only when serialized.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+from pydantic_core import core_schema
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+HAS_ORJSON = orjson is not None
+
+
+def _default(value: Any) -> Any:
+    """Encode the types the standard encoder does not know."""
+    if isinstance(value, Timestamp):
+        return value.iso()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(value: Any) -> bytes:
+        """Serialize a value to compact JSON bytes."""
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+else:
+    _encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_default)
+
+    def dumps(value: Any) -> bytes:
+        """Serialize a value to compact JSON bytes."""
+        return _encoder.encode(value).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the shared serializer (default response class of the app)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def sse_frame(value: Any) -> bytes:
+    """Encode a value as a Server-Sent Events ``data:`` frame."""
+    return b"data: " + dumps(value) + b"\n\n"
+
+
+class SSEFrameCache:
+    """
+    Encoded SSE frames of log entries, shared by all stream clients.
+
+    Entries are dicts, so frames are keyed by ``id(entry)``; the entry itself
+    is kept alongside its frame so that its id cannot be reused while cached.
+    Entries must not be mutated once published.
+    """
+
+    def __init__(self, max_entries: int = 2000):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Number of frames kept (least recently used first out)
+        """
+        self.max_entries = max_entries
+        self._frames: "OrderedDict[int, Tuple[Dict[str, Any], bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def frame(self, entry: Dict[str, Any]) -> bytes:
+        """Return the SSE frame of a log entry, encoding it on first use."""
+        key = id(entry)
+        with self._lock:
+            cached = self._frames.get(key)
+            if cached is not None and cached[0] is entry:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+
+        frame = sse_frame(entry)
+        with self._lock:
+            self.misses += 1
+            self._frames[key] = (entry, frame)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+        return frame
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and hit counters."""
+        return {"size": len(self._frames), "hits": self.hits, "misses": self.misses}
+
+
+# (second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp
+_iso_second: Tuple[int, str] = (-1, "")
+
+
+def iso_timestamp(timestamp: Optional[float] = None) -> str:
+    """
+    Format a POSIX timestamp like ``datetime.fromtimestamp(ts).isoformat()``.
+
+    The local date and time part is computed once per second and reused;
+    only the microseconds are formatted on each call.
+
+    Args:
+        timestamp: POSIX timestamp (current time if None)
+
+    Returns:
+        str: Local ISO 8601 timestamp
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    second = int(timestamp // 1)
+    micros = round((timestamp - second) * 1e6)
+    if micros >= 1000000:
+        second, micros = second + 1, micros - 1000000
+    return _format_iso(second, micros)
+
+
+def iso_timestamp_ns(timestamp_ns: int) -> str:
+    """Format a POSIX timestamp in nanoseconds (truncated to microseconds) like iso_timestamp."""
+    second, nanos = divmod(timestamp_ns, 1_000_000_000)
+    return _format_iso(second, nanos // 1000)
+
+
+def _format_iso(second: int, micros: int) -> str:
+    global _iso_second
+    cached_second, prefix = _iso_second
+    if cached_second != second:
+        prefix = datetime.fromtimestamp(second).isoformat()
+        _iso_second = (second, prefix)
+    return f"{prefix}.{micros:06d}" if micros else prefix
+
+
+class Timestamp:
+    """
+    Nanosecond POSIX timestamp of a log entry.
+
+    Storing it costs one integer; the ISO 8601 string is only formatted when
+    the entry is serialized (see ``_default``), by pydantic for model fields
+    of this type (see ``__get_pydantic_core_schema__``).
+    """
+
+    __slots__ = ("ns",)
+
+    def __init__(self, ns: int):
+        self.ns = ns
+
+    @classmethod
+    def now(cls) -> "Timestamp":
+        """Current time."""
+        return cls(time.time_ns())
+
+    def iso(self) -> str:
+        """Local ISO 8601 string, as produced by iso_timestamp."""
+        return iso_timestamp_ns(self.ns)
+
+    __str__ = iso
+
+    def __repr__(self) -> str:
+        return f"Timestamp({self.ns})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> core_schema.CoreSchema:
+        """Accept Timestamp instances or nanoseconds, serialize as the ISO string."""
+        return core_schema.no_info_plain_validator_function(
+            lambda value: value if isinstance(value, Timestamp) else cls(int(value)),
+            serialization=core_schema.plain_serializer_function_ser_schema(cls.iso, return_schema=core_schema.str_schema())
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Timestamp) and other.ns == self.ns
+
+    def __hash__(self) -> int:
+        return hash(self.ns)
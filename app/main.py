@@ -1,20 +1,58 @@
 """
 FastAPI application entry point for Mouse AI Engine.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import routes_health, routes_move, routes_mouse, routes_logs
+from app.api import routes_health, routes_mouse, routes_logs, routes_ws
 from app.core.config import settings
+from app.core.serialization import FastJSONResponse
+from app.services.container import ServiceContainer
+from app.services.log_service import log_service
+
+
+def build_container() -> ServiceContainer:
+    """Service container of the application, configured from the settings."""
+    background = []
+    if settings.SERVER_LOG_THREAD:
+        from app.services.server_log_thread import server_log_thread
+        background.append(server_log_thread)
+    return ServiceContainer(
+        log_service,
+        routes_mouse.path_trees,
+        routes_mouse.distance_fields,
+        background=background,
+        warm_dir=settings.WARM_CACHE_DIR,
+        shared_mazes=routes_mouse.shared_mazes
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the services before the first request and stop them on shutdown."""
+    container = build_container()
+    app.state.services = container
+    await container.start()
+    try:
+        yield
+    finally:
+        await container.stop()
 
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
+    # Les logs du serveur sont capturés pour /api/logs (pas à l'import des services)
+    log_service.install_handler()
+    
     app = FastAPI(
+        lifespan=lifespan,
         title=settings.APP_NAME,
         version=settings.VERSION,
         debug=settings.DEBUG,
-        description="Intelligence engine for mice navigation in maze environments"
+        description="Intelligence engine for mice navigation in maze environments",
+        default_response_class=FastJSONResponse
     )
     
     # Add CORS middleware
@@ -28,8 +66,9 @@ def create_app() -> FastAPI:
     
     # Include routers
     app.include_router(routes_health.router, prefix="/api")
-    # app.include_router(routes_move.router, prefix="/api")  # Désactivé - utilise routes_mouse
+    # routes_move (MovementService, agent IA) n'est plus importé : désactivé au profit de routes_mouse
     app.include_router(routes_mouse.router, prefix="/api")
+    app.include_router(routes_ws.router, prefix="/api")
     app.include_router(routes_logs.router, prefix="/api")
     
     return app
@@ -0,0 +1,188 @@
+"""
+Typed models for the frontend /api/move format.
+
+Validation runs in pydantic-core; the grid is decoded straight into a
+compact Grid while the request is parsed, whether it is sent as cell names
+or in one of the compact encodings of ``app.core.grid_codec``.
+"""
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, PlainValidator, WithJsonSchema, model_validator
+from typing_extensions import Annotated
+
+from app.core.grid import Grid
+from app.core.grid_codec import CELLS_FORMAT, DELTA_FORMAT, GRID_FORMATS, decode_encoded_grid, grid_format
+
+ALL_DIRECTIONS: List[str] = ["north", "south", "east", "west"]
+MAX_HORIZON = 64
+
+
+def _decode_grid(value: Any) -> Grid:
+    """Decode a frontend grid (rows of cell names or compact encoding) into a Grid."""
+    if isinstance(value, Grid):
+        return value
+    if isinstance(value, dict):
+        return decode_encoded_grid(value)
+    if not isinstance(value, list) or not all(isinstance(row, list) for row in value):
+        raise ValueError("Grid must be a list of rows")
+    return Grid.from_cells(value)
+
+
+GridField = Annotated[
+    Grid,
+    PlainValidator(_decode_grid),
+    PlainSerializer(lambda grid: grid.to_cells(), return_type=list),
+    WithJsonSchema({
+        "anyOf": [
+            {"type": "array", "items": {"type": "array", "items": {"type": "string"}}},
+            {
+                "type": "object",
+                "properties": {
+                    "format": {"enum": list(GRID_FORMATS[1:])},
+                    "width": {"type": "integer"},
+                    "height": {"type": "integer"},
+                    "data": {"type": "string"},
+                    "rows": {"type": "array", "items": {"type": "string"}}
+                },
+                "required": ["format", "width", "height"]
+            }
+        ]
+    })
+]
+
+
+class Position(BaseModel):
+    """Cell coordinates."""
+    x: int
+    y: int
+
+    def to_list(self) -> List[int]:
+        """Return the position as [x, y]."""
+        return [self.x, self.y]
+
+
+class CellDiff(BaseModel):
+    """Cell that changed since the previous environment version."""
+    x: int
+    y: int
+    cell: str
+
+
+class Environment(BaseModel):
+    """Maze environment seen by a mouse."""
+    model_config = ConfigDict(extra="allow")
+
+    grid: GridField = Field(default_factory=Grid)
+    width: Optional[int] = None
+    height: Optional[int] = None
+    cheesePositions: List[Position] = Field(default_factory=list)
+    otherMice: List[Any] = Field(default_factory=list)
+    walls: List[Any] = Field(default_factory=list)
+    paths: List[Any] = Field(default_factory=list)
+    # Sent instead of the grid once the server holds the previous version
+    cellDiffs: Optional[List[CellDiff]] = None
+    # Wire format of the grid, set from the request content
+    gridFormat: str = CELLS_FORMAT
+
+    def other_mouse_positions(self) -> Dict[str, List[int]]:
+        """
+        Positions of the other mice by id.
+
+        Entries are read as ``{"id"|"mouseId", "x", "y"}`` or
+        ``{"id"|"mouseId", "position": {"x", "y"}}``; entries without a
+        position are ignored.
+        """
+        positions = {}
+        for number, other in enumerate(self.otherMice):
+            if not isinstance(other, dict):
+                continue
+            where = other.get("position", other)
+            if not isinstance(where, dict) or not isinstance(where.get("x"), int) or not isinstance(where.get("y"), int):
+                continue
+            mouse_id = other.get("id", other.get("mouseId", f"other{number}"))
+            positions[str(mouse_id)] = [where["x"], where["y"]]
+        return positions
+
+    @model_validator(mode="before")
+    @classmethod
+    def _detect_grid_format(cls, data: Any) -> Any:
+        if isinstance(data, dict):
+            if data.get("cellDiffs") is not None and data.get("grid") is None:
+                detected = DELTA_FORMAT
+            else:
+                detected = grid_format(data.get("grid"))
+            data = {**data, "gridFormat": detected}
+        return data
+
+
+class MouseState(BaseModel):
+    """State of the mouse reported by the frontend."""
+    model_config = ConfigDict(extra="allow")
+
+    health: Optional[int] = None
+    happiness: Optional[int] = None
+    energy: Optional[int] = None
+    cheeseFound: Optional[int] = None
+    tag: Optional[Union[int, str]] = None
+
+
+class MouseMoveRequest(BaseModel):
+    """Move request sent by the frontend for one mouse."""
+    model_config = ConfigDict(extra="allow")
+
+    mouseId: str = "unknown"
+    # Versioning of the environment for delta updates (see EnvironmentStore)
+    simulationId: Optional[str] = None
+    environmentVersion: Optional[int] = None
+    baseVersion: Optional[int] = None
+    position: Position = Field(default_factory=lambda: Position(x=0, y=0))
+    environment: Environment = Field(default_factory=Environment)
+    mouseState: MouseState = Field(default_factory=MouseState)
+    availableMoves: List[str] = Field(default_factory=lambda: list(ALL_DIRECTIONS))
+    # Number of moves to plan ahead (see MouseMoveResponse.moves)
+    horizon: Optional[int] = Field(default=None, ge=1, le=MAX_HORIZON)
+
+
+class MouseMoveResponse(BaseModel):
+    """Move returned to the frontend."""
+    mouseId: str
+    move: str
+    reasoning: str
+    gridFormat: str = CELLS_FORMAT
+    status: str = "ok"
+    environmentVersion: Optional[int] = None
+    # Next moves along the plan, when the request set a horizon
+    moves: Optional[List[str]] = None
+    planToken: Optional[str] = None
+    # Planning strategy that produced the move (path_tree, astar, bounded or greedy)
+    strategy: Optional[str] = None
+    # Bound of the planned path length over the shortest one (1.0 = shortest), null if partial
+    optimalityBound: Optional[float] = None
+
+
+class HealthResponse(BaseModel):
+    """Status returned by GET /api/health."""
+    status: str = "ok"
+    version: str
+
+
+class ResyncResponse(BaseModel):
+    """Returned (HTTP 409) when cell diffs do not apply to the environment held by the server."""
+    mouseId: str
+    status: str = "resync_needed"
+    environmentVersion: Optional[int] = None
+    reasoning: str
+
+
+class RegisterMessage(BaseModel):
+    """WebSocket message registering the environment of a simulation."""
+    simulationId: Optional[str] = None
+    environmentVersion: int = 0
+    environment: Environment
+
+
+class UpdateMessage(BaseModel):
+    """WebSocket message applying cell diffs to the registered environment."""
+    environmentVersion: int
+    baseVersion: Optional[int] = None
+    cellDiffs: List[CellDiff]
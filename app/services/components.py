@@ -0,0 +1,120 @@
+"""
+Connected components of the free cells of a maze.
+
+One flood fill labels every free cell with the number of its component,
+so that "can this cell reach that one" is answered by comparing two
+labels, instead of by a search that explores the whole component before
+failing. Labels are int32 arrays over the padded grid indexes (see
+PaddedGrid), computed once per layout and cached by grid digest.
+"""
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from app.core.grid import Grid
+from app.services.distance_fields import PaddedGrid
+
+# Label of walls, of the border and of positions outside the grid
+NO_COMPONENT = 0
+
+
+def label_components(padded: PaddedGrid) -> Tuple[array, int]:
+    """
+    Label the connected components of the free cells (4-neighborhood).
+
+    Args:
+        padded: Flattened grid
+
+    Returns:
+        Tuple[array, int]: Per flat index, the component number (1 to the
+        number of components, ``NO_COMPONENT`` for walls), and the number of components
+    """
+    labels = array("i", [NO_COMPONENT]) * len(padded.free)
+    unlabeled = bytearray(padded.free)
+    stride = padded.stride
+    count = 0
+    start = unlabeled.find(1)
+    while start >= 0:
+        count += 1
+        unlabeled[start] = 0
+        labels[start] = count
+        stack = [start]
+        pop, push = stack.pop, stack.append
+        while stack:
+            i = pop()
+            for j in (i - stride, i + 1, i + stride, i - 1):
+                if unlabeled[j]:
+                    unlabeled[j] = 0
+                    labels[j] = count
+                    push(j)
+        start = unlabeled.find(1, start + 1)
+    return labels, count
+
+
+class ComponentIndex:
+    """LRU cache of the component labels of the recent layouts."""
+
+    def __init__(self, max_layouts: int = 32):
+        """
+        Initialize the index.
+
+        Args:
+            max_layouts: Number of layouts whose labels are kept (4 bytes per padded cell each)
+        """
+        self.max_layouts = max_layouts
+        self._layouts: "OrderedDict[str, Tuple[PaddedGrid, array, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.computed = 0
+        self.hits = 0
+
+    def component(self, grid: Grid, position: List[int]) -> int:
+        """Component number of a position, ``NO_COMPONENT`` for a wall or outside the grid."""
+        padded, labels, _ = self._labels(grid)
+        i = padded.index(position)
+        return labels[i] if i >= 0 else NO_COMPONENT
+
+    def connected(self, grid: Grid, a: List[int], b: List[int]) -> bool:
+        """Whether a path of free cells joins two positions."""
+        padded, labels, _ = self._labels(grid)
+        i, j = padded.index(a), padded.index(b)
+        return i >= 0 and j >= 0 and labels[i] != NO_COMPONENT and labels[i] == labels[j]
+
+    def reachable(self, grid: Grid, position: List[int], targets: List[List[int]]) -> List[List[int]]:
+        """Targets in the component of a position, in their order (none from a wall)."""
+        padded, labels, _ = self._labels(grid)
+        i = padded.index(position)
+        component = labels[i] if i >= 0 else NO_COMPONENT
+        if component == NO_COMPONENT:
+            return []
+        # Outside the grid, index -1 is a border cell, which has no component
+        return [target for target in targets if labels[padded.index(target)] == component]
+
+    def count(self, grid: Grid) -> int:
+        """Number of components of a grid."""
+        return self._labels(grid)[2]
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of layouts labeled and counters."""
+        with self._lock:
+            return {"layouts": len(self._layouts), "computed": self.computed, "hits": self.hits}
+
+    def _labels(self, grid: Grid) -> Tuple[PaddedGrid, array, int]:
+        digest = grid.digest
+        with self._lock:
+            entry = self._layouts.get(digest)
+            if entry is not None:
+                self._layouts.move_to_end(digest)
+                self.hits += 1
+                return entry
+
+        padded = PaddedGrid(grid)
+        entry = (padded, *label_components(padded))
+        with self._lock:
+            if digest not in self._layouts:
+                self.computed += 1
+            self._layouts[digest] = entry
+            self._layouts.move_to_end(digest)
+            while len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+        return entry
@@ -0,0 +1,152 @@
+"""
+Lifecycle of the long-lived services of the application.
+
+The container is started and stopped by the FastAPI lifespan (see
+app.main.create_app): it starts the background threads, optionally warms
+the pathfinding caches from a directory of known mazes before the first
+request, and stops the threads and flushes the pending logs on shutdown.
+"""
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from pydantic import ValidationError
+
+from app.core.grid import Grid
+from app.models.frontend import Environment
+from app.services.distance_fields import DistanceFieldStore
+from app.services.log_service import LogService
+from app.services.path_trees import PathTreeStore
+from app.services.shared_mazes import SharedMazeRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundService(Protocol):
+    """Anything with start/stop, e.g. ServerLogThread."""
+
+    def start(self):
+        ...
+
+    def stop(self):
+        ...
+
+
+def load_mazes(directory: str) -> List[Tuple[str, Grid, List[List[int]], List[List[int]]]]:
+    """
+    Read the known mazes of a directory.
+
+    Every ``*.json`` file holds either an environment (``{"grid", "cheesePositions"}``
+    in any grid format accepted by /api/move) or a whole move request body
+    whose ``position`` and ``environment.otherMice`` give start cells.
+    Unreadable files are skipped with a warning.
+
+    Returns:
+        List of (file name, grid, cheeses, start positions)
+    """
+    mazes = []
+    for path in sorted(Path(directory).glob("*.json")):
+        try:
+            data = json.loads(path.read_bytes())
+            body = data if "environment" in data else {"environment": data}
+            environment = Environment.model_validate(body["environment"])
+        except (OSError, ValueError, ValidationError, TypeError) as e:
+            logger.warning(f"Skipping maze file {path.name}: {e}")
+            continue
+        starts = list(environment.other_mouse_positions().values())
+        position = body.get("position")
+        if isinstance(position, dict) and "x" in position and "y" in position:
+            starts.insert(0, [position["x"], position["y"]])
+        cheeses = [cheese.to_list() for cheese in environment.cheesePositions]
+        mazes.append((path.name, environment.grid, cheeses, starts))
+    return mazes
+
+
+class ServiceContainer:
+    """Starts, warms and stops the services shared by the requests."""
+
+    def __init__(
+        self,
+        log_service: LogService,
+        path_trees: PathTreeStore,
+        distance_fields: DistanceFieldStore,
+        background: Optional[Sequence[BackgroundService]] = None,
+        warm_dir: Optional[str] = None,
+        flush_timeout: float = 5.0,
+        shared_mazes: Optional[SharedMazeRegistry] = None
+    ):
+        """
+        Initialize the container.
+
+        Args:
+            log_service: Log service flushed on shutdown
+            path_trees: Per-cheese shortest-path trees to warm
+            distance_fields: Cheese distance fields to warm
+            background: Services started on startup and stopped on shutdown
+            warm_dir: Directory of known mazes (see load_mazes), None to skip warming
+            flush_timeout: Seconds to wait for pending logs on shutdown
+            shared_mazes: Shared memory registry whose references are released on shutdown
+        """
+        self.log_service = log_service
+        self.path_trees = path_trees
+        self.distance_fields = distance_fields
+        self.background = list(background or [])
+        self.warm_dir = warm_dir
+        self.flush_timeout = flush_timeout
+        self.shared_mazes = shared_mazes
+        self.started = False
+        self.warm_stats: Dict[str, Any] = {}
+
+    async def start(self):
+        """Warm the caches (off the event loop), then start the background services."""
+        if self.warm_dir:
+            self.warm_stats = await asyncio.to_thread(self.warm, self.warm_dir)
+        for service in self.background:
+            service.start()
+        self.started = True
+        logger.info("Services started")
+
+    async def stop(self):
+        """Stop the background services, release the shared mazes, then flush the pending logs."""
+        for service in reversed(self.background):
+            try:
+                service.stop()
+            except Exception as e:
+                logger.error(f"Error stopping {type(service).__name__}: {e}")
+        if self.shared_mazes is not None:
+            self.shared_mazes.close()
+        self.started = False
+        logger.info("Services stopped")
+        if not await asyncio.to_thread(self.log_service.flush, self.flush_timeout):
+            logger.warning(f"Pending logs not flushed after {self.flush_timeout}s")
+
+    def warm(self, directory: str) -> Dict[str, Any]:
+        """
+        Fill the caches for the mazes of a directory.
+
+        Computes the distance field and the shortest-path tree of every
+        cheese: the first moves of every mouse then follow a built tree,
+        whatever its start cell.
+
+        Returns:
+            Dict[str, Any]: Number of mazes, fields and trees, and the time taken
+        """
+        started = time.perf_counter()
+        mazes = load_mazes(directory)
+        fields = 0
+        for _, grid, cheeses, _ in mazes:
+            for cheese in cheeses:
+                self.distance_fields.field(grid, cheese)
+                self.path_trees.build(grid, cheese)
+                fields += 1
+        stats = {
+            "mazes": len(mazes),
+            "distance_fields": fields,
+            "path_trees": fields,
+            "ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+        logger.info(f"Caches warmed from {directory}: {stats}")
+        return stats
@@ -0,0 +1,194 @@
+"""
+Cooperative cheese assignment for all the mice of a simulation.
+
+Instead of every mouse chasing its own nearest cheese, the coordinator
+solves a minimum-cost assignment of mice to cheeses on maze distances (BFS
+distance fields computed once per cheese), so that no two mice contend for
+the same cheese while another one is left untargeted.
+"""
+import functools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.grid import Grid
+from app.services.distance_fields import UNREACHABLE, DistanceFieldStore
+
+logger = logging.getLogger(__name__)
+
+# Inputs of an assignment: layout digest, sorted (mouse id, x, y) and cheese cells
+AssignmentKey = Tuple[str, Tuple[Tuple[str, int, int], ...], Tuple[Tuple[int, int], ...]]
+
+
+@functools.lru_cache(maxsize=None)
+def scipy_solver() -> Optional[Callable]:
+    """
+    Return scipy's ``linear_sum_assignment``, or None when scipy is not installed.
+
+    Imported on first use: scipy.optimize takes longer to import than the
+    rest of the application, and most requests never assign cheeses.
+    """
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:  # pragma: no cover - depends on the environment
+        return None
+    return linear_sum_assignment
+
+
+def hungarian(cost: np.ndarray) -> np.ndarray:
+    """
+    Minimum-cost assignment of rows to distinct columns (rows <= columns).
+
+    Shortest augmenting path Hungarian algorithm in O(n^2 m), with the scan
+    over columns vectorized. Potentials of the columns used during a phase
+    are updated once at the end of the phase.
+
+    Args:
+        cost: Cost matrix of shape (n, m) with n <= m
+
+    Returns:
+        np.ndarray: Column assigned to each row
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    rows, columns = cost.shape
+    if rows > columns:
+        raise ValueError("hungarian() needs at most as many rows as columns")
+    u = np.zeros(rows)
+    v = np.zeros(columns)
+    owner = np.full(columns, -1, dtype=np.int64)
+
+    for row in range(rows):
+        min_reduced = np.full(columns, np.inf)
+        way = np.full(columns, -1, dtype=np.int64)  # previous column on the path, -1 = start row
+        penalty = np.zeros(columns)  # inf once a column is in the alternating tree
+        used_at: Dict[int, float] = {}  # column -> cumulated delta when it joined the tree
+        total = 0.0
+        current_row, previous_column = row, -1
+        while True:
+            reduced = cost[current_row] - u[current_row] - v + penalty
+            way[reduced < min_reduced] = previous_column
+            np.minimum(min_reduced, reduced, out=min_reduced)
+            column = int(np.argmin(min_reduced))
+            delta = min_reduced[column]
+            total += delta
+            min_reduced -= delta
+            used_at[column] = total
+            penalty[column] = np.inf
+            min_reduced[column] = np.inf
+            if owner[column] < 0:
+                break
+            current_row, previous_column = int(owner[column]), column
+
+        u[row] += total
+        for used, at in used_at.items():
+            if owner[used] >= 0:
+                u[owner[used]] += total - at
+            v[used] -= total - at
+
+        while column >= 0:
+            previous = way[column]
+            owner[column] = owner[previous] if previous >= 0 else row
+            column = previous
+
+    assignment = np.full(rows, -1, dtype=np.int64)
+    assigned = np.flatnonzero(owner >= 0)
+    assignment[owner[assigned]] = assigned
+    return assignment
+
+
+def solve_assignment(cost: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Solve a rectangular assignment problem.
+
+    Uses scipy's ``linear_sum_assignment`` when scipy is installed, the
+    NumPy Hungarian implementation otherwise.
+
+    Returns:
+        List[Tuple[int, int]]: (row, column) pairs
+    """
+    if cost.size == 0:
+        return []
+    linear_sum_assignment = scipy_solver()
+    if linear_sum_assignment is not None:
+        row_indexes, column_indexes = linear_sum_assignment(cost)
+        return list(zip(row_indexes.tolist(), column_indexes.tolist()))
+    if cost.shape[0] <= cost.shape[1]:
+        return list(enumerate(hungarian(cost).tolist()))
+    return [(row, column) for column, row in enumerate(hungarian(cost.T).tolist())]
+
+
+class CheeseCoordinator:
+    """Assigns a distinct cheese to each mouse of a simulation."""
+
+    def __init__(self, distance_fields: Optional[DistanceFieldStore] = None):
+        """
+        Initialize the coordinator.
+
+        Args:
+            distance_fields: Shared distance field store
+        """
+        self.distance_fields = distance_fields if distance_fields is not None else DistanceFieldStore()
+        self._last_key: Optional[AssignmentKey] = None
+        self._last_goals: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self.last_timings: Dict[str, float] = {}
+
+    def assign(self, grid: Grid, mice: Dict[str, List[int]], cheeses: List[List[int]]) -> Dict[str, List[int]]:
+        """
+        Compute the goal of every mouse.
+
+        Each cheese gets at most one mouse, minimizing the total maze
+        distance. When there are more mice than cheeses, the mice left over
+        target their nearest cheese. Mice that cannot reach any cheese get
+        no goal. The last result is reused while the layout, the positions
+        and the cheeses are unchanged (one request per mouse in the same tick).
+
+        Args:
+            grid: Maze layout
+            mice: Mouse positions by mouse id
+            cheeses: Cheese positions [[x, y], ...]
+
+        Returns:
+            Dict[str, List[int]]: Goal cheese by mouse id
+        """
+        key: AssignmentKey = (
+            grid.digest,
+            tuple(sorted((mouse_id, position[0], position[1]) for mouse_id, position in mice.items())),
+            tuple((c[0], c[1]) for c in cheeses)
+        )
+        with self._lock:
+            if key == self._last_key:
+                return dict(self._last_goals)
+
+        goals: Dict[str, List[int]] = {}
+        if mice and cheeses:
+            started = time.perf_counter()
+            mouse_ids = list(mice)
+            distances = self.distance_fields.distance_matrix(grid, [mice[m] for m in mouse_ids], cheeses)
+            fields_time = time.perf_counter() - started
+
+            # Unreachable pairs cost more than any real path
+            unreachable = distances == UNREACHABLE
+            cost = distances.astype(np.float64)
+            cost[unreachable] = grid.width * grid.height + 1
+            for row, column in solve_assignment(cost):
+                if not unreachable[row, column]:
+                    goals[mouse_ids[row]] = list(cheeses[column])
+
+            for row, mouse_id in enumerate(mouse_ids):
+                if mouse_id not in goals and not unreachable[row].all():
+                    goals[mouse_id] = list(cheeses[int(np.argmin(cost[row]))])
+
+            self.last_timings = {
+                "fields": fields_time,
+                "assignment": time.perf_counter() - started - fields_time
+            }
+            logger.debug(f"Assigned {len(goals)} mice to {len(cheeses)} cheeses in {sum(self.last_timings.values()) * 1000:.1f} ms")
+
+        with self._lock:
+            self._last_key = key
+            self._last_goals = goals
+        return dict(goals)
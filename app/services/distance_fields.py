@@ -0,0 +1,357 @@
+"""
+BFS distance fields from cheeses, cached per maze layout.
+
+A distance field holds the maze distance from one cheese to every cell. It
+is computed once per (layout, cheese) and reused by every mouse and every
+tick until the cheese is eaten or the layout changes around it. With a
+MazeDiskCache, fields and flattened grids are also persisted and shared,
+memory-mapped, by all the processes using the same cache directory; with
+a SharedMazeRegistry they are published once in shared memory for all the
+workers of a host.
+"""
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.core.grid import Grid
+from app.services.maze_cache import MazeDiskCache
+from app.services.path_cache import CellChange
+from app.services.shared_mazes import SharedMazeRegistry
+
+Cell = Tuple[int, int]
+# array("i") when computed here, memoryview of a memory-mapped file or shared memory otherwise
+Field = Union[array, memoryview]
+UNREACHABLE = -1
+
+
+class PaddedGrid:
+    """
+    Grid flattened with a one-cell wall border, so that the four neighbors
+    of a cell index ``i`` are ``i - stride``, ``i + 1``, ``i + stride`` and
+    ``i - 1`` without bounds checks.
+    """
+
+    __slots__ = ("width", "height", "stride", "free")
+
+    def __init__(self, grid: Grid):
+        self.width = grid.width
+        self.height = grid.height
+        self.stride = grid.width + 2
+        # 1 = free cell, 0 = wall or border
+        free = bytearray(self.stride * (grid.height + 2))
+        passable = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+        for y, row in enumerate(grid):
+            start = (y + 1) * self.stride + 1
+            free[start:start + grid.width] = bytes(row).translate(passable)
+        self.free = bytes(free)
+
+    @classmethod
+    def from_bitmap(cls, free: np.ndarray) -> "PaddedGrid":
+        """Wrap a padded passability bitmap of shape (height + 2, width + 2) without copying it."""
+        padded = cls.__new__(cls)
+        padded.height = free.shape[0] - 2
+        padded.width = free.shape[1] - 2
+        padded.stride = free.shape[1]
+        padded.free = memoryview(free.reshape(-1))
+        return padded
+
+    def bitmap(self) -> np.ndarray:
+        """Passability bitmap of shape (height + 2, width + 2)."""
+        return np.frombuffer(self.free, dtype=np.uint8).reshape(self.height + 2, self.stride)
+
+    def index(self, position: Sequence[int]) -> int:
+        """Flat index of a position, or -1 when it is outside the grid."""
+        x, y = position[0], position[1]
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return (y + 1) * self.stride + x + 1
+        return -1
+
+    def position(self, index: int) -> List[int]:
+        """Position [x, y] of a flat index."""
+        y, x = divmod(index, self.stride)
+        return [x - 1, y - 1]
+
+
+def bfs_distances(padded: PaddedGrid, source: int) -> array:
+    """
+    Breadth-first distances from one cell.
+
+    Args:
+        padded: Flattened grid
+        source: Flat index of the source cell
+
+    Returns:
+        array: Distance per flat index (``UNREACHABLE`` for walls and unreached cells)
+    """
+    distances = array("i", [UNREACHABLE]) * len(padded.free)
+    if source < 0 or not padded.free[source]:
+        return distances
+
+    # Cells still to visit; cleared as they are reached
+    unvisited = bytearray(padded.free)
+    unvisited[source] = 0
+    distances[source] = 0
+    stride = padded.stride
+    frontier = [source]
+    distance = 0
+    while frontier:
+        distance += 1
+        reached: List[int] = []
+        append = reached.append
+        for i in frontier:
+            j = i - stride
+            if unvisited[j]:
+                unvisited[j] = 0
+                distances[j] = distance
+                append(j)
+            j = i + 1
+            if unvisited[j]:
+                unvisited[j] = 0
+                distances[j] = distance
+                append(j)
+            j = i + stride
+            if unvisited[j]:
+                unvisited[j] = 0
+                distances[j] = distance
+                append(j)
+            j = i - 1
+            if unvisited[j]:
+                unvisited[j] = 0
+                distances[j] = distance
+                append(j)
+        frontier = reached
+    return distances
+
+
+def bfs_parents(padded: PaddedGrid, source: int) -> array:
+    """
+    Shortest-path tree towards one cell.
+
+    Args:
+        padded: Flattened grid
+        source: Flat index of the root cell (a cheese)
+
+    Returns:
+        array: Per flat index, the index of the next cell on a shortest path
+        to the source (the source maps to itself), ``UNREACHABLE`` for walls
+        and unreached cells
+    """
+    parents = array("i", [UNREACHABLE]) * len(padded.free)
+    if source < 0 or not padded.free[source]:
+        return parents
+
+    unvisited = bytearray(padded.free)
+    unvisited[source] = 0
+    parents[source] = source
+    stride = padded.stride
+    frontier = [source]
+    while frontier:
+        reached: List[int] = []
+        append = reached.append
+        for i in frontier:
+            j = i - stride
+            if unvisited[j]:
+                unvisited[j] = 0
+                parents[j] = i
+                append(j)
+            j = i + 1
+            if unvisited[j]:
+                unvisited[j] = 0
+                parents[j] = i
+                append(j)
+            j = i + stride
+            if unvisited[j]:
+                unvisited[j] = 0
+                parents[j] = i
+                append(j)
+            j = i - 1
+            if unvisited[j]:
+                unvisited[j] = 0
+                parents[j] = i
+                append(j)
+        frontier = reached
+    return parents
+
+
+class DistanceFieldStore:
+    """LRU cache of cheese distance fields keyed by (layout digest, cheese)."""
+
+    def __init__(
+        self,
+        max_fields: int = 1024,
+        max_layouts: int = 16,
+        disk: Optional[MazeDiskCache] = None,
+        shared: Optional[SharedMazeRegistry] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            max_fields: Number of distance fields kept
+            max_layouts: Number of flattened grids kept
+            disk: Shared on-disk cache, looked up before computing and filled after
+            shared: Shared memory registry, looked up first and filled after
+        """
+        self.max_fields = max_fields
+        self.max_layouts = max_layouts
+        self.disk = disk
+        self.shared = shared
+        self._fields: "OrderedDict[Tuple[str, Cell], Field]" = OrderedDict()
+        self._layouts: "OrderedDict[str, PaddedGrid]" = OrderedDict()
+        # (width, height) of every layout with cached fields
+        self._geometry: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.computed = 0
+        self.loaded = 0
+        self.hits = 0
+        self.invalidated = 0
+
+    def padded(self, grid: Grid) -> PaddedGrid:
+        """Return the flattened grid of a layout."""
+        digest = grid.digest
+        with self._lock:
+            padded = self._layouts.get(digest)
+            if padded is not None:
+                self._layouts.move_to_end(digest)
+                return padded
+        padded = self._load_padded(grid)
+        with self._lock:
+            self._layouts[digest] = padded
+            self._geometry[digest] = (padded.width, padded.height)
+            while len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+            if len(self._geometry) > self.max_fields:
+                live = {key[0] for key in self._fields} | set(self._layouts)
+                self._geometry = {layout: size for layout, size in self._geometry.items() if layout in live}
+        return padded
+
+    def _load_padded(self, grid: Grid) -> PaddedGrid:
+        """Flattened grid from shared memory or the disk cache, or built (and persisted)."""
+        maze = self.shared.publish(grid) if self.shared is not None else None
+        if maze is not None:
+            return PaddedGrid.from_bitmap(maze.free)
+        if self.disk is None:
+            return PaddedGrid(grid)
+        bitmap = self.disk.load_free(grid.digest)
+        if bitmap is not None and bitmap.shape == (grid.height + 2, grid.width + 2):
+            return PaddedGrid.from_bitmap(bitmap)
+        padded = PaddedGrid(grid)
+        self.disk.store_free(grid.digest, padded.bitmap())
+        return padded
+
+    def field(self, grid: Grid, cheese: List[int]) -> Field:
+        """Return the distance field of a cheese, from shared memory, the disk cache or computed on first use."""
+        key = (grid.digest, (cheese[0], cheese[1]))
+        with self._lock:
+            field = self._fields.get(key)
+            if field is not None:
+                self._fields.move_to_end(key)
+                self.hits += 1
+                return field
+
+        registry = self.shared
+        maze = registry.publish(grid) if registry is not None else None
+        shared = maze.field(cheese) if maze is not None else None
+        if shared is not None:
+            with self._lock:
+                self.loaded += 1
+            field = memoryview(shared)
+        else:
+            field = self._load_field(grid, cheese)
+            if field is None:
+                padded = self.padded(grid)
+                field = bfs_distances(padded, padded.index(cheese))
+                if self.disk is not None:
+                    self.disk.store_field(grid.digest, cheese, np.frombuffer(field, dtype=np.int32))
+                with self._lock:
+                    self.computed += 1
+            if registry is not None and maze is not None:
+                # The private copy is dropped for the shared one
+                shared = registry.add_field(maze, cheese, field)
+                if shared is not None:
+                    field = memoryview(shared)
+        with self._lock:
+            self._fields[key] = field
+            while len(self._fields) > self.max_fields:
+                self._fields.popitem(last=False)
+        return field
+
+    def _load_field(self, grid: Grid, cheese: List[int]) -> Optional[Field]:
+        if self.disk is None:
+            return None
+        field = self.disk.load_field(grid.digest, cheese)
+        if field is None or field.shape != ((grid.height + 2) * (grid.width + 2),):
+            return None
+        with self._lock:
+            self.loaded += 1
+        return memoryview(field)
+
+    def distance_matrix(self, grid: Grid, positions: List[List[int]], cheeses: List[List[int]]) -> np.ndarray:
+        """
+        Maze distances between positions and cheeses.
+
+        Returns:
+            np.ndarray: int32 matrix of shape (len(positions), len(cheeses)),
+            ``UNREACHABLE`` where a cheese cannot be reached
+        """
+        padded = self.padded(grid)
+        indexes = np.array([padded.index(p) for p in positions], dtype=np.int64)
+        outside = indexes < 0
+        indexes[outside] = 0  # border cell, always unreachable
+
+        matrix = np.empty((len(positions), len(cheeses)), dtype=np.int32)
+        for column, cheese in enumerate(cheeses):
+            matrix[:, column] = np.frombuffer(self.field(grid, cheese), dtype=np.int32)[indexes]
+        return matrix
+
+    def rebase(self, old_layout: str, new_layout: str, changes: List[CellChange]) -> int:
+        """
+        Carry distance fields over to a modified layout.
+
+        A field is dropped if a cell that became a wall was reachable (its
+        distances may grow), or if a cell that became free touches a
+        reachable cell (it may open a shortcut). Other fields are unchanged.
+
+        Returns:
+            int: Number of fields dropped
+        """
+        dropped = 0
+        with self._lock:
+            geometry = self._geometry.get(old_layout)
+            for key in [key for key in self._fields if key[0] == old_layout]:
+                field = self._fields.pop(key)
+                if geometry is None or self._affected(geometry, field, changes):
+                    dropped += 1
+                else:
+                    self._fields[(new_layout, key[1])] = field
+            if geometry is not None:
+                self._geometry.setdefault(new_layout, geometry)
+            self.invalidated += dropped
+        return dropped
+
+    @staticmethod
+    def _affected(geometry: Tuple[int, int], field: Field, changes: List[CellChange]) -> bool:
+        width, height = geometry
+        stride = width + 2
+        for x, y, wall in changes:
+            if not (0 <= x < width and 0 <= y < height):
+                return True
+            i = (y + 1) * stride + x + 1
+            if wall:
+                if field[i] != UNREACHABLE:
+                    return True
+            elif any(field[j] != UNREACHABLE for j in (i - stride, i + 1, i + stride, i - 1)):
+                return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and counters."""
+        stats: Dict[str, Any] = {"fields": len(self._fields), "computed": self.computed, "loaded": self.loaded, "hits": self.hits, "invalidated": self.invalidated}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        if self.shared is not None:
+            stats["shared"] = self.shared.stats()
+        return stats
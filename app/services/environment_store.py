@@ -0,0 +1,182 @@
+"""
+Versioned per-simulation environments for delta updates.
+
+A client that sends a full grid together with a ``simulationId`` and an
+``environmentVersion`` lets the server keep that environment. On the next
+turns it can send only the cells that changed since that version. Layout
+changes are forwarded to the caches keyed by layout so that only the
+entries affected by the changed cells are invalidated.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.grid import WALL, Grid
+from app.services.path_cache import CellChange, PathCache
+
+Cell = Tuple[int, int]
+# Called with (old layout digest, new layout digest, changed cells)
+RebaseHook = Callable[[str, str, List[CellChange]], object]
+
+
+class ResyncNeeded(Exception):
+    """Raised when a delta update does not apply to the environment held by the server."""
+
+    def __init__(self, simulation_id: str, server_version: Optional[int], message: str):
+        super().__init__(message)
+        self.simulation_id = simulation_id
+        self.server_version = server_version
+
+
+class EnvironmentSession:
+    """Environment of one simulation at a given version."""
+
+    __slots__ = ("simulation_id", "version", "grid", "cheeses", "updated_at")
+
+    def __init__(self, simulation_id: str, version: int, grid: Grid, cheeses: Set[Cell]):
+        self.simulation_id = simulation_id
+        self.version = version
+        self.grid = grid
+        self.cheeses = cheeses
+        self.updated_at = time.time()
+
+    def cheese_positions(self) -> List[List[int]]:
+        """Return the cheese positions as [[x, y], ...] in a stable order."""
+        return [[x, y] for x, y in sorted(self.cheeses, key=lambda cell: (cell[1], cell[0]))]
+
+
+def grid_changes(old: Grid, new: Grid) -> Optional[List[CellChange]]:
+    """
+    List the cells whose passability differs between two grids.
+
+    Returns:
+        Optional[List[CellChange]]: Changed cells, or None if the sizes differ
+    """
+    if (old.width, old.height) != (new.width, new.height):
+        return None
+    changes: List[CellChange] = []
+    for y, (old_row, new_row) in enumerate(zip(old, new)):
+        if old_row != new_row:
+            changes.extend((x, y, new_row[x] == WALL) for x in range(new.width) if old_row[x] != new_row[x])
+    return changes
+
+
+class EnvironmentStore:
+    """Per-simulation environments and the layout caches they invalidate."""
+
+    def __init__(self, max_sessions: int = 256, path_cache: Optional[PathCache] = None):
+        """
+        Initialize the store.
+
+        Args:
+            max_sessions: Number of simulations kept (least recently updated first out)
+            path_cache: Shared path cache invalidated on layout changes
+        """
+        self.max_sessions = max_sessions
+        self.path_cache = path_cache if path_cache is not None else PathCache()
+        self._sessions: "OrderedDict[str, EnvironmentSession]" = OrderedDict()
+        self._rebase_hooks: List[RebaseHook] = [self.path_cache.rebase]
+        self._lock = threading.Lock()
+
+    def add_rebase_hook(self, hook: RebaseHook):
+        """Register another layout-keyed cache to invalidate on layout changes."""
+        self._rebase_hooks.append(hook)
+
+    def get(self, simulation_id: str) -> Optional[EnvironmentSession]:
+        """Return the environment held for a simulation."""
+        with self._lock:
+            return self._sessions.get(simulation_id)
+
+    def put(self, simulation_id: str, version: int, grid: Grid, cheeses: Iterable[List[int]]) -> EnvironmentSession:
+        """
+        Store a full environment.
+
+        If the simulation already had a grid of the same size, the cells that
+        changed are forwarded to the layout caches.
+        """
+        session = EnvironmentSession(simulation_id, version, grid, {(c[0], c[1]) for c in cheeses})
+        with self._lock:
+            previous = self._sessions.get(simulation_id)
+            self._store(session)
+        if previous is not None and previous.grid.digest != grid.digest:
+            changes = grid_changes(previous.grid, grid)
+            if changes is not None:
+                self._rebase(previous.grid.digest, grid.digest, changes)
+        return session
+
+    def apply_diffs(self, simulation_id: str, base_version: int, version: int, diffs: List[Tuple[int, int, str]]) -> EnvironmentSession:
+        """
+        Apply cell diffs on top of the held environment.
+
+        Diffs use the frontend cell names: ``"wall"`` is impassable,
+        ``"cheese"`` adds a cheese, any other name frees the cell and removes
+        its cheese. Re-sending an update that was already applied (several
+        mice of the same simulation sending the same turn) is accepted as is.
+
+        Args:
+            simulation_id: Simulation identifier
+            base_version: Version the diffs were computed from
+            version: Version after applying the diffs
+            diffs: Changed cells as (x, y, cell name)
+
+        Returns:
+            EnvironmentSession: Updated environment
+
+        Raises:
+            ResyncNeeded: If the server does not hold base_version
+            ValueError: If a diff is outside the grid
+        """
+        with self._lock:
+            session = self._sessions.get(simulation_id)
+            if session is None:
+                raise ResyncNeeded(simulation_id, None, f"No environment held for simulation {simulation_id}")
+            if session.version == version:
+                return session
+            if session.version != base_version:
+                raise ResyncNeeded(
+                    simulation_id, session.version,
+                    f"Simulation {simulation_id} is at version {session.version}, not {base_version}"
+                )
+
+            grid = session.grid
+            rows: Dict[int, bytearray] = {}
+            cheeses = set(session.cheeses)
+            changes: List[CellChange] = []
+            for x, y, cell in diffs:
+                if not (0 <= x < grid.width and 0 <= y < grid.height):
+                    raise ValueError(f"Cell diff ({x}, {y}) is outside the {grid.width}x{grid.height} grid")
+                wall = cell == "wall"
+                row = rows.get(y)
+                if row is None:
+                    row = rows[y] = bytearray(grid[y])
+                if row[x] != wall:
+                    row[x] = wall
+                    changes.append((x, y, wall))
+                if cell == "cheese":
+                    cheeses.add((x, y))
+                else:
+                    cheeses.discard((x, y))
+
+            # Unchanged rows are shared with the previous grid
+            new_grid = Grid(rows.get(y, row) for y, row in enumerate(grid)) if changes else grid
+            updated = EnvironmentSession(simulation_id, version, new_grid, cheeses)
+            self._store(updated)
+
+        if changes:
+            self._rebase(grid.digest, new_grid.digest, changes)
+        return updated
+
+    def _store(self, session: EnvironmentSession):
+        self._sessions[session.simulation_id] = session
+        self._sessions.move_to_end(session.simulation_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def _rebase(self, old_layout: str, new_layout: str, changes: List[CellChange]):
+        for hook in self._rebase_hooks:
+            hook(old_layout, new_layout, changes)
+
+    def stats(self) -> Dict[str, object]:
+        """Return the number of held simulations and the path cache counters."""
+        return {"sessions": len(self._sessions), "path_cache": self.path_cache.stats()}
@@ -3,36 +3,84 @@ Log service for managing server logs and streaming them to clients.
 """
 import asyncio
 import logging
-from typing import List, Dict, Any, AsyncGenerator
-from datetime import datetime
+import os
+import time
+import weakref
+from typing import List, Dict, Any, AsyncGenerator, Deque, Optional, Tuple
 from collections import deque
 import threading
 
+from app.core.serialization import SSEFrameCache, Timestamp, iso_timestamp
+from app.services.log_subscriber import DROP_OLDEST, LogSubscriber
+
 logger = logging.getLogger(__name__)
 
+# Services whose consumer is reset in a forked child (see _reset_after_fork)
+_services: "weakref.WeakSet[LogService]" = weakref.WeakSet()
+
 
 class LogService:
-    """Service for managing and streaming server logs."""
+    """
+    Service for managing and streaming server logs.
+    
+    Request code only appends a lightweight tuple to a deque (append and
+    popleft are atomic, so producers never take a lock). A single
+    background consumer builds the entries, stores them and fans them out
+    to the subscribers in batches, one ``call_soon_threadsafe`` per
+    subscriber and batch. Each subscriber has a bounded buffer with its own
+    backpressure policy. Entry timestamps are integer nanoseconds,
+    formatted as ISO strings only when an entry is serialized. When the
+    consumer falls behind, the queue holds at most ``max_pending`` logs and
+    new ones are dropped and counted.
+    """
     
-    def __init__(self, max_logs: int = 1000):
+    def __init__(self, max_logs: int = 1000, background: bool = True, batch_size: int = 256, max_pending: int = 10000):
         """
         Initialize the log service.
         
         Args:
             max_logs: Maximum number of logs to keep in memory
+            background: Process logs on the consumer thread (inline when False)
+            batch_size: Maximum number of entries published at once
+            max_pending: Maximum number of logs waiting for the consumer
         """
         self.max_logs = max_logs
-        self.logs = deque(maxlen=max_logs)
-        self.subscribers: List[asyncio.Queue] = []
+        self.background = background
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.logs: Deque[Dict[str, Any]] = deque(maxlen=max_logs)
+        self.subscribers: List[LogSubscriber] = []
         self.lock = threading.Lock()
+        # Frames encoded once per entry for all SSE clients
+        self.frame_cache = SSEFrameCache(max_entries=max_logs * 2)
         
-        # Configurer le logger pour capturer les logs
-        self._setup_log_capture()
+        # File d'attente multi-producteurs, un seul consommateur
+        self._pending: deque = deque()
+        self._wakeup = threading.Event()
+        self._idle = False
+        self._consumer: Optional[threading.Thread] = None
+        self._consumer_lock = threading.Lock()
+        self.batches_published = 0
+        # Logs dropped because the queue was full (incremented under a lock, off the common path)
+        self.dropped_logs = 0
+        self._dropped_lock = threading.Lock()
+        _services.add(self)
+        
+        self._capture_handler: Optional[logging.Handler] = None
         
         logger.info("LogService initialized")
     
-    def _setup_log_capture(self):
-        """Setup log capture to intercept all logging messages."""
+    def install_handler(self):
+        """
+        Capture all logging messages in this service.
+        
+        Adds a handler to the root logger; called once by the application
+        factory rather than at import, so that scripts and tests importing
+        the services do not reconfigure logging. Idempotent.
+        """
+        if self._capture_handler is not None:
+            return
+        
         # Créer un handler personnalisé pour capturer les logs
         class LogCaptureHandler(logging.Handler):
             def __init__(self, log_service):
@@ -41,17 +89,8 @@ class LogService:
             
             def emit(self, record):
                 try:
-                    log_entry = {
-                        'type': 'log',
-                        'level': record.levelname,
-                        'message': record.getMessage(),
-                        'module': record.module,
-                        'function': record.funcName,
-                        'line': record.lineno,
-                        'timestamp': datetime.fromtimestamp(record.created).isoformat(),
-                        'thread_id': record.thread
-                    }
-                    self.log_service.add_log(log_entry)
+                    # L'entrée est construite par le consommateur
+                    self.log_service._submit(("record", record))
                 except Exception:
                     pass  # Éviter les erreurs infinies
         
@@ -60,6 +99,7 @@ class LogService:
         handler = LogCaptureHandler(self)
         handler.setLevel(logging.INFO)
         root_logger.addHandler(handler)
+        self._capture_handler = handler
     
     def add_log(self, log_entry: Dict[str, Any]):
         """
@@ -68,38 +108,143 @@ class LogService:
         Args:
             log_entry: Log entry dictionary
         """
-        with self.lock:
-            self.logs.append(log_entry)
-            
-            # Notifier tous les abonnés
-            for queue in self.subscribers[:]:  # Copie pour éviter les modifications pendant l'itération
-                try:
-                    queue.put_nowait(log_entry)
-                except asyncio.QueueFull:
-                    # Retirer les abonnés avec des queues pleines
-                    self.subscribers.remove(queue)
-                except Exception:
-                    # Retirer les abonnés avec des erreurs
-                    self.subscribers.remove(queue)
+        self._submit(("entry", log_entry))
     
     def add_custom_log(self, message: str, level: str = "INFO", **kwargs):
         """
         Add a custom log entry.
         
+        The entry is built by the consumer thread; its timestamp is kept in
+        nanoseconds and only formatted when the entry is serialized.
+        
         Args:
             message: Log message
             level: Log level (INFO, DEBUG, WARNING, ERROR)
             **kwargs: Additional log data
         """
-        log_entry = {
-            'type': 'custom',
-            'level': level,
-            'message': message,
-            'timestamp': datetime.now().isoformat(),
-            'thread_id': threading.get_ident(),
-            **kwargs
-        }
-        self.add_log(log_entry)
+        self._submit(("custom", level, message, time.time_ns(), threading.get_ident(), kwargs))
+    
+    def flush(self, timeout: float = 1.0) -> bool:
+        """
+        Wait until every log submitted so far is stored and fanned out.
+        
+        Returns:
+            bool: False if the timeout expired first
+        """
+        if not self.background:
+            return True
+        done = threading.Event()
+        self._submit(done)
+        return done.wait(timeout)
+    
+    def _submit(self, item: Any):
+        """Queue an item for the consumer, or publish it inline."""
+        if not self.background:
+            if not isinstance(item, threading.Event):
+                self._publish([self._build(item)])
+            return
+        if self._consumer is None:
+            self._start_consumer()
+        # Flush markers always go through, or flush() would wait for nothing
+        if len(self._pending) >= self.max_pending and not isinstance(item, threading.Event):
+            with self._dropped_lock:
+                self.dropped_logs += 1
+            return
+        self._pending.append(item)
+        if self._idle:
+            self._wakeup.set()
+    
+    def _start_consumer(self):
+        with self._consumer_lock:
+            if self._consumer is None:
+                self._consumer = threading.Thread(target=self._consume, name="log-consumer", daemon=True)
+                self._consumer.start()
+    
+    def _reset_consumer(self):
+        """Give a forked child its own queue; the parent's consumer thread does not exist there."""
+        self._pending = deque()
+        self._wakeup = threading.Event()
+        self._idle = False
+        self._consumer = None
+        self._consumer_lock = threading.Lock()
+        self._dropped_lock = threading.Lock()
+        self.lock = threading.Lock()
+    
+    def _consume(self):
+        """Consumer loop: drain the queue in batches, sleep when it is empty."""
+        pending = self._pending
+        while True:
+            if not pending:
+                # Re-check after announcing the wait, so that no wake-up is missed
+                self._idle = True
+                self._wakeup.clear()
+                if not pending:
+                    self._wakeup.wait()
+                self._idle = False
+                continue
+            
+            entries = []
+            flushed = []
+            while pending and len(entries) < self.batch_size:
+                item = pending.popleft()
+                if isinstance(item, threading.Event):
+                    flushed.append(item)
+                    continue
+                try:
+                    entries.append(self._build(item))
+                except Exception:
+                    pass  # Une entrée invalide ne doit pas arrêter le consommateur
+            if entries:
+                self._publish(entries)
+            for done in flushed:
+                done.set()
+    
+    @staticmethod
+    def _build(item: Tuple) -> Dict[str, Any]:
+        """Build a log entry from a queued item."""
+        kind = item[0]
+        if kind == "custom":
+            _, level, message, timestamp, thread_id, extra = item
+            return {
+                'type': 'custom',
+                'level': level,
+                'message': message,
+                'timestamp': Timestamp(timestamp),
+                'thread_id': thread_id,
+                **extra
+            }
+        if kind == "record":
+            record = item[1]
+            return {
+                'type': 'log',
+                'level': record.levelname,
+                'message': record.getMessage(),
+                'module': record.module,
+                'function': record.funcName,
+                'line': record.lineno,
+                'timestamp': Timestamp(int(record.created * 1_000_000_000)),
+                'thread_id': record.thread
+            }
+        return item[1]
+    
+    def _publish(self, entries: List[Dict[str, Any]]):
+        """Store a batch of entries and schedule its delivery on every subscriber's loop."""
+        with self.lock:
+            self.logs.extend(entries)
+            self.batches_published += 1
+            subscribers = list(self.subscribers)
+        
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, entries)
+            except RuntimeError:
+                # Boucle fermée
+                self._unsubscribe(subscriber)
+    
+    def _unsubscribe(self, subscriber: LogSubscriber):
+        with self.lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
     
     def get_recent_logs(self, count: int = 100) -> List[Dict[str, Any]]:
         """
@@ -114,16 +259,36 @@ class LogService:
         with self.lock:
             return list(self.logs)[-count:]
     
-    async def get_logs_stream(self) -> AsyncGenerator[Dict[str, Any], None]:
+    async def get_logs_stream(
+        self,
+        policy: str = DROP_OLDEST,
+        max_queue: int = 100,
+        sample_every: int = 1,
+        client: str = ""
+    ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Stream logs as they are added.
         
+        The client's buffer is bounded; when it is full, the policy decides
+        which entries are kept (see LogSubscriber) and dropped entries are
+        announced with a ``gap`` event.
+        
+        Args:
+            policy: Backpressure policy (drop_oldest, coalesce or sample)
+            max_queue: Maximum number of entries buffered for the client
+            sample_every: Keep one entry out of this many (sample policy)
+            client: Label of the client in the stats
+        
         Yields:
             Log entries as they are created
+        
+        Raises:
+            ValueError: On an unknown policy or invalid sizes
         """
-        # Créer une queue pour ce client
-        queue = asyncio.Queue(maxsize=100)
-        self.subscribers.append(queue)
+        # Tampon borné pour ce client, alimenté depuis le thread consommateur
+        subscriber = LogSubscriber(asyncio.get_running_loop(), policy, max_queue, sample_every, client)
+        with self.lock:
+            self.subscribers.append(subscriber)
         
         try:
             # Envoyer les logs récents d'abord
@@ -134,21 +299,20 @@ class LogService:
             # Ensuite, streamer les nouveaux logs
             while True:
                 try:
-                    log_entry = await asyncio.wait_for(queue.get(), timeout=30.0)
+                    log_entry = await asyncio.wait_for(subscriber.get(), timeout=30.0)
                     yield log_entry
                 except asyncio.TimeoutError:
                     # Envoyer un heartbeat pour maintenir la connexion
                     yield {
                         'type': 'heartbeat',
-                        'timestamp': datetime.now().isoformat()
+                        'timestamp': iso_timestamp()
                     }
                     
         except asyncio.CancelledError:
             logger.info("Log stream cancelled")
         finally:
             # Nettoyer l'abonnement
-            if queue in self.subscribers:
-                self.subscribers.remove(queue)
+            self._unsubscribe(subscriber)
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -162,10 +326,31 @@ class LogService:
                 'total_logs': len(self.logs),
                 'max_logs': self.max_logs,
                 'active_subscribers': len(self.subscribers),
-                'oldest_log': self.logs[0]['timestamp'] if self.logs else None,
-                'newest_log': self.logs[-1]['timestamp'] if self.logs else None
+                'subscribers': [subscriber.stats() for subscriber in self.subscribers],
+                'pending_logs': len(self._pending),
+                'dropped_logs': self.dropped_logs,
+                'batches_published': self.batches_published,
+                'oldest_log_ns': _timestamp_ns(self.logs[0]) if self.logs else None,
+                'newest_log_ns': _timestamp_ns(self.logs[-1]) if self.logs else None,
+                'sse_frame_cache': self.frame_cache.stats()
             }
 
 
+def _timestamp_ns(log_entry: Dict[str, Any]) -> Optional[int]:
+    """Nanosecond timestamp of an entry, None for entries added with another timestamp type."""
+    return getattr(log_entry.get('timestamp'), 'ns', None)
+
+
+def _reset_after_fork():
+    """Reset the consumer of every log service in a forked child."""
+    for service in list(_services):
+        service._reset_consumer()
+
+
+# Registered once for all the instances: a hook per instance would keep each one alive
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 # Instance globale du service de logs
 log_service = LogService()
@@ -0,0 +1,143 @@
+"""
+Bounded buffers of SSE log stream clients, with a backpressure policy each.
+
+A slow client never makes the log service drop the connection: its buffer
+stays bounded and the policy decides which entries are kept.
+"""
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.serialization import Timestamp, iso_timestamp
+
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+SAMPLE = "sample"
+POLICIES = (DROP_OLDEST, COALESCE, SAMPLE)
+
+
+class LogSubscriber:
+    """
+    Buffer of one log stream client.
+
+    Policies:
+        - drop_oldest: keep the last ``maxsize`` entries; the number of
+          dropped entries is reported to the client in a ``gap`` event
+        - coalesce: keep only the latest entry per mouse (entries without a
+          ``mouse_id`` are kept as they come, oldest dropped first)
+        - sample: keep one entry out of ``sample_every``, then drop oldest
+
+    ``deliver`` and ``get`` must run on the subscriber's event loop.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        policy: str = DROP_OLDEST,
+        maxsize: int = 100,
+        sample_every: int = 1,
+        client: str = ""
+    ):
+        """
+        Initialize the subscriber.
+
+        Args:
+            loop: Event loop of the client connection
+            policy: One of POLICIES
+            maxsize: Maximum number of buffered entries
+            sample_every: Keep one entry out of this many (sample policy)
+            client: Label shown in the stats
+
+        Raises:
+            ValueError: On an unknown policy or invalid sizes
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}', expected one of {POLICIES}")
+        if maxsize < 1 or sample_every < 1:
+            raise ValueError("maxsize and sample_every must be positive")
+        self.loop = loop
+        self.policy = policy
+        self.maxsize = maxsize
+        self.sample_every = sample_every
+        self.client = client
+        self._buffer: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._ready = asyncio.Event()
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.sampled_out = 0
+        self._gap = 0
+
+    def deliver(self, entries: List[Dict[str, Any]]):
+        """Add a batch of entries according to the policy."""
+        for entry in entries:
+            self.received += 1
+            if self.policy == SAMPLE and (self.received - 1) % self.sample_every:
+                self.sampled_out += 1
+                continue
+
+            key = None
+            if self.policy == COALESCE:
+                key = entry.get("mouse_id")
+                if key is not None and self._buffer.pop(key, None) is not None:
+                    self.coalesced += 1
+            if key is None:
+                key = next(self._sequence)
+            self._buffer[key] = entry
+
+            if len(self._buffer) > self.maxsize:
+                self._buffer.popitem(last=False)
+                self.dropped += 1
+                self._gap += 1
+        if self._buffer:
+            self._ready.set()
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Wait for the next event of the client.
+
+        Returns a ``gap`` event first when entries were dropped since the
+        previous call.
+        """
+        while not self._buffer and not self._gap:
+            self._ready.clear()
+            await self._ready.wait()
+        if self._gap:
+            gap, self._gap = self._gap, 0
+            return {"type": "gap", "dropped": gap, "policy": self.policy, "timestamp": iso_timestamp()}
+        entry = self._buffer.popitem(last=False)[1]
+        self.delivered += 1
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the queue depth, the lag and the counters of the client."""
+        return {
+            "client": self.client,
+            "policy": self.policy,
+            "queue_depth": len(self._buffer),
+            "lag_ms": self._lag_ms(),
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "sampled_out": self.sampled_out
+        }
+
+    def _lag_ms(self) -> Optional[float]:
+        """Age of the oldest buffered entry, 0 when the client is up to date."""
+        if not self._buffer:
+            return 0.0
+        try:
+            oldest: Optional[Timestamp] = next(iter(self._buffer.values())).get("timestamp")
+        except (RuntimeError, StopIteration):
+            return None  # Buffer modified by the client's loop meanwhile
+        if not isinstance(oldest, Timestamp):
+            return None
+        return round((time.time_ns() - oldest.ns) / 1e6, 3)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
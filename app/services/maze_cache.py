@@ -0,0 +1,152 @@
+"""
+On-disk cache of preprocessed maze artifacts, shared by processes.
+
+Artifacts are stored under the layout digest of their grid (a content
+hash, see Grid.digest), one directory per layout:
+
+    <root>/<digest[:2]>/<digest>/free.npy             padded passability bitmap (uint8)
+    <root>/<digest[:2]>/<digest>/field-<x>-<y>.npy    BFS distance field of a cheese (int32)
+
+Files are ``.npy`` arrays loaded with ``mmap_mode="r"``: all the workers of
+a host map the same pages from the page cache instead of each holding its
+own copy. Writes go to a temporary file renamed into place, so readers
+never see a partial file, and concurrent writers of the same artifact
+simply replace identical content. The cache is trimmed to ``max_bytes``,
+least recently used files first.
+"""
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FREE_FILE = "free.npy"
+
+
+class MazeDiskCache:
+    """Content-addressed store of memory-mapped maze artifacts."""
+
+    def __init__(self, root: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Cache directory, created if needed
+            max_bytes: Total size above which the least recently used files are removed
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = self._disk_usage()
+        self.loads = 0
+        self.writes = 0
+        self.evicted = 0
+
+    def layout_dir(self, digest: str) -> Path:
+        """Directory of the artifacts of one layout."""
+        return self.root / digest[:2] / digest
+
+    def load_free(self, digest: str) -> Optional[np.ndarray]:
+        """Padded passability bitmap of a layout, shape (height + 2, width + 2), or None."""
+        return self._load(self.layout_dir(digest) / FREE_FILE)
+
+    def store_free(self, digest: str, free: np.ndarray):
+        """Persist the padded passability bitmap of a layout."""
+        self._store(self.layout_dir(digest) / FREE_FILE, free.astype(np.uint8, copy=False))
+
+    def load_field(self, digest: str, cheese: List[int]) -> Optional[np.ndarray]:
+        """Distance field of a cheese (int32, flat padded indexes), or None."""
+        return self._load(self._field_path(digest, cheese))
+
+    def store_field(self, digest: str, cheese: List[int], field: np.ndarray):
+        """Persist the distance field of a cheese."""
+        self._store(self._field_path(digest, cheese), field.astype(np.int32, copy=False))
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache size and counters."""
+        return {"bytes": self._size, "max_bytes": self.max_bytes, "loads": self.loads, "writes": self.writes, "evicted": self.evicted}
+
+    def _field_path(self, digest: str, cheese: List[int]) -> Path:
+        return self.layout_dir(digest) / f"field-{cheese[0]}-{cheese[1]}.npy"
+
+    def _load(self, path: Path) -> Optional[np.ndarray]:
+        try:
+            array = np.load(path, mmap_mode="r", allow_pickle=False)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable maze cache file {path}: {e}")
+            return None
+        try:
+            os.utime(path)  # Recency for the eviction
+        except OSError:
+            pass
+        self.loads += 1
+        return array
+
+    def _store(self, path: Path, array: np.ndarray):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                np.save(f, np.ascontiguousarray(array), allow_pickle=False)
+                f.flush()
+                os.fsync(f.fileno())
+            size = os.path.getsize(temporary)
+            os.replace(temporary, path)
+        except OSError as e:
+            logger.warning(f"Could not write maze cache file {path}: {e}")
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self.writes += 1
+            self._size += size
+            over = self._size > self.max_bytes
+        if over:
+            self._evict()
+
+    def _files(self) -> List[Tuple[float, int, Path]]:
+        """(last use, size, path) of every artifact file."""
+        files = []
+        for path in self.root.glob("*/*/*.npy"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another process meanwhile
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _disk_usage(self) -> int:
+        return sum(size for _, size, _ in self._files())
+
+    def _evict(self):
+        """Remove the least recently used files until the cache fits in max_bytes."""
+        with self._lock:
+            # Other processes write to the same directory: start from the real usage
+            files = sorted(self._files())
+            size = sum(entry[1] for entry in files)
+            for _, file_size, path in files:
+                if size <= self.max_bytes:
+                    break
+                try:
+                    # Processes that mapped the file keep their pages until they unmap it
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                size -= file_size
+                self.evicted += 1
+                try:
+                    path.parent.rmdir()
+                    path.parent.parent.rmdir()
+                except OSError:
+                    pass  # Directory not empty
+            self._size = size
@@ -1,22 +1,67 @@
 """
 Mouse AI service compatible with frontend format.
 """
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 import logging
+import time
 
+from app.core.grid import Grid
 from app.core.utils import is_valid_position, get_adjacent_positions
+from app.services.components import NO_COMPONENT, ComponentIndex
 from app.services.log_service import log_service
+from app.services.path_cache import PathCache
+from app.services.path_trees import PathTreeStore
+from app.services.planner import ASTAR, BOUNDED, GREEDY, PATH_TREE
+from app.services.single_flight import SingleFlight
+from app.services.position_history import PositionHistory
+from app.services.reservations import ReservationTable
 
 logger = logging.getLogger(__name__)
 
+# Heuristic weights of the successive searches of the anytime strategy
+ANYTIME_WEIGHTS = (3.0, 1.5, 1.0)
+
 
 class MouseAIService:
     """Service for handling mouse AI logic compatible with frontend."""
     
-    def __init__(self, mouse_id: str = "default"):
-        """Initialize the AI service with position history tracking for a specific mouse."""
+    def __init__(
+        self,
+        mouse_id: str = "default",
+        path_cache: Optional[PathCache] = None,
+        path_flight: Optional[SingleFlight] = None,
+        path_trees: Optional[PathTreeStore] = None,
+        components: Optional[ComponentIndex] = None,
+        log_decisions: bool = True
+    ):
+        """
+        Initialize the AI service with position history tracking for a specific mouse.
+        
+        Args:
+            mouse_id: Identifier used in the logs
+            path_cache: Shared path cache of the A* searches on Grid labyrinths
+                (the astar strategy, or every search without path trees)
+            path_flight: Shared single-flight layer coalescing identical concurrent
+                searches on cache misses (used with the path cache)
+            path_trees: Shared per-cheese shortest-path trees, used instead of
+                A* to reach a cheese in Grid labyrinths
+            components: Shared connected-component labels, used to skip the
+                searches of unreachable goals in Grid labyrinths
+            log_decisions: Send every decision to the log service (headless
+                simulations turn it off)
+        """
         self.mouse_id = mouse_id
-        self.position_history = []  # [previous_positions] for this specific mouse
+        self.position_history = PositionHistory()  # previous positions of this specific mouse
+        self.nodes_expanded = 0  # Total A* nodes expanded, read by the benchmarks
+        self.path_cache = path_cache
+        self.path_flight = path_flight
+        self.path_trees = path_trees
+        self.components = components
+        self.log_decisions = log_decisions
+        self.last_path: List[List[int]] = []  # A* path of the last decision, used for reservations
+        self.last_strategy: Optional[str] = None  # Planning strategy of the last decision (see app.services.planner)
+        # Bound of the length of the last planned path over the shortest one (1.0 = shortest), None if partial
+        self.last_bound: Optional[float] = None
         logger.info(f"- Thread {mouse_id} - Initialized MouseAIService for mouse: {mouse_id}")
     
     def calculate_next_position(
@@ -25,17 +70,34 @@ class MouseAIService:
         current_position: List[int], 
         goal_position: List[int],
         mouse_id: str = "default",
-        available_cheeses: List[List[int]] = None
+        available_cheeses: List[List[int]] = None,
+        reservations: Optional[ReservationTable] = None,
+        tick: int = 0,
+        strategy: Optional[str] = None,
+        node_limit: Optional[int] = None,
+        deadline: Optional[float] = None
     ) -> List[int]:
         """
         Calculate the next position for the mouse using intelligent algorithm.
         
+        With a reservation table, the move avoids cells reserved by other
+        mice for the next tick, and the planned path is reserved in turn.
+        
+        The strategy (chosen by PlannerSelector under a latency budget) sets
+        how paths are found; the bounded and greedy ones keep the given goal
+        instead of comparing the path lengths to every cheese.
+        
         Args:
             labyrinth: 2D maze representation (0=free, 1=wall)
             current_position: Current mouse position [x, y]
             goal_position: Target goal position [x, y]
             mouse_id: Unique identifier for the mouse
             available_cheeses: List of available cheese positions [[x, y], ...]
+            reservations: Space-time reservations of the simulation
+            tick: Current tick, used with the reservations
+            strategy: Planning strategy, path trees (or A* without them) by default
+            node_limit: Expanded nodes allowed to a bounded search
+            deadline: time.perf_counter() value a bounded search stops at
             
         Returns:
             List[int]: Next position [x, y]
@@ -43,31 +105,45 @@ class MouseAIService:
         logger.info(f"- Thread {mouse_id} - Starting calculation for position {current_position}, goal {goal_position}")
         
         # Log du début du calcul d'IA
-        log_service.add_custom_log(
-            message=f" Thread {mouse_id} - Starting AI calculation for position {current_position}, goal {goal_position}",
-            level="DEBUG",
-            mouse_id=mouse_id,
-            current_position=current_position,
-            goal_position=goal_position,
-            available_cheeses=available_cheeses,
-            action="ai_calculation_start"
-        )
+        if self.log_decisions:
+            log_service.add_custom_log(
+                message=f" Thread {mouse_id} - Starting AI calculation for position {current_position}, goal {goal_position}",
+                level="DEBUG",
+                mouse_id=mouse_id,
+                current_position=current_position,
+                goal_position=goal_position,
+                available_cheeses=available_cheeses,
+                action="ai_calculation_start"
+            )
         
         # Validate current position
         if not is_valid_position(current_position, labyrinth):
             logger.warning(f"Current position {current_position} is invalid, trying to find valid position")
             # Try to find a valid position near the current one
-            valid_position = self._find_nearest_valid_position(current_position, labyrinth)
-            if valid_position:
+            valid_position = self._find_nearest_valid_position(current_position, labyrinth, goal_position)
+            if valid_position is not None:
                 logger.info(f"Found valid position {valid_position} near {current_position}")
                 current_position = valid_position
             else:
                 logger.error(f"No valid position found near {current_position}")
                 return current_position
         
+        strategy = strategy or self._default_strategy(labyrinth)
+        self.last_strategy = strategy
+        self.last_bound = None
+        
+        # Cheeses walled off from the mouse are neither targeted nor searched for
+        if available_cheeses and self.components is not None and isinstance(labyrinth, Grid):
+            reachable = self.components.reachable(labyrinth, current_position, available_cheeses)
+            if reachable:
+                available_cheeses = reachable
+                if goal_position not in reachable:
+                    goal_position = min(reachable, key=lambda cheese: self._calculate_heuristic(current_position, cheese))
+                    logger.info(f"- Thread {mouse_id} - Goal unreachable, targeting reachable cheese at {goal_position}")
+        
         # If multiple cheeses available, choose the nearest one
-        if available_cheeses and len(available_cheeses) > 1:
-            optimal_cheese = self._find_nearest_cheese(current_position, available_cheeses, labyrinth)
+        if available_cheeses and len(available_cheeses) > 1 and strategy in (PATH_TREE, ASTAR):
+            optimal_cheese = self._find_nearest_cheese(current_position, available_cheeses, labyrinth, strategy)
             if optimal_cheese:
                 goal_position = optimal_cheese
                 logger.info(f"- Thread {mouse_id} - Mouse {mouse_id} targeting nearest cheese at {goal_position}")
@@ -75,10 +151,21 @@ class MouseAIService:
         # If already at goal, stay in place
         if current_position == goal_position:
             logger.info(f"- Thread {mouse_id} - Mouse {mouse_id} is already at goal position {goal_position}")
+            if reservations is not None:
+                reservations.reserve_position(mouse_id, current_position, tick)
             return current_position
         
         # Use intelligent pathfinding with back-and-forth avoidance
-        next_position = self._intelligent_move(labyrinth, current_position, goal_position, mouse_id)
+        self.last_path = []
+        next_position = self._intelligent_move(
+            labyrinth, current_position, goal_position, mouse_id, strategy, node_limit, deadline
+        )
+        
+        if reservations is not None:
+            next_position = self._avoid_reserved(
+                labyrinth, current_position, next_position, goal_position, mouse_id, reservations, tick
+            )
+            self._reserve_plan(reservations, mouse_id, current_position, next_position, tick)
         
         # Update position history
         self._update_position_history(current_position, next_position)
@@ -86,15 +173,16 @@ class MouseAIService:
         logger.info(f"- Thread {mouse_id} - Calculated next position: {next_position}")
         
         # Log du résultat du calcul d'IA
-        log_service.add_custom_log(
-            message=f" Thread {mouse_id} - AI calculation completed: {current_position} -> {next_position}",
-            level="DEBUG",
-            mouse_id=mouse_id,
-            current_position=current_position,
-            next_position=next_position,
-            goal_position=goal_position,
-            action="ai_calculation_complete"
-        )
+        if self.log_decisions:
+            log_service.add_custom_log(
+                message=f" Thread {mouse_id} - AI calculation completed: {current_position} -> {next_position}",
+                level="DEBUG",
+                mouse_id=mouse_id,
+                current_position=current_position,
+                next_position=next_position,
+                goal_position=goal_position,
+                action="ai_calculation_complete"
+            )
         
         return next_position
     
@@ -103,7 +191,10 @@ class MouseAIService:
         labyrinth: List[List[int]], 
         current_position: List[int], 
         goal_position: List[int],
-        mouse_id: str = "default"
+        mouse_id: str = "default",
+        strategy: Optional[str] = None,
+        node_limit: Optional[int] = None,
+        deadline: Optional[float] = None
     ) -> List[int]:
         """
         Intelligent movement algorithm using A* pathfinding.
@@ -112,22 +203,43 @@ class MouseAIService:
             labyrinth: 2D maze representation
             current_position: Current position [x, y]
             goal_position: Goal position [x, y]
+            strategy: Planning strategy, path trees (or A* without them) by default
+            node_limit: Expanded nodes allowed to a bounded search
+            deadline: time.perf_counter() value a bounded search stops at
             
         Returns:
             List[int]: Next position using intelligent approach
         """
+        # A mouse going round in circles follows the shortest path, which cannot loop
+        cycle = self.position_history.cycle_length(current_position)
+        if cycle:
+            logger.info(f"Mouse {mouse_id} is looping over {cycle} cells, following the shortest path")
+        
         # Check if mouse cannot move towards goal and needs exploration
-        if self._detect_no_movement_possible(labyrinth, current_position, goal_position):
+        if not cycle and self._detect_no_movement_possible(labyrinth, current_position, goal_position):
             logger.info(f"Mouse {mouse_id} cannot move towards goal, forcing exploration")
             forced_move = self._force_direction_change(labyrinth, current_position, goal_position, mouse_id)
             if forced_move:
                 return forced_move
         
-        # Try to find a path using A* algorithm
-        path = self._find_path_astar(labyrinth, current_position, goal_position)
+        strategy = strategy or self._default_strategy(labyrinth)
+        if strategy == BOUNDED:
+            path, self.last_bound = self._search_path_anytime(
+                labyrinth, current_position, goal_position, node_limit or 0, deadline
+            )
+            # A partial path does not lead to the goal: no lookahead nor reservation along it
+            self.last_path = path if self.last_bound is not None else []
+        elif strategy == GREEDY:
+            path = []
+        else:
+            path = self._find_path(labyrinth, current_position, goal_position, strategy)
+            self.last_path = path
+            self.last_bound = 1.0 if path else None
         
         if path and len(path) > 1:
             next_pos = path[1]
+            if cycle:
+                return next_pos
             
             # Check if mouse is stuck
             if self._is_stuck(mouse_id, current_position):
@@ -146,9 +258,81 @@ class MouseAIService:
             return next_pos
         
         # Fallback to greedy approach if A* fails
-        logger.warning(f"A* pathfinding failed from {current_position} to {goal_position}, falling back to greedy.")
+        if strategy != GREEDY:
+            logger.warning(f"A* pathfinding failed from {current_position} to {goal_position}, falling back to greedy.")
+            self.last_strategy = GREEDY
         return self._greedy_move(labyrinth, current_position, goal_position, mouse_id)
     
+    def _avoid_reserved(
+        self,
+        labyrinth: List[List[int]],
+        current_position: List[int],
+        next_position: List[int],
+        goal_position: List[int],
+        mouse_id: str,
+        reservations: ReservationTable,
+        tick: int
+    ) -> List[int]:
+        """
+        Replace a move that conflicts with another mouse's reservations.
+        
+        Prefers a free neighbor closer to the goal, then waiting in place,
+        then any free neighbor.
+        
+        Returns:
+            List[int]: Next position without conflict, or the current position
+        """
+        if not reservations.conflicts(mouse_id, current_position, next_position, tick):
+            return next_position
+        
+        candidates = [
+            pos for pos in get_adjacent_positions(current_position)
+            if is_valid_position(pos, labyrinth)
+            and not reservations.conflicts(mouse_id, current_position, pos, tick)
+        ]
+        distance = self._calculate_heuristic(current_position, goal_position)
+        closer = [pos for pos in candidates if self._calculate_heuristic(pos, goal_position) < distance]
+        if closer:
+            choice = min(closer, key=lambda pos: self._calculate_heuristic(pos, goal_position))
+        elif not reservations.conflicts(mouse_id, current_position, current_position, tick) or not candidates:
+            choice = current_position
+        else:
+            choice = min(candidates, key=lambda pos: self._calculate_heuristic(pos, goal_position))
+        logger.info(f"Mouse {mouse_id} avoids reserved cell {next_position}, moving to {choice}")
+        return choice
+    
+    def _reserve_plan(
+        self,
+        reservations: ReservationTable,
+        mouse_id: str,
+        current_position: List[int],
+        next_position: List[int],
+        tick: int
+    ):
+        """Reserve the current cell, the next one and the rest of the A* path when it is followed."""
+        path = [current_position, next_position]
+        if len(self.last_path) > 1 and self.last_path[1] == next_position:
+            path += self.last_path[2:reservations.horizon + 1]
+        reservations.reserve_path(mouse_id, path, tick)
+    
+    def _default_strategy(self, labyrinth: List[List[int]]) -> str:
+        """Path trees when they apply to the labyrinth, A* otherwise."""
+        return PATH_TREE if self.path_trees is not None and isinstance(labyrinth, Grid) else ASTAR
+    
+    def _find_path(self, labyrinth: List[List[int]], start: List[int], goal: List[int], strategy: str) -> List[List[int]]:
+        """Shortest path from the tree of the goal with PATH_TREE (on a Grid), from A* otherwise."""
+        if not self._reachable(labyrinth, start, goal):
+            return []
+        if strategy == PATH_TREE and self.path_trees is not None and isinstance(labyrinth, Grid):
+            return self.path_trees.path(labyrinth, start, goal)
+        return self._find_path_astar(labyrinth, start, goal)
+    
+    def _reachable(self, labyrinth: List[List[int]], start: List[int], goal: List[int]) -> bool:
+        """False when the component labels show no path joins start and goal (True without labels)."""
+        if self.components is None or not isinstance(labyrinth, Grid):
+            return True
+        return self.components.connected(labyrinth, start, goal)
+    
     def _find_path_astar(
         self, 
         labyrinth: List[List[int]], 
@@ -157,8 +341,40 @@ class MouseAIService:
     ) -> List[List[int]]:
         """
         A* pathfinding algorithm implementation.
+        
+        Results are cached per layout when a path cache is set and the
+        labyrinth is a Grid (whose digest identifies the layout). With a
+        single-flight layer, concurrent misses for the same (layout, start,
+        goal) wait for one search instead of each running it.
         """
-        from collections import deque
+        cache = self.path_cache
+        if cache is not None and isinstance(labyrinth, Grid):
+            path = cache.get(labyrinth.digest, start, goal)
+            if path is None:
+                if self.path_flight is None:
+                    path = self._search_and_cache(cache, labyrinth, start, goal)
+                else:
+                    key = (labyrinth.digest, start[0], start[1], goal[0], goal[1])
+                    shared = self.path_flight.do(key, lambda: self._search_and_cache(cache, labyrinth, start, goal))
+                    path = [list(cell) for cell in shared]  # Same result object for all the callers
+            return path
+        return self._search_path_astar(labyrinth, start, goal)
+    
+    def _search_and_cache(self, cache: PathCache, labyrinth: Grid, start: List[int], goal: List[int]) -> List[List[int]]:
+        # A search that ended between our cache miss and the single-flight call already stored it
+        path = cache.get(labyrinth.digest, start, goal) if self.path_flight is not None else None
+        if path is None:
+            path = self._search_path_astar(labyrinth, start, goal)
+            cache.put(labyrinth.digest, start, goal, path)
+        return path
+    
+    def _search_path_astar(
+        self, 
+        labyrinth: List[List[int]], 
+        start: List[int], 
+        goal: List[int]
+    ) -> List[List[int]]:
+        """Run the A* search."""
         import heapq
         
         # Priority queue: (f_score, position)
@@ -169,6 +385,7 @@ class MouseAIService:
         
         while open_set:
             current = heapq.heappop(open_set)[1]
+            self.nodes_expanded += 1
             
             if list(current) == goal:
                 # Reconstruct path
@@ -197,6 +414,109 @@ class MouseAIService:
         
         return []  # No path found
     
+    def _search_path_anytime(
+        self,
+        labyrinth: List[List[int]],
+        start: List[int],
+        goal: List[int],
+        max_nodes: int,
+        deadline: Optional[float] = None
+    ) -> Tuple[List[List[int]], Optional[float]]:
+        """
+        Anytime weighted A*: searches with decreasing heuristic weights until
+        the node limit or the deadline, keeping the shortest path found.
+        
+        A search with weight w finds a path at most w times longer than the
+        shortest one, so every search reaching the goal bounds the best path
+        by its weight, even when its own path is no shorter; the path length
+        over the Manhattan distance bounds it too.
+        
+        Returns:
+            Tuple[List[List[int]], Optional[float]]: The path and the bound of
+            its length over the shortest one, or, when no search reached the
+            goal, the path to the closest expanded cell and None ([] and None
+            when the goal is known to be unreachable)
+        """
+        if not self._reachable(labyrinth, start, goal):
+            return [], None
+        
+        best, bound, partial = None, None, [start]
+        remaining = max_nodes
+        distance = self._calculate_heuristic(start, goal)
+        for weight in ANYTIME_WEIGHTS:
+            before = self.nodes_expanded
+            path = self._search_path_bounded(labyrinth, start, goal, remaining, weight, deadline)
+            remaining -= self.nodes_expanded - before
+            if path[-1] != goal:
+                if best is None:
+                    partial = path
+                break
+            if best is None or len(path) < len(best):
+                best = path
+                bound = (len(path) - 1) / distance if distance else 1.0
+            bound = min(bound, weight)
+            if bound <= 1.0 or remaining <= 0 or (deadline is not None and time.perf_counter() >= deadline):
+                break
+        if best is None:
+            return partial, None
+        return best, bound
+    
+    def _search_path_bounded(
+        self,
+        labyrinth: List[List[int]],
+        start: List[int],
+        goal: List[int],
+        max_nodes: int,
+        weight: float = 1.0,
+        deadline: Optional[float] = None
+    ) -> List[List[int]]:
+        """
+        Weighted A* search (f = g + weight * h) stopped after ``max_nodes``
+        expanded nodes or at the deadline (a time.perf_counter() value).
+        
+        Returns:
+            List[List[int]]: Path to the goal if it was reached, otherwise to
+            the expanded cell closest to the goal (only the start when none is closer)
+        """
+        import heapq
+        
+        start_cell = (start[0], start[1])
+        goal_cell = (goal[0], goal[1])
+        best, best_h = start_cell, self._calculate_heuristic(start, goal)
+        open_set = [(weight * best_h, 0, start_cell)]
+        came_from = {}
+        g_score = {start_cell: 0}
+        expanded = 0
+        
+        while open_set and expanded < max_nodes:
+            _, g, current = heapq.heappop(open_set)
+            if g > g_score[current]:
+                continue  # Stale entry, the cell was reached by a shorter path
+            expanded += 1
+            h = self._calculate_heuristic(current, goal)
+            if h < best_h:
+                best, best_h = current, h
+            if current == goal_cell:
+                break
+            # The clock is only read every 256 nodes
+            if deadline is not None and not expanded & 255 and time.perf_counter() >= deadline:
+                break
+            for neighbor in get_adjacent_positions(list(current)):
+                if not is_valid_position(neighbor, labyrinth):
+                    continue
+                cell = (neighbor[0], neighbor[1])
+                if g + 1 < g_score.get(cell, float('inf')):
+                    came_from[cell] = current
+                    g_score[cell] = g + 1
+                    heapq.heappush(open_set, (g + 1 + weight * self._calculate_heuristic(neighbor, goal), g + 1, cell))
+        
+        self.nodes_expanded += expanded
+        path = [list(best)]
+        while best in came_from:
+            best = came_from[best]
+            path.append(list(best))
+        return path[::-1]
+    
     def _greedy_move(
         self, 
         labyrinth: List[List[int]], 
@@ -261,7 +581,7 @@ class MouseAIService:
         logger.warning(f"No valid moves from position {current_position}")
         return current_position
     
-    def _calculate_heuristic(self, pos1: List[int], pos2: List[int]) -> int:
+    def _calculate_heuristic(self, pos1: Sequence[int], pos2: Sequence[int]) -> int:
         """Calculate Manhattan distance heuristic."""
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
     
@@ -271,32 +591,53 @@ class MouseAIService:
         valid_adjacent = [pos for pos in adjacent_positions if is_valid_position(pos, labyrinth)]
         return len(valid_adjacent) <= 1
     
-    def _find_nearest_valid_position(self, position: List[int], labyrinth: List[List[int]]) -> List[int]:
-        """Find the nearest valid position to the given position."""
+    def _find_nearest_valid_position(
+        self,
+        position: List[int],
+        labyrinth: List[List[int]],
+        goal: Optional[List[int]] = None
+    ) -> Optional[List[int]]:
+        """
+        Find the nearest valid position to the given position.
+        
+        With component labels and a goal, only cells from which the goal can
+        be reached are accepted.
+        
+        Returns:
+            Optional[List[int]]: The position, None when no accepted cell is
+            within the search radius
+        """
+        goal_component = self._component(labyrinth, goal) if goal is not None else NO_COMPONENT
+        for candidate in self._positions_around(position):
+            if is_valid_position(candidate, labyrinth) and goal_component in (NO_COMPONENT, self._component(labyrinth, candidate)):
+                return candidate
+        
+        if goal_component != NO_COMPONENT:
+            logger.info(f"No valid position near {position} can reach the goal {goal}")
+        return None
+    
+    def _component(self, labyrinth: List[List[int]], position: List[int]) -> int:
+        """Component label of a position, NO_COMPONENT without labels (or outside a Grid labyrinth)."""
+        if self.components is None or not isinstance(labyrinth, Grid):
+            return NO_COMPONENT
+        return self.components.component(labyrinth, position)
+    
+    def _positions_around(self, position: List[int]):
+        """Adjacent positions, then the perimeters of the squares of radius 2 to 4."""
         # First, try adjacent positions
-        for adjacent_pos in get_adjacent_positions(position):
-            if is_valid_position(adjacent_pos, labyrinth):
-                return adjacent_pos
+        yield from get_adjacent_positions(position)
         
         # If no adjacent valid position, search in a larger radius
         for radius in range(2, 5):  # Search up to radius 4
             for dx in range(-radius, radius + 1):
                 for dy in range(-radius, radius + 1):
                     if abs(dx) == radius or abs(dy) == radius:  # Only check perimeter
-                        new_pos = [position[0] + dx, position[1] + dy]
-                        if is_valid_position(new_pos, labyrinth):
-                            return new_pos
-        
-        return None  # No valid position found
+                        yield [position[0] + dx, position[1] + dy]
     
     def _update_position_history(self, current_pos: List[int], next_pos: List[int]):
         """Update position history for this mouse."""
-        # Add current position to history
+        # The ring keeps a fixed number of positions
         self.position_history.append(current_pos)
-        
-        # Keep only last 3 positions to avoid memory issues
-        if len(self.position_history) > 3:
-            self.position_history = self.position_history[-3:]
     
     def _is_back_and_forth_move(self, current_pos: List[int], next_pos: List[int]) -> bool:
         """Check if the next move would be a back-and-forth movement."""
@@ -338,12 +679,8 @@ class MouseAIService:
     
     def _is_stuck(self, mouse_id: str, current_pos: List[int]) -> bool:
         """Check if the mouse is stuck (same position for multiple turns)."""
-        if mouse_id not in self.position_history or len(self.position_history[mouse_id]) < 3:
-            return False
-        
         # Check if the mouse has been in the same position for the last 3 turns
-        recent_positions = self.position_history[mouse_id][-3:]
-        return all(pos == current_pos for pos in recent_positions)
+        return self.position_history.repeats(current_pos) >= 3
     
     def _force_direction_change(self, labyrinth: List[List[int]], current_pos: List[int], goal_pos: List[int], mouse_id: str) -> List[int]:
         """Force a direction change when the mouse is stuck."""
@@ -406,7 +743,13 @@ class MouseAIService:
         # If no moves towards goal are possible, we need to explore
         return moves_towards_goal == 0
     
-    def _find_nearest_cheese(self, current_position: List[int], available_cheeses: List[List[int]], labyrinth: List[List[int]]) -> List[int]:
+    def _find_nearest_cheese(
+        self,
+        current_position: List[int],
+        available_cheeses: List[List[int]],
+        labyrinth: List[List[int]],
+        strategy: str = ASTAR
+    ) -> List[int]:
         """
         Find the nearest cheese using pathfinding distance, not just Manhattan distance.
         
@@ -414,6 +757,7 @@ class MouseAIService:
             current_position: Current mouse position [x, y]
             available_cheeses: List of available cheese positions [[x, y], ...]
             labyrinth: 2D maze representation
+            strategy: PATH_TREE to measure the paths on the cheese trees, ASTAR to search them
             
         Returns:
             List[int]: Position of the nearest cheese [x, y]
@@ -421,12 +765,18 @@ class MouseAIService:
         if not available_cheeses:
             return None
         
+        # With component labels, unreachable cheeses are dropped before any search
+        if self.components is not None and isinstance(labyrinth, Grid):
+            available_cheeses = self.components.reachable(labyrinth, current_position, available_cheeses)
+            if not available_cheeses:
+                return None
+        
         best_cheese = None
         shortest_path_length = float('inf')
         
         for cheese_pos in available_cheeses:
             # Calculate actual path length using A* algorithm
-            path = self._find_path_astar(labyrinth, current_position, cheese_pos)
+            path = self._find_path(labyrinth, current_position, cheese_pos, strategy)
             
             if path:
                 path_length = len(path) - 1  # -1 because path includes start position
@@ -0,0 +1,160 @@
+"""
+Shortest path cache shared by the mouse AI services.
+
+Paths are cached per maze layout (the Grid digest) and goal. Any suffix of
+a cached shortest path is itself a shortest path, so a mouse following a
+cached path keeps hitting the cache as it moves. When a layout changes by a
+few cells, only the paths those cells can affect are dropped and the others
+are carried over to the new layout.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+Cell = Tuple[int, int]
+# (x, y, is_wall_now) for every cell whose passability changed
+CellChange = Tuple[int, int, bool]
+
+
+def _manhattan(a: Cell, b: Cell) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class _GoalPaths:
+    """Cached paths towards one goal on one layout."""
+
+    __slots__ = ("paths", "index", "unreachable")
+
+    def __init__(self):
+        self.paths: List[Tuple[Cell, ...]] = []
+        # cell -> (path index, offset of the cell in that path)
+        self.index: Dict[Cell, Tuple[int, int]] = {}
+        # Starts from which the goal could not be reached
+        self.unreachable: Set[Cell] = set()
+
+    def add(self, path: Tuple[Cell, ...]):
+        number = len(self.paths)
+        self.paths.append(path)
+        for offset, cell in enumerate(path):
+            known = self.index.get(cell)
+            # Keep the longest remaining suffix when a cell is on several paths
+            if known is None or len(self.paths[known[0]]) - known[1] < len(path) - offset:
+                self.index[cell] = (number, offset)
+
+    def keep(self, paths: Iterable[Tuple[Cell, ...]], unreachable: Set[Cell]) -> "_GoalPaths":
+        kept = _GoalPaths()
+        for path in paths:
+            kept.add(path)
+        kept.unreachable = unreachable
+        return kept
+
+
+class PathCache:
+    """LRU cache of shortest paths with cell-level invalidation."""
+
+    def __init__(self, max_goals: int = 512):
+        """
+        Initialize the cache.
+
+        Args:
+            max_goals: Number of (layout, goal) entries kept
+        """
+        self.max_goals = max_goals
+        self._entries: "OrderedDict[Tuple[str, Cell], _GoalPaths]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    def get(self, layout: str, start: List[int], goal: List[int]) -> Optional[List[List[int]]]:
+        """
+        Look up a path.
+
+        Args:
+            layout: Layout identifier (Grid digest)
+            start: Start position [x, y]
+            goal: Goal position [x, y]
+
+        Returns:
+            Optional[List[List[int]]]: Path from start to goal, [] if the goal is
+            known to be unreachable, None on a cache miss
+        """
+        key = (layout, (goal[0], goal[1]))
+        start_cell = (start[0], start[1])
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if start_cell in entry.unreachable:
+                    self.hits += 1
+                    return []
+                found = entry.index.get(start_cell)
+                if found is not None:
+                    self.hits += 1
+                    number, offset = found
+                    return [list(cell) for cell in entry.paths[number][offset:]]
+            self.misses += 1
+            return None
+
+    def put(self, layout: str, start: List[int], goal: List[int], path: List[List[int]]):
+        """Store the result of a path search ([] when the goal is unreachable)."""
+        key = (layout, (goal[0], goal[1]))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _GoalPaths()
+            self._entries.move_to_end(key)
+            if path:
+                entry.add(tuple((x, y) for x, y in path))
+            else:
+                entry.unreachable.add((start[0], start[1]))
+            while len(self._entries) > self.max_goals:
+                self._entries.popitem(last=False)
+
+    def rebase(self, old_layout: str, new_layout: str, changes: List[CellChange]) -> int:
+        """
+        Carry the paths of a layout over to a modified layout.
+
+        A path is dropped if a cell on it became a wall, or if a cell that
+        became free could give a shorter path (|start-c| + |c-goal| shorter
+        than the path). Unreachable results are dropped as soon as any cell
+        became free.
+
+        Args:
+            old_layout: Identifier of the previous layout
+            new_layout: Identifier of the modified layout
+            changes: Changed cells as (x, y, is_wall_now)
+
+        Returns:
+            int: Number of paths dropped
+        """
+        closed = {(x, y) for x, y, wall in changes if wall}
+        opened = [(x, y) for x, y, wall in changes if not wall]
+        dropped = 0
+
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == old_layout]:
+                entry = self._entries.pop(key)
+                goal = key[1]
+                if goal in closed:
+                    dropped += len(entry.paths)
+                    continue
+
+                kept = []
+                for path in entry.paths:
+                    length = len(path) - 1
+                    if (closed and not closed.isdisjoint(path)) or any(
+                        _manhattan(path[0], cell) + _manhattan(cell, goal) < length for cell in opened
+                    ):
+                        dropped += 1
+                    else:
+                        kept.append(path)
+                unreachable = set() if opened else entry.unreachable - closed
+                if kept or unreachable:
+                    self._entries[(new_layout, goal)] = entry.keep(kept, unreachable)
+            self.invalidated += dropped
+        return dropped
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and counters."""
+        return {"goals": len(self._entries), "hits": self.hits, "misses": self.misses, "invalidated": self.invalidated}
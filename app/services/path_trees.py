@@ -0,0 +1,220 @@
+"""
+Shortest-path trees rooted at the cheeses, shared by every mouse.
+
+One BFS from a cheese gives, for every cell of the maze, the next cell on
+a shortest path to that cheese. Any mouse then gets its next step in O(1)
+and its whole path by following the parent pointers, instead of running
+its own A* search. Trees are int32 arrays over the padded grid indexes
+(see PaddedGrid), built on first use and kept in an LRU bounded in number.
+With a single-flight layer, mice asking at once for the tree of the same
+cheese wait for one BFS instead of each running it.
+"""
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.grid import Grid
+from app.services.distance_fields import UNREACHABLE, DistanceFieldStore, PaddedGrid, bfs_parents
+from app.services.path_cache import CellChange
+from app.services.single_flight import SingleFlight
+
+Cell = Tuple[int, int]
+
+
+class PathTreeStore:
+    """LRU cache of per-cheese shortest-path trees keyed by (layout digest, cheese)."""
+
+    def __init__(
+        self,
+        max_trees: int = 256,
+        max_layouts: int = 16,
+        flight: Optional[SingleFlight] = None,
+        max_owners: int = 1024
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            max_trees: Number of trees kept (4 bytes per padded cell each)
+            max_layouts: Number of flattened grids kept
+            flight: Single-flight layer coalescing concurrent builds of the same tree
+            max_owners: Simulations whose live cheeses are remembered (see retain)
+        """
+        self.max_trees = max_trees
+        self.max_layouts = max_layouts
+        self.flight = flight
+        self.max_owners = max_owners
+        # Per owner (simulation): its layout and the cheeses of its last request
+        self._live: "OrderedDict[str, Tuple[str, Set[Cell]]]" = OrderedDict()
+        self._trees: "OrderedDict[Tuple[str, Cell], array]" = OrderedDict()
+        # Cheeses with a tree, per layout (for retain)
+        self._cheeses: Dict[str, Set[Cell]] = {}
+        self._layouts: "OrderedDict[str, PaddedGrid]" = OrderedDict()
+        # (width, height) of the layouts with trees, carried over by rebase
+        self._geometry: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.built = 0
+        self.hits = 0
+        self.dropped = 0
+
+    def build(self, grid: Grid, cheese: List[int]):
+        """Build the tree of a cheese ahead of the first move (no-op when cached)."""
+        self._tree(grid, cheese)
+
+    def next_step(self, grid: Grid, position: List[int], cheese: List[int]) -> Optional[List[int]]:
+        """
+        Next cell on a shortest path from a position to a cheese.
+
+        Returns:
+            Optional[List[int]]: The position itself at the cheese, None when
+            the cheese cannot be reached
+        """
+        padded, tree = self._tree(grid, cheese)
+        i = padded.index(position)
+        if i < 0 or tree[i] == UNREACHABLE:
+            return None
+        return padded.position(tree[i])
+
+    def path(self, grid: Grid, start: List[int], cheese: List[int]) -> List[List[int]]:
+        """Shortest path from start to the cheese, both included ([] if unreachable), like A*."""
+        padded, tree = self._tree(grid, cheese)
+        i = padded.index(start)
+        if i < 0 or tree[i] == UNREACHABLE:
+            return []
+        path = [[start[0], start[1]]]
+        while tree[i] != i:
+            i = tree[i]
+            path.append(padded.position(i))
+        return path
+
+    def missing(self, layout: str, cheeses: Iterable[List[int]]) -> int:
+        """Number of cheeses of a layout without a tree yet (each costs one BFS)."""
+        with self._lock:
+            return sum(1 for c in cheeses if (layout, (c[0], c[1])) not in self._trees)
+
+    def retain(self, owner: str, layout: str, cheeses: Iterable[List[int]]) -> int:
+        """
+        Record the cheeses still present for one owner (a simulation) and drop
+        the trees of the layout that no owner on it needs any more.
+
+        Simulations sharing a layout keep each other's trees: a tree goes only
+        when its cheese is missing from the last cheese list of every owner
+        on that layout. Owners are forgotten after ``max_owners`` others.
+
+        Returns:
+            int: Number of trees dropped
+        """
+        present = {(c[0], c[1]) for c in cheeses}
+        with self._lock:
+            self._live[owner] = (layout, present)
+            self._live.move_to_end(owner)
+            while len(self._live) > self.max_owners:
+                self._live.popitem(last=False)
+            known = self._cheeses.get(layout)
+            if not known:
+                return 0
+            needed = set()
+            for owner_layout, owner_cheeses in self._live.values():
+                if owner_layout == layout:
+                    needed |= owner_cheeses
+            gone = known - needed
+            for cheese in gone:
+                self._trees.pop((layout, cheese), None)
+            known -= gone
+            if not known:
+                del self._cheeses[layout]
+                self._geometry.pop(layout, None)
+            self.dropped += len(gone)
+        return len(gone)
+
+    def rebase(self, old_layout: str, new_layout: str, changes: List[CellChange]) -> int:
+        """
+        Carry trees over to a modified layout, with the rule of DistanceFieldStore.rebase.
+
+        Returns:
+            int: Number of trees dropped
+        """
+        dropped = 0
+        with self._lock:
+            geometry = self._geometry.pop(old_layout, None)
+            for cheese in self._cheeses.pop(old_layout, set()):
+                tree = self._trees.pop((old_layout, cheese), None)
+                if tree is None:
+                    continue
+                if geometry is None or DistanceFieldStore._affected(geometry, tree, changes):
+                    dropped += 1
+                else:
+                    self._trees[(new_layout, cheese)] = tree
+                    self._cheeses.setdefault(new_layout, set()).add(cheese)
+            if geometry is not None and new_layout in self._cheeses:
+                self._geometry[new_layout] = geometry
+            self.dropped += dropped
+        return dropped
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of trees, their memory and counters."""
+        with self._lock:
+            size = sum(tree.itemsize * len(tree) for tree in self._trees.values())
+            return {"trees": len(self._trees), "bytes": size, "built": self.built, "hits": self.hits, "dropped": self.dropped}
+
+    def _tree(self, grid: Grid, cheese: List[int]) -> Tuple[PaddedGrid, array]:
+        key = (grid.digest, (cheese[0], cheese[1]))
+        entry = self._cached(key)
+        if entry is not None:
+            return entry
+        if self.flight is None:
+            return self._build(grid, key)
+        return self.flight.do(("tree",) + key, lambda: self._build(grid, key))
+
+    def _cached(self, key: Tuple[str, Cell]) -> Optional[Tuple[PaddedGrid, array]]:
+        with self._lock:
+            tree = self._trees.get(key)
+            padded = self._layouts.get(key[0])
+            if tree is None or padded is None:
+                return None
+            self._trees.move_to_end(key)
+            self._layouts.move_to_end(key[0])
+            self.hits += 1
+            return padded, tree
+
+    def _build(self, grid: Grid, key: Tuple[str, Cell]) -> Tuple[PaddedGrid, array]:
+        digest, cheese = key
+        with self._lock:
+            # Built by a caller that finished between our miss and the single-flight call,
+            # or only the flattened grid evicted
+            tree = self._trees.get(key)
+            padded = self._layouts.get(digest)
+        if tree is not None and padded is not None:
+            return padded, tree
+
+        if padded is None:
+            padded = PaddedGrid(grid)
+        if tree is None:
+            tree = bfs_parents(padded, padded.index(cheese))
+        with self._lock:
+            if key not in self._trees:
+                self.built += 1
+            self._trees[key] = tree
+            self._trees.move_to_end(key)
+            self._cheeses.setdefault(digest, set()).add(cheese)
+            self._geometry[digest] = (padded.width, padded.height)
+            self._layouts[digest] = padded
+            self._layouts.move_to_end(digest)
+            while len(self._trees) > self.max_trees:
+                (layout, evicted), _ = self._trees.popitem(last=False)
+                self._forget(layout, evicted)
+            while len(self._layouts) > self.max_layouts:
+                layout, _ = self._layouts.popitem(last=False)
+                self._geometry.pop(layout, None)
+                for evicted in self._cheeses.pop(layout, ()):
+                    self._trees.pop((layout, evicted), None)
+        return padded, tree
+
+    def _forget(self, layout: str, cheese: Cell):
+        known = self._cheeses.get(layout)
+        if known is not None:
+            known.discard(cheese)
+            if not known:
+                del self._cheeses[layout]
+                self._geometry.pop(layout, None)
@@ -0,0 +1,112 @@
+"""
+Selection of the planning strategy of a move from a latency budget.
+
+Strategies, from the most to the least accurate:
+
+    path_tree   shortest-path trees of the cheeses (app.services.path_trees),
+                one BFS over the maze per cheese without a tree yet
+    astar       exact A* search per cheese, up to the whole maze expanded
+    bounded     anytime weighted A* (decreasing weights) stopped after a
+                number of expanded nodes or at the deadline of the budget,
+                moving along the best path found, or towards the expanded
+                cell closest to the cheese when none reached it
+    greedy      one step reducing the Manhattan distance to the cheese
+
+The selector estimates the cost of the exact strategies from the maze size
+and the costs measured on previous moves, and picks the first one expected
+to fit the budget. Without a budget, the exact pipeline always runs.
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+PATH_TREE = "path_tree"
+ASTAR = "astar"
+BOUNDED = "bounded"
+GREEDY = "greedy"
+
+# Initial costs in ms: per maze cell for a BFS, per expanded node for A*
+# (measured on 31x31 to 201x201 mazes, replaced by the measured averages)
+DEFAULT_COSTS = {PATH_TREE: 0.0003, ASTAR: 0.01}
+
+
+class PlannerSelector:
+    """Picks the most accurate strategy expected to fit the latency budget of a move."""
+
+    def __init__(self, default_budget_ms: Optional[float] = None, smoothing: float = 0.2, min_nodes: int = 64):
+        """
+        Initialize the selector.
+
+        Args:
+            default_budget_ms: Budget of the requests that do not set one, None for no limit
+            smoothing: Weight of a new measure in the moving averages of the costs
+            min_nodes: Fewest nodes worth a bounded search; below, the move is greedy
+        """
+        self.default_budget_ms = default_budget_ms
+        self.smoothing = smoothing
+        self.min_nodes = min_nodes
+        self._costs: Dict[str, float] = dict(DEFAULT_COSTS)
+        self._lock = threading.Lock()
+        self.selected: Dict[str, int] = {PATH_TREE: 0, ASTAR: 0, BOUNDED: 0, GREEDY: 0}
+
+    def select(
+        self,
+        cells: int,
+        searches: int = 1,
+        missing_trees: Optional[int] = None,
+        budget_ms: Optional[float] = None
+    ) -> Tuple[str, Optional[int]]:
+        """
+        Choose the strategy of a move.
+
+        Args:
+            cells: Number of cells of the maze
+            searches: Paths searched by A* (one per candidate cheese)
+            missing_trees: Candidate cheeses without a path tree yet, None
+                when path trees are not available
+            budget_ms: Budget of the request, the default budget when None
+
+        Returns:
+            Tuple[str, Optional[int]]: Strategy, and the node limit of a bounded search
+        """
+        budget = budget_ms if budget_ms is not None else self.default_budget_ms
+        choice: Tuple[str, Optional[int]]
+        if budget is None:
+            choice = (PATH_TREE if missing_trees is not None else ASTAR), None
+        elif missing_trees is not None and self.estimate(PATH_TREE, cells * missing_trees) <= budget:
+            choice = PATH_TREE, None
+        elif self.estimate(ASTAR, cells * searches) <= budget:
+            choice = ASTAR, None
+        else:
+            nodes = int(budget / self._costs[ASTAR])
+            choice = (BOUNDED, nodes) if nodes >= self.min_nodes else (GREEDY, None)
+        with self._lock:
+            self.selected[choice[0]] += 1
+        return choice
+
+    def estimate(self, strategy: str, units: int) -> float:
+        """Expected time in ms of a strategy over a number of cells (BFS) or nodes (A*)."""
+        return self._costs.get(strategy, 0.0) * units
+
+    def record(self, strategy: str, units: int, elapsed_ms: float):
+        """
+        Update the cost of a strategy with a measured run.
+
+        Args:
+            strategy: PATH_TREE, or ASTAR for exact and bounded searches
+            units: Cells visited by the BFS or nodes expanded by A*
+            elapsed_ms: Measured time
+        """
+        if units <= 0 or strategy not in self._costs:
+            return
+        with self._lock:
+            cost = self._costs[strategy]
+            self._costs[strategy] = cost + self.smoothing * (elapsed_ms / units - cost)
+
+    def stats(self) -> Dict[str, object]:
+        """Return the budget, the current costs and the number of moves per strategy."""
+        with self._lock:
+            return {
+                "default_budget_ms": self.default_budget_ms,
+                "costs_ms": {strategy: round(cost, 6) for strategy, cost in self._costs.items()},
+                "selected": dict(self.selected)
+            }
@@ -0,0 +1,113 @@
+"""
+Fixed-size history of the positions of one mouse.
+
+Positions are packed into single integers in a preallocated ring, and the
+number of trailing entries repeating with each period is maintained on
+every append, so that stuck, back-and-forth and cycle checks are O(1).
+"""
+from array import array
+from typing import Iterator, List
+
+DEFAULT_CAPACITY = 16
+
+# Coordinates are offset so that packed values stay non-negative
+_OFFSET = 1 << 31
+_MASK = (1 << 32) - 1
+
+
+def pack_position(position: List[int]) -> int:
+    """Pack an [x, y] position into one integer."""
+    return ((position[1] + _OFFSET) << 32) | (position[0] + _OFFSET)
+
+
+def unpack_position(packed: int) -> List[int]:
+    """Inverse of pack_position."""
+    return [(packed & _MASK) - _OFFSET, (packed >> 32) - _OFFSET]
+
+
+class PositionHistory:
+    """Ring of the last ``capacity`` positions of a mouse, oldest first."""
+
+    __slots__ = ("capacity", "max_cycle", "_ring", "_next", "_count", "_matches")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Initialize the history.
+
+        Args:
+            capacity: Number of positions kept; cycles up to ``capacity // 2`` are detected
+        """
+        if capacity < 2:
+            raise ValueError("PositionHistory needs a capacity of at least 2")
+        self.capacity = capacity
+        self.max_cycle = capacity // 2
+        self._ring = array("Q", [0]) * capacity
+        self._next = 0
+        self._count = 0
+        # _matches[k]: number of trailing entries equal to the entry k steps before them
+        self._matches = [0] * (self.max_cycle + 1)
+
+    def append(self, position: List[int]):
+        """Record a position, overwriting the oldest one when full."""
+        packed = pack_position(position)
+        for k in range(1, self.max_cycle + 1):
+            if self._count >= k and self._packed(-k) == packed:
+                self._matches[k] = min(self._matches[k] + 1, self.capacity - k)
+            else:
+                self._matches[k] = 0
+        self._ring[self._next] = packed
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def clear(self):
+        """Forget every position."""
+        self._next = 0
+        self._count = 0
+        self._matches = [0] * (self.max_cycle + 1)
+
+    def repeats(self, position: List[int]) -> int:
+        """Number of most recent entries equal to ``position``."""
+        if not self._count or self._packed(-1) != pack_position(position):
+            return 0
+        return self._matches[1] + 1
+
+    def is_cycle(self, position: List[int], k: int) -> bool:
+        """
+        Check whether ``position`` completes two laps of a cycle of length ``k``.
+
+        The last ``2k - 1`` entries followed by ``position`` must repeat with
+        period ``k``. Staying in place is not counted as a cycle.
+        """
+        if not 2 <= k <= self.max_cycle or self._count < 2 * k - 1:
+            return False
+        packed = pack_position(position)
+        return (
+            self._packed(-k) == packed
+            and self._matches[k] >= k - 1
+            and self.repeats(position) < k
+        )
+
+    def cycle_length(self, position: List[int]) -> int:
+        """Shortest cycle that ``position`` completes (see is_cycle), or 0."""
+        for k in range(2, self.max_cycle + 1):
+            if self.is_cycle(position, k):
+                return k
+        return 0
+
+    def _packed(self, index: int) -> int:
+        """Packed entry at a negative index (-1 = most recent)."""
+        return self._ring[(self._next + index) % self.capacity]
+
+    def __getitem__(self, index: int) -> List[int]:
+        if index >= 0:
+            index -= self._count
+        if not -self._count <= index < 0:
+            raise IndexError("position history index out of range")
+        return unpack_position(self._packed(index))
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for index in range(-self._count, 0):
+            yield unpack_position(self._packed(index))
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,134 @@
+"""
+Space-time reservation table for collision avoidance between mice.
+
+Every mouse reserves the cells it plans to occupy over the next ticks;
+other mice check their next step against those reservations. Reservations
+are stored under hashed (x, y, tick) keys for O(1) lookups and grouped by
+tick so that past ticks expire in one step as the simulation advances.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+Key = Tuple[int, int, int]
+
+DEFAULT_HORIZON = 4
+
+
+class ReservationTable:
+    """Reservations of one simulation."""
+
+    def __init__(self, horizon: int = DEFAULT_HORIZON):
+        """
+        Initialize the table.
+
+        Args:
+            horizon: Number of future ticks a mouse reserves along its path
+        """
+        self.horizon = horizon
+        self.current_tick = 0
+        self._owners: Dict[Key, str] = {}
+        self._by_tick: Dict[int, Set[Key]] = {}
+        self._by_mouse: Dict[str, List[Key]] = {}
+        self._lock = threading.Lock()
+
+    def advance(self, tick: int):
+        """Drop the reservations of ticks before ``tick - 1`` (kept for swap checks)."""
+        with self._lock:
+            if tick <= self.current_tick:
+                return
+            self.current_tick = tick
+            for expired in [t for t in self._by_tick if t < tick - 1]:
+                for key in self._by_tick.pop(expired):
+                    self._owners.pop(key, None)
+
+    def reserve_path(self, mouse_id: str, path: List[List[int]], start_tick: int):
+        """
+        Replace the reservations of a mouse with a planned path.
+
+        ``path[k]`` is reserved at ``start_tick + k`` for ``horizon + 1``
+        ticks; the last cell stays reserved until the end of the horizon.
+
+        Args:
+            mouse_id: Mouse making the reservation
+            path: Planned cells, starting with the cell occupied at start_tick
+            start_tick: Tick of path[0]
+        """
+        self._reserve(mouse_id, path, start_tick, self.horizon + 1)
+
+    def reserve_position(self, mouse_id: str, position: List[int], tick: int, hold: int = 1):
+        """Reserve a cell from ``tick`` for ``hold`` more ticks, for a mouse whose plan is unknown."""
+        self._reserve(mouse_id, [position], tick, hold + 1)
+
+    def _reserve(self, mouse_id: str, path: List[List[int]], start_tick: int, ticks: int):
+        if not path:
+            return
+        with self._lock:
+            self._release(mouse_id)
+            keys = []
+            for k in range(ticks):
+                x, y = path[min(k, len(path) - 1)]
+                key = (x, y, start_tick + k)
+                # First come, first served: earlier plans keep their cells
+                if self._owners.setdefault(key, mouse_id) == mouse_id:
+                    self._by_tick.setdefault(key[2], set()).add(key)
+                    keys.append(key)
+            self._by_mouse[mouse_id] = keys
+
+    def has_plan(self, mouse_id: str, tick: int) -> bool:
+        """True if the mouse has reserved a cell at ``tick``."""
+        with self._lock:
+            return any(key[2] == tick for key in self._by_mouse.get(mouse_id, ()))
+
+    def owner(self, position: List[int], tick: int) -> Optional[str]:
+        """Return the mouse that reserved a cell at a tick."""
+        return self._owners.get((position[0], position[1], tick))
+
+    def conflicts(self, mouse_id: str, current: List[int], next_position: List[int], tick: int) -> bool:
+        """
+        Check a move from ``current`` (at ``tick``) to ``next_position`` (at ``tick + 1``).
+
+        A move conflicts if another mouse reserved the destination for the
+        next tick, or if it would swap cells with another mouse.
+        """
+        owner = self._owners.get((next_position[0], next_position[1], tick + 1))
+        if owner is not None and owner != mouse_id:
+            return True
+        if next_position == current:
+            return False
+        other = self._owners.get((next_position[0], next_position[1], tick))
+        return other is not None and other != mouse_id and self._owners.get((current[0], current[1], tick + 1)) == other
+
+    def _release(self, mouse_id: str):
+        for key in self._by_mouse.pop(mouse_id, ()):
+            if self._owners.get(key) == mouse_id:
+                del self._owners[key]
+                keys = self._by_tick.get(key[2])
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._by_tick[key[2]]
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+
+class ReservationRegistry:
+    """Reservation tables by simulation id (least recently used first out)."""
+
+    def __init__(self, max_simulations: int = 256, horizon: int = DEFAULT_HORIZON):
+        self.max_simulations = max_simulations
+        self.horizon = horizon
+        self._tables: "OrderedDict[str, ReservationTable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def table(self, simulation_id: str) -> ReservationTable:
+        """Return the table of a simulation, creating it if needed."""
+        with self._lock:
+            table = self._tables.get(simulation_id)
+            if table is None:
+                table = self._tables[simulation_id] = ReservationTable(self.horizon)
+                while len(self._tables) > self.max_simulations:
+                    self._tables.popitem(last=False)
+            self._tables.move_to_end(simulation_id)
+            return table
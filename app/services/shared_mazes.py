@@ -0,0 +1,312 @@
+"""
+Mazes and their distance fields published once in shared memory.
+
+With several uvicorn workers (or a process pool), every process would
+otherwise hold its own copy of each maze and of the structures derived
+from it. The registry publishes them in one ``multiprocessing.shared_memory``
+segment per layout, named after the grid digest; other processes attach
+to it by digest and read it through zero-copy views.
+
+Segment layout (little-endian, sections aligned on 8 bytes):
+
+    header      magic, format, width, height, field capacity, field count,
+                reference count, digest
+    slots       (x, y) int32 pair of every published field, in slot order
+    grid        height * width cells, 0 = free, 1 = wall (the Grid rows)
+    free        padded passability bitmap, (height + 2) * (width + 2) bytes
+    fields      ``capacity`` int32 distance fields over the padded indexes
+
+Fields are added in place while the segment lives: a writer fills the
+next slot, then increments the field count. The header is only updated
+under an inter-process file lock. Every process attached to a segment
+holds one reference; the process that drops the last one unlinks it. A
+process killed without closing its registry leaks its reference (the
+segment then stays until reboot or a manual cleanup of /dev/shm).
+"""
+import logging
+import os
+import struct
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.grid import Grid
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows frees segments with their last handle
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MAZE"
+FORMAT = 1
+HEADER = struct.Struct("<4sIIIIIq32s")
+SLOT = struct.Struct("<ii")
+# The reference count is the only field rewritten on attach and release
+_REFCOUNT_OFFSET = struct.calcsize("<4sIIIII")
+_COUNT_OFFSET = struct.calcsize("<4sIIII")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class _Layout:
+    """Offsets of the sections of a segment."""
+
+    def __init__(self, width: int, height: int, capacity: int):
+        self.width = width
+        self.height = height
+        self.capacity = capacity
+        self.slots = HEADER.size
+        self.grid = _align(self.slots + capacity * SLOT.size)
+        self.free = _align(self.grid + width * height)
+        self.padded_size = (width + 2) * (height + 2)
+        self.fields = _align(self.free + self.padded_size)
+        self.field_size = _align(self.padded_size * 4)
+        self.size = self.fields + capacity * self.field_size
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    """Open a segment whose lifetime is managed by reference counts, not by the resource tracker."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, create=create, size=size, track=False)
+    segment = shared_memory.SharedMemory(name, create=create, size=size)
+    # Before 3.13 the tracker unlinks every segment a process opened when it exits
+    resource_tracker.unregister(segment._name, "shared_memory")  # type: ignore[attr-defined]
+    return segment
+
+
+def _unlink_segment(segment: shared_memory.SharedMemory):
+    if sys.version_info < (3, 13):
+        resource_tracker.register(segment._name, "shared_memory")  # type: ignore[attr-defined]  # unlink() unregisters it
+    segment.unlink()
+
+
+class SharedMaze:
+    """One maze attached from shared memory."""
+
+    def __init__(self, segment: shared_memory.SharedMemory, digest: str, layout: _Layout):
+        self.segment = segment
+        self.digest = digest
+        self.layout = layout
+        buffer = segment.buf
+        self.cells = np.ndarray((layout.height, layout.width), dtype=np.uint8, buffer=buffer, offset=layout.grid)
+        self.free = np.ndarray((layout.height + 2, layout.width + 2), dtype=np.uint8, buffer=buffer, offset=layout.free)
+        self._fields: Dict[Tuple[int, int], np.ndarray] = {}
+        self._seen = 0
+
+    @property
+    def grid(self) -> Grid:
+        """The maze as a Grid whose rows are views on the shared segment."""
+        return Grid.from_buffer(self.segment.buf[self.layout.grid:self.layout.grid + self.cells.size], self.layout.width, self.digest)
+
+    @property
+    def field_count(self) -> int:
+        return struct.unpack_from("<I", self.segment.buf, _COUNT_OFFSET)[0]
+
+    def field(self, cheese: List[int]) -> Optional[np.ndarray]:
+        """Read-only distance field of a cheese, or None if not published yet."""
+        key = (cheese[0], cheese[1])
+        field = self._fields.get(key)
+        if field is None and self._seen < self.field_count:
+            self._scan()
+            field = self._fields.get(key)
+        return field
+
+    def _scan(self):
+        """Map the fields published since the last scan."""
+        count = self.field_count
+        for slot in range(self._seen, count):
+            x, y = SLOT.unpack_from(self.segment.buf, self.layout.slots + slot * SLOT.size)
+            self._fields[(x, y)] = self._view(slot)
+        self._seen = count
+
+    def _view(self, slot: int) -> np.ndarray:
+        view = np.ndarray(
+            (self.layout.padded_size,), dtype=np.int32, buffer=self.segment.buf,
+            offset=self.layout.fields + slot * self.layout.field_size
+        )
+        view.flags.writeable = False
+        return view
+
+
+class SharedMazeRegistry:
+    """Publishes mazes in shared memory and attaches to those of other processes."""
+
+    def __init__(self, prefix: str = "mz-", field_capacity: int = 64, max_mazes: int = 64, lock_path: Optional[str] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            prefix: Segment name prefix (the digest follows), shared by all the workers
+            field_capacity: Distance fields reserved per maze (pages are only used once written)
+            max_mazes: Mazes this process attaches to at most; others stay private
+            lock_path: Inter-process lock file, derived from the prefix by default
+        """
+        self.prefix = prefix
+        self.field_capacity = field_capacity
+        self.max_mazes = max_mazes
+        self.lock_path = lock_path or os.path.join(tempfile.gettempdir(), f"{prefix}shared-mazes.lock")
+        self._mazes: Dict[str, SharedMaze] = {}
+        self._thread_lock = threading.Lock()
+        self.published = 0
+        self.attached = 0
+
+    def segment_name(self, digest: str) -> str:
+        """Name of the segment of a layout (within the 31 characters allowed on macOS)."""
+        return f"{self.prefix}{digest[:24]}"
+
+    def publish(self, grid: Grid) -> Optional[SharedMaze]:
+        """
+        Return the shared maze of a grid, creating the segment if no process did.
+
+        Returns:
+            Optional[SharedMaze]: None when this process already holds ``max_mazes``
+        """
+        digest = grid.digest
+        maze = self._mazes.get(digest)
+        if maze is not None:
+            return maze
+        with self._locked():
+            maze = self._mazes.get(digest)
+            if maze is not None:
+                return maze
+            if len(self._mazes) >= self.max_mazes:
+                return None
+            maze = self._attach(digest)
+            if maze is None:
+                maze = self._create(grid)
+                self.published += 1
+            self._mazes[digest] = maze
+            return maze
+
+    def attach(self, digest: str) -> Optional[SharedMaze]:
+        """Attach to a maze published by any process, None if there is none."""
+        maze = self._mazes.get(digest)
+        if maze is not None:
+            return maze
+        with self._locked():
+            maze = self._mazes.get(digest)
+            if maze is None and len(self._mazes) < self.max_mazes:
+                maze = self._attach(digest)
+                if maze is not None:
+                    self._mazes[digest] = maze
+            return maze
+
+    def add_field(self, maze: SharedMaze, cheese: List[int], field) -> Optional[np.ndarray]:
+        """
+        Publish the distance field of a cheese.
+
+        Returns:
+            Optional[np.ndarray]: The shared field (possibly published by
+            another process meanwhile), None when the maze has no free slot
+        """
+        existing = maze.field(cheese)
+        if existing is not None:
+            return existing
+        values = np.frombuffer(field, dtype=np.int32)
+        with self._locked():
+            maze._scan()
+            existing = maze._fields.get((cheese[0], cheese[1]))
+            if existing is not None:
+                return existing
+            slot = maze.field_count
+            if slot >= maze.layout.capacity or values.size != maze.layout.padded_size:
+                return None
+            buffer = maze.segment.buf
+            offset = maze.layout.fields + slot * maze.layout.field_size
+            np.ndarray(values.shape, dtype=np.int32, buffer=buffer, offset=offset)[:] = values
+            SLOT.pack_into(buffer, maze.layout.slots + slot * SLOT.size, cheese[0], cheese[1])
+            # Published last: readers only look at slots below the count
+            struct.pack_into("<I", buffer, _COUNT_OFFSET, slot + 1)
+            maze._scan()
+            return maze._fields[(cheese[0], cheese[1])]
+
+    def release(self, digest: str) -> bool:
+        """
+        Drop this process's reference to a maze; the last reference unlinks the segment.
+
+        Views obtained from the maze must not be used afterwards.
+
+        Returns:
+            bool: True if the segment was unlinked
+        """
+        with self._locked():
+            maze = self._mazes.pop(digest, None)
+            if maze is None:
+                return False
+            references = self._add_reference(maze.segment, -1)
+            if references <= 0:
+                _unlink_segment(maze.segment)
+        maze._fields.clear()
+        try:
+            maze.segment.close()
+        except BufferError:
+            pass  # Views still exported; the mapping goes away with them
+        return references <= 0
+
+    def close(self):
+        """Release every maze held by this process."""
+        for digest in list(self._mazes):
+            self.release(digest)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of mazes held and counters."""
+        return {
+            "mazes": len(self._mazes),
+            "fields": sum(len(maze._fields) for maze in self._mazes.values()),
+            "published": self.published,
+            "attached": self.attached
+        }
+
+    def _create(self, grid: Grid) -> SharedMaze:
+        layout = _Layout(grid.width, grid.height, self.field_capacity)
+        segment = _open_segment(self.segment_name(grid.digest), create=True, size=layout.size)
+        buffer = segment.buf
+        HEADER.pack_into(buffer, 0, MAGIC, FORMAT, grid.width, grid.height, self.field_capacity, 0, 1, grid.digest.encode("ascii"))
+        buffer[layout.grid:layout.grid + grid.width * grid.height] = grid.to_bytes()
+        maze = SharedMaze(segment, grid.digest, layout)
+        maze.free[1:-1, 1:-1] = 1 - maze.cells  # Border left at 0 (wall)
+        return maze
+
+    def _attach(self, digest: str) -> Optional[SharedMaze]:
+        try:
+            segment = _open_segment(self.segment_name(digest))
+        except FileNotFoundError:
+            return None
+        magic, version, width, height, capacity, _, _, stored = HEADER.unpack_from(segment.buf, 0)
+        if magic != MAGIC or version != FORMAT or stored.decode("ascii") != digest:
+            logger.warning(f"Shared maze segment {segment.name} does not hold layout {digest}")
+            segment.close()
+            return None
+        self._add_reference(segment, 1)
+        self.attached += 1
+        return SharedMaze(segment, digest, _Layout(width, height, capacity))
+
+    @staticmethod
+    def _add_reference(segment: shared_memory.SharedMemory, delta: int) -> int:
+        """Change the reference count (caller holds the lock) and return it."""
+        references = struct.unpack_from("<q", segment.buf, _REFCOUNT_OFFSET)[0] + delta
+        struct.pack_into("<q", segment.buf, _REFCOUNT_OFFSET, references)
+        return references
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Lock against the other threads of this process and the other processes."""
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
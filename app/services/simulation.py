@@ -0,0 +1,268 @@
+"""
+Headless simulation engine driving many mice without HTTP.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from app.core.grid import Grid
+from app.core.utils import is_valid_position, calculate_manhattan_distance
+from app.services.components import ComponentIndex
+from app.services.coordinator import CheeseCoordinator
+from app.services.mouse_ai_service import MouseAIService
+from app.services.path_cache import PathCache
+from app.services.path_trees import PathTreeStore
+from app.services.reservations import ReservationTable
+
+logger = logging.getLogger(__name__)
+
+HOOK_EVENTS = ("tick_start", "decision", "tick_end")
+
+
+@dataclass
+class SimulatedMouse:
+    """State of one mouse in a simulation."""
+    mouse_id: str
+    position: List[int]
+    service: MouseAIService
+    cheese_found: int = 0
+    moves: int = 0
+
+
+@dataclass
+class TickStats:
+    """Timing and outcome of one simulation tick."""
+    tick: int
+    duration: float = 0.0
+    decision_time: float = 0.0
+    planning_time: float = 0.0
+    moved: int = 0
+    eaten: List[List[int]] = field(default_factory=list)
+
+
+class Simulation:
+    """
+    In-process simulation owning the maze, the cheeses and the mice.
+
+    Every tick, each mouse decides its move from the state at the start of
+    the tick by calling its MouseAIService directly, then all moves are
+    applied and cheeses reached by a mouse are consumed. With a coordinator,
+    the cheeses are first assigned to the mice once per tick and each mouse
+    heads to its assigned cheese instead of its own nearest one. With a
+    reservation table, every mouse holds its cell at the start of the tick
+    and mice decide in turn, each avoiding the cells reserved by the others.
+
+    The maze is decoded into a Grid once, and the mice built by the default
+    factory share the path trees, component labels and path cache of the
+    simulation, so a cheese costs one BFS for all of them instead of one A*
+    search per mouse and tick. Their decisions are not sent to the log
+    service unless ``log_decisions`` is set.
+
+    Hooks can be registered for the ``tick_start``, ``decision`` and
+    ``tick_end`` events:
+        - tick_start(simulation, tick)
+        - decision(simulation, mouse, next_position, seconds)
+        - tick_end(simulation, stats)
+    """
+
+    def __init__(
+        self,
+        labyrinth: List[List[int]],
+        cheeses: List[List[int]],
+        mice: Optional[Dict[str, List[int]]] = None,
+        service_factory: Optional[Callable[[str], MouseAIService]] = None,
+        coordinator: Optional[CheeseCoordinator] = None,
+        reservations: Optional[ReservationTable] = None,
+        path_trees: Optional[PathTreeStore] = None,
+        components: Optional[ComponentIndex] = None,
+        path_cache: Optional[PathCache] = None,
+        log_decisions: bool = False
+    ):
+        """
+        Initialize the simulation.
+
+        Args:
+            labyrinth: 2D maze representation (0=free, 1=wall)
+            cheeses: Cheese positions [[x, y], ...]
+            mice: Initial mouse positions by mouse id
+            service_factory: Builds the AI service of a new mouse from its id,
+                by default one sharing the stores below
+            coordinator: Assigns cheeses to mice cooperatively every tick
+            reservations: Space-time reservations used to avoid collisions
+            path_trees: Per-cheese shortest-path trees shared by the mice
+                (new for the simulation when None)
+            components: Connected-component labels shared by the mice
+                (new for the simulation when None)
+            path_cache: A* path cache shared by the mice (none when None)
+            log_decisions: Send every decision to the log service
+        """
+        self.labyrinth = labyrinth
+        self.coordinator = coordinator
+        self.reservations = reservations
+        self.grid = Grid.from_labyrinth(labyrinth)
+        self.cheeses = [list(c) for c in cheeses]
+        self.path_trees = path_trees if path_trees is not None else PathTreeStore()
+        self.components = components if components is not None else ComponentIndex()
+        self.path_cache = path_cache
+        self.log_decisions = log_decisions
+        self.service_factory = service_factory or self._build_service
+        self.mice: Dict[str, SimulatedMouse] = {}
+        self.tick = 0
+        self.total_time = 0.0
+        self.hooks: Dict[str, List[Callable[..., Any]]] = {event: [] for event in HOOK_EVENTS}
+
+        for mouse_id, position in (mice or {}).items():
+            self.add_mouse(mouse_id, position)
+
+    def add_mouse(self, mouse_id: str, position: List[int]) -> SimulatedMouse:
+        """
+        Add a mouse to the simulation.
+
+        Raises:
+            ValueError: If the id is taken or the position is blocked
+        """
+        if mouse_id in self.mice:
+            raise ValueError(f"Mouse {mouse_id} already exists")
+        if not is_valid_position(position, self.labyrinth):
+            raise ValueError(f"Position {position} is invalid or blocked")
+
+        mouse = SimulatedMouse(mouse_id, list(position), self.service_factory(mouse_id))
+        self.mice[mouse_id] = mouse
+        return mouse
+
+    def add_hook(self, event: str, callback: Callable[..., Any]) -> None:
+        """Register a callback for a simulation event."""
+        if event not in self.hooks:
+            raise ValueError(f"Unknown hook event '{event}', expected one of {HOOK_EVENTS}")
+        self.hooks[event].append(callback)
+
+    @property
+    def finished(self) -> bool:
+        """True when every cheese has been eaten."""
+        return not self.cheeses
+
+    def step(self) -> TickStats:
+        """
+        Advance the simulation by one tick.
+
+        Returns:
+            TickStats: Timing and outcome of the tick
+        """
+        started = time.perf_counter()
+        stats = TickStats(tick=self.tick)
+        for hook in self.hooks["tick_start"]:
+            hook(self, self.tick)
+
+        goals: Dict[str, List[int]] = {}
+        if self.coordinator is not None and self.cheeses:
+            planning_started = time.perf_counter()
+            goals = self.coordinator.assign(
+                self.grid, {m.mouse_id: m.position for m in self.mice.values()}, self.cheeses
+            )
+            stats.planning_time = time.perf_counter() - planning_started
+
+        if self.reservations is not None:
+            self.reservations.advance(self.tick)
+            for mouse in self.mice.values():
+                self.reservations.reserve_position(mouse.mouse_id, mouse.position, self.tick)
+
+        # Decide all moves from the state at the start of the tick
+        decisions = []
+        for mouse in self.mice.values():
+            if not self.cheeses:
+                break
+            decision_started = time.perf_counter()
+            next_position = self._decide(mouse, goals.get(mouse.mouse_id))
+            elapsed = time.perf_counter() - decision_started
+            stats.decision_time += elapsed
+            for hook in self.hooks["decision"]:
+                hook(self, mouse, next_position, elapsed)
+            decisions.append((mouse, next_position))
+
+        # Apply moves, then consume reached cheeses
+        for mouse, next_position in decisions:
+            if next_position != mouse.position and self._is_legal_move(mouse.position, next_position):
+                mouse.position = next_position
+                mouse.moves += 1
+                stats.moved += 1
+
+            if mouse.position in self.cheeses:
+                self.cheeses.remove(mouse.position)
+                mouse.cheese_found += 1
+                stats.eaten.append(list(mouse.position))
+
+        self.tick += 1
+        stats.duration = time.perf_counter() - started
+        self.total_time += stats.duration
+        for hook in self.hooks["tick_end"]:
+            hook(self, stats)
+        return stats
+
+    def run(self, max_ticks: int) -> Dict[str, Any]:
+        """
+        Run ticks until every cheese is eaten or ``max_ticks`` is reached.
+
+        Returns:
+            Dict[str, Any]: Summary of the run
+        """
+        start_tick = self.tick
+        while not self.finished and self.tick - start_tick < max_ticks:
+            self.step()
+
+        ticks = self.tick - start_tick
+        logger.info(f"Simulation ran {ticks} ticks, {len(self.cheeses)} cheeses left")
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        """Return counters and timings for the whole simulation."""
+        return {
+            "ticks": self.tick,
+            "cheeses_left": len(self.cheeses),
+            "total_time": self.total_time,
+            "ticks_per_second": self.tick / self.total_time if self.total_time else 0.0,
+            "mice": {
+                m.mouse_id: {"position": m.position, "cheese_found": m.cheese_found, "moves": m.moves}
+                for m in self.mice.values()
+            }
+        }
+
+    def _build_service(self, mouse_id: str) -> MouseAIService:
+        """AI service of a new mouse, sharing the stores of the simulation."""
+        return MouseAIService(
+            mouse_id,
+            path_cache=self.path_cache,
+            path_trees=self.path_trees,
+            components=self.components,
+            log_decisions=self.log_decisions
+        )
+
+    def _decide(self, mouse: SimulatedMouse, assigned: Optional[List[int]] = None) -> List[int]:
+        """Ask the mouse AI for its next position, targeting its assigned cheese or the closest one."""
+        if assigned is not None:
+            return mouse.service.calculate_next_position(
+                labyrinth=self.grid,
+                current_position=mouse.position,
+                goal_position=assigned,
+                mouse_id=mouse.mouse_id,
+                available_cheeses=[assigned],
+                reservations=self.reservations,
+                tick=self.tick
+            )
+        goal = min(self.cheeses, key=lambda c: calculate_manhattan_distance(mouse.position, c))
+        return mouse.service.calculate_next_position(
+            labyrinth=self.grid,
+            current_position=mouse.position,
+            goal_position=goal,
+            mouse_id=mouse.mouse_id,
+            available_cheeses=self.cheeses,
+            reservations=self.reservations,
+            tick=self.tick
+        )
+
+    def _is_legal_move(self, current: List[int], next_position: List[int]) -> bool:
+        """Check that a move goes to an adjacent free cell."""
+        return (
+            calculate_manhattan_distance(current, next_position) == 1
+            and is_valid_position(next_position, self.labyrinth)
+        )
@@ -0,0 +1,80 @@
+"""
+Coalescing of identical concurrent computations.
+
+When several threads ask for the same key at the same time (e.g. mice of
+one maze asking for the path from the same cell to the same cheese during
+a tick), the first one computes and the others wait for its result instead
+of running the same search.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """One computation in flight and the callers waiting for it."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return ``compute()``, shared with the concurrent callers of the same key.
+
+        The result object is returned to every caller: callers that modify
+        it must copy it first. An exception raised by the computation is
+        raised in every waiting caller.
+        """
+        with self._lock:
+            self.calls += 1
+            existing = self._calls.get(key)
+            leader = existing is None
+            if existing is None:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call = existing
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = compute()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters and the share of calls served by another caller's computation."""
+        with self._lock:
+            in_flight = len(self._calls)
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": in_flight,
+            "coalescing_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0
+        }
@@ -0,0 +1 @@
+"""Training package for offline dataset generation."""
\ No newline at end of file
@@ -0,0 +1,207 @@
+"""
+State encoding and on-disk shard format for self-play datasets.
+
+A dataset directory holds one set of uncompressed ``.npy`` arrays per shard
+(loadable with ``np.load(path, mmap_mode="r")``), a small JSON marker per
+completed shard and a ``manifest.json`` aggregating them.
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# Same action indices as MouseAgent._action_to_position
+ACTIONS = {(0, -1): 0, (1, 0): 1, (0, 1): 2, (-1, 0): 3}
+ACTION_NAMES = ["north", "east", "south", "west"]
+
+# Channels of the egocentric view
+CHANNELS = ["wall", "cheese", "mouse"]
+
+
+def encode_state(
+    labyrinth: List[List[int]],
+    position: List[int],
+    cheeses: List[List[int]],
+    other_mice: List[List[int]],
+    view_radius: int
+) -> np.ndarray:
+    """
+    Encode the egocentric view around a mouse.
+
+    Cells outside the labyrinth are reported as walls so the model sees
+    the border the same way as inner walls.
+
+    Args:
+        labyrinth: 2D maze representation (0=free, 1=wall)
+        position: Mouse position [x, y]
+        cheeses: Remaining cheese positions [[x, y], ...]
+        other_mice: Positions of the other mice [[x, y], ...]
+        view_radius: Number of cells visible in each direction
+
+    Returns:
+        np.ndarray: uint8 array of shape (len(CHANNELS), 2r+1, 2r+1)
+    """
+    size = 2 * view_radius + 1
+    state = np.zeros((len(CHANNELS), size, size), dtype=np.uint8)
+    state[0].fill(1)
+
+    height = len(labyrinth)
+    width = len(labyrinth[0])
+    x, y = position
+    x0, y0 = x - view_radius, y - view_radius
+
+    # Copy the visible window of the labyrinth in one slice
+    left, right = max(0, x0), min(width, x0 + size)
+    top, bottom = max(0, y0), min(height, y0 + size)
+    if left < right and top < bottom:
+        window = np.asarray([row[left:right] for row in labyrinth[top:bottom]], dtype=np.uint8)
+        state[0, top - y0:bottom - y0, left - x0:right - x0] = window
+
+    for channel, positions in ((1, cheeses), (2, other_mice)):
+        for cx, cy in positions:
+            vx, vy = cx - x0, cy - y0
+            if 0 <= vx < size and 0 <= vy < size:
+                state[channel, vy, vx] = 1
+
+    return state
+
+
+def nearest_cheese_offset(position: List[int], cheeses: List[List[int]]) -> List[int]:
+    """Return the [dx, dy] offset to the closest cheese by Manhattan distance."""
+    if not cheeses:
+        return [0, 0]
+    x, y = position
+    cx, cy = min(cheeses, key=lambda c: abs(c[0] - x) + abs(c[1] - y))
+    return [cx - x, cy - y]
+
+
+class ShardWriter:
+    """Writes shards and the manifest of a dataset directory."""
+
+    def __init__(self, output_dir: str, config: Dict[str, Any]):
+        """
+        Initialize the writer.
+
+        Args:
+            output_dir: Dataset directory (created if missing)
+            config: Generation parameters recorded in the manifest
+        """
+        self.output_dir = output_dir
+        self.config = config
+        os.makedirs(output_dir, exist_ok=True)
+
+    def shard_prefix(self, index: int) -> str:
+        """Return the file prefix of a shard."""
+        return os.path.join(self.output_dir, f"shard_{index:05d}")
+
+    def is_complete(self, index: int) -> bool:
+        """Check if a shard has been fully written in a previous run."""
+        return os.path.exists(self.shard_prefix(index) + ".json")
+
+    def write_shard(self, index: int, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Write the arrays of a shard, then its completion marker.
+
+        Every file is written to a temporary name and renamed, so an
+        interrupted run never leaves a truncated shard marked as complete.
+
+        Args:
+            index: Shard index
+            arrays: Arrays to store, one ``.npy`` file each
+            meta: Extra metadata stored in the marker
+
+        Returns:
+            Dict[str, Any]: Shard entry as recorded in the manifest
+        """
+        prefix = self.shard_prefix(index)
+        files = {}
+        for name, array in arrays.items():
+            path = f"{prefix}.{name}.npy"
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+            files[name] = os.path.basename(path)
+
+        entry = {"index": index, "files": files, **meta}
+        _write_json_atomic(prefix + ".json", entry)
+        return entry
+
+    def read_shard_entry(self, index: int) -> Dict[str, Any]:
+        """Read the completion marker of a shard."""
+        with open(self.shard_prefix(index) + ".json") as f:
+            return json.load(f)
+
+    def check_config(self) -> None:
+        """
+        Ensure an existing manifest was produced with the same parameters.
+
+        Raises:
+            ValueError: If resuming with different generation parameters
+        """
+        manifest = load_manifest(self.output_dir)
+        if manifest and manifest.get("config") != self.config:
+            raise ValueError(
+                f"Dataset in {self.output_dir} was generated with different parameters; "
+                "use a new output directory"
+            )
+
+    def write_manifest(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Write the manifest listing all completed shards.
+
+        Args:
+            entries: Shard entries
+
+        Returns:
+            Dict[str, Any]: Manifest content
+        """
+        entries = sorted(entries, key=lambda e: e["index"])
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "config": self.config,
+            "channels": CHANNELS,
+            "actions": ACTION_NAMES,
+            "total_samples": sum(e["samples"] for e in entries),
+            "shards": entries
+        }
+        _write_json_atomic(os.path.join(self.output_dir, MANIFEST_NAME), manifest)
+        return manifest
+
+
+def load_manifest(output_dir: str) -> Optional[Dict[str, Any]]:
+    """Load the manifest of a dataset directory, if any."""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_shard(output_dir: str, entry: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Memory-map the arrays of a shard listed in the manifest.
+
+    Args:
+        output_dir: Dataset directory
+        entry: Shard entry from the manifest
+
+    Returns:
+        Dict[str, np.ndarray]: Read-only memory-mapped arrays by name
+    """
+    return {
+        name: np.load(os.path.join(output_dir, filename), mmap_mode="r")
+        for name, filename in entry["files"].items()
+    }
+
+
+def _write_json_atomic(path: str, data: Dict[str, Any]) -> None:
+    """Write a JSON file through a temporary file and an atomic rename."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Offline self-play dataset generator.
+
+Runs MouseAIService as the expert policy for several mice on random mazes
+and records (state, action) pairs into shards. Shards are independent and
+seeded from their index, so they are generated in parallel across
+processes and an interrupted run resumes where it stopped.
+
+Usage:
+    python -m app.training.generate_dataset --output data/selfplay --shards 64 --workers 8
+"""
+import argparse
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from app.core.maze_generator import generate_dfs_maze, random_free_cells
+from app.training.dataset import (
+    ACTIONS,
+    ShardWriter,
+    encode_state,
+    nearest_cheese_offset
+)
+
+logger = logging.getLogger(__name__)
+
+
+def run_episode(config: Dict[str, Any], rng: random.Random) -> Tuple[List[np.ndarray], List[List[int]], List[int]]:
+    """
+    Play one episode with MouseAIService driving every mouse.
+
+    Args:
+        config: Generation parameters
+        rng: Random generator for the maze and initial placement
+
+    Returns:
+        Tuple of (states, goal offsets, actions) recorded for every move
+    """
+    from app.services.simulation import Simulation
+
+    labyrinth = generate_dfs_maze(config["width"], config["height"], rng, config["loop_factor"])
+    cheeses = random_free_cells(labyrinth, config["cheeses"], rng)
+    positions = random_free_cells(labyrinth, config["mice"], rng, exclude=cheeses)
+    simulation = Simulation(labyrinth, cheeses, {f"selfplay_{i}": p for i, p in enumerate(positions)})
+
+    states, offsets, actions = [], [], []
+
+    def record(sim, mouse, next_position, seconds):
+        # Decisions are taken from the state at the start of the tick
+        action = ACTIONS.get((next_position[0] - mouse.position[0], next_position[1] - mouse.position[1]))
+        if action is None:
+            return
+        others = [m.position for m in sim.mice.values() if m is not mouse]
+        states.append(encode_state(sim.labyrinth, mouse.position, sim.cheeses, others, config["view_radius"]))
+        offsets.append(nearest_cheese_offset(mouse.position, sim.cheeses))
+        actions.append(action)
+
+    simulation.add_hook("decision", record)
+    simulation.run(config["max_steps"])
+
+    return states, offsets, actions
+
+
+def generate_shard(output_dir: str, index: int, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate and write one shard (runs in a worker process).
+
+    Args:
+        output_dir: Dataset directory
+        index: Shard index, also used to derive the shard seed
+        config: Generation parameters
+
+    Returns:
+        Dict[str, Any]: Shard entry for the manifest
+    """
+    # The expert policy logs every move, keep workers quiet
+    logging.getLogger().setLevel(logging.WARNING)
+
+    seed = config["seed"] * 1_000_003 + index
+    rng = random.Random(seed)
+    random.seed(seed)  # MouseAIService uses the global generator in its fallbacks
+
+    size = 2 * config["view_radius"] + 1
+    states, offsets, actions = [], [], []
+    started = time.perf_counter()
+
+    for _ in range(config["episodes_per_shard"]):
+        episode_states, episode_offsets, episode_actions = run_episode(config, rng)
+        states.extend(episode_states)
+        offsets.extend(episode_offsets)
+        actions.extend(episode_actions)
+
+    arrays = {
+        "states": np.stack(states) if states else np.zeros((0, 3, size, size), dtype=np.uint8),
+        "offsets": np.asarray(offsets, dtype=np.int16).reshape(-1, 2),
+        "actions": np.asarray(actions, dtype=np.uint8)
+    }
+    meta = {
+        "samples": len(actions),
+        "episodes": config["episodes_per_shard"],
+        "seconds": round(time.perf_counter() - started, 3)
+    }
+    return ShardWriter(output_dir, config).write_shard(index, arrays, meta)
+
+
+def generate_dataset(output_dir: str, num_shards: int, workers: int, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate all missing shards of a dataset and write its manifest.
+
+    Args:
+        output_dir: Dataset directory
+        num_shards: Total number of shards in the dataset
+        workers: Number of worker processes
+        config: Generation parameters
+
+    Returns:
+        Dict[str, Any]: Manifest content
+    """
+    writer = ShardWriter(output_dir, config)
+    writer.check_config()
+
+    entries = [writer.read_shard_entry(i) for i in range(num_shards) if writer.is_complete(i)]
+    pending = [i for i in range(num_shards) if not writer.is_complete(i)]
+    logger.info(f"{len(entries)} shards already complete, generating {len(pending)}")
+
+    if pending:
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(generate_shard, output_dir, i, config) for i in pending]
+            for future in as_completed(futures):
+                entry = future.result()
+                entries.append(entry)
+                writer.write_manifest(entries)
+                logger.info(f"Shard {entry['index']} done: {entry['samples']} samples in {entry['seconds']}s")
+
+        elapsed = time.perf_counter() - started
+        pending_set = set(pending)
+        generated = sum(e["samples"] for e in entries if e["index"] in pending_set)
+        logger.info(f"Generated {generated} samples in {elapsed:.1f}s ({generated / elapsed:.0f} samples/s)")
+
+    return writer.write_manifest(entries)
+
+
+def main():
+    """Parse command line arguments and generate the dataset."""
+    parser = argparse.ArgumentParser(description="Generate a self-play dataset with MouseAIService as expert")
+    parser.add_argument("--output", default="data/selfplay", help="Dataset directory")
+    parser.add_argument("--shards", type=int, default=16, help="Total number of shards")
+    parser.add_argument("--episodes-per-shard", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--width", type=int, default=21)
+    parser.add_argument("--height", type=int, default=21)
+    parser.add_argument("--loop-factor", type=float, default=0.1, help="Share of inner walls removed to create loops")
+    parser.add_argument("--mice", type=int, default=4)
+    parser.add_argument("--cheeses", type=int, default=6)
+    parser.add_argument("--max-steps", type=int, default=200)
+    parser.add_argument("--view-radius", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    config = {
+        "width": args.width,
+        "height": args.height,
+        "loop_factor": args.loop_factor,
+        "mice": args.mice,
+        "cheeses": args.cheeses,
+        "max_steps": args.max_steps,
+        "view_radius": args.view_radius,
+        "episodes_per_shard": args.episodes_per_shard,
+        "seed": args.seed
+    }
+
+    try:
+        manifest = generate_dataset(args.output, args.shards, args.workers, config)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"Dataset ready in {args.output}: {manifest['total_samples']} samples in {len(manifest['shards'])} shards")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Cooperative cheese assignment benchmark.
+
+Measures one coordinator tick for many mice and cheeses: distance fields
+computed from scratch (first tick), distance fields reused (following
+ticks) and the assignment alone, and checks the warm tick against a tick
+budget. Also compares whole simulations where each mouse chases its own
+nearest cheese with coordinated ones.
+
+Usage:
+    python -m benchmarks.bench_coordination --mice 200 --cheeses 200 --size 101 --budget-ms 100
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, Dict
+
+from app.core.grid import Grid
+from app.core.maze_generator import random_free_cells
+from app.services.coordinator import CheeseCoordinator, scipy_solver
+from app.services.distance_fields import DistanceFieldStore
+from app.services.simulation import Simulation
+from benchmarks.corpus import build_case
+
+
+def bench_tick(kind: str, size: int, mice: int, cheeses: int, seed: int) -> Dict[str, Any]:
+    """Time the coordinator on one maze, cold then warm."""
+    case = build_case(kind, size, seed)
+    rng = random.Random(seed)
+    cells = random_free_cells(case.labyrinth, mice + cheeses, rng)
+    positions = {f"souris{i + 1}": cell for i, cell in enumerate(cells[:mice])}
+    cheese_cells = cells[mice:]
+    grid = Grid.from_labyrinth(case.labyrinth)
+
+    coordinator = CheeseCoordinator(DistanceFieldStore(max_fields=cheeses * 2))
+    started = time.perf_counter()
+    goals = coordinator.assign(grid, positions, cheese_cells)
+    cold = time.perf_counter() - started
+
+    # Move one mouse so that the previous result is not reused
+    first = next(iter(positions))
+    positions[first] = cheese_cells[0]
+    started = time.perf_counter()
+    coordinator.assign(grid, positions, cheese_cells)
+    warm = time.perf_counter() - started
+
+    return {
+        "maze": f"{kind}-{size}",
+        "mice": len(positions),
+        "cheeses": len(cheese_cells),
+        "assigned": len(goals),
+        "distinct_goals": len({tuple(goal) for goal in goals.values()}),
+        "cold_tick_ms": round(cold * 1000, 1),
+        "warm_tick_ms": round(warm * 1000, 1),
+        "warm_fields_ms": round(coordinator.last_timings["fields"] * 1000, 1),
+        "assignment_ms": round(coordinator.last_timings["assignment"] * 1000, 1)
+    }
+
+
+def bench_simulation(size: int, mice: int, cheeses: int, seed: int, max_ticks: int) -> Dict[str, Any]:
+    """Run the same simulation with independent and coordinated mice."""
+    case = build_case("rooms", size, seed)
+    cells = random_free_cells(case.labyrinth, mice + cheeses, random.Random(seed))
+    start = {f"souris{i + 1}": cell for i, cell in enumerate(cells[:mice])}
+
+    results = {}
+    for name, coordinator in (("independent", None), ("coordinated", CheeseCoordinator())):
+        simulation = Simulation(case.labyrinth, cells[mice:], start, coordinator=coordinator)
+        summary = simulation.run(max_ticks=max_ticks)
+        results[name] = {
+            "ticks": summary["ticks"],
+            "cheeses_left": summary["cheeses_left"],
+            "total_time_s": round(summary["total_time"], 3)
+        }
+    return results
+
+
+def main():
+    """Run the coordination benchmark and print a report."""
+    parser = argparse.ArgumentParser(description="Benchmark cooperative cheese assignment")
+    parser.add_argument("--mice", type=int, default=200)
+    parser.add_argument("--cheeses", type=int, default=200)
+    parser.add_argument("--size", type=int, default=101, help="Maze width and height")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Tick budget for the warm tick")
+    parser.add_argument("--sim-size", type=int, default=31)
+    parser.add_argument("--sim-mice", type=int, default=8)
+    parser.add_argument("--sim-cheeses", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = {
+        "solver": "scipy" if scipy_solver() is not None else "numpy-hungarian",
+        "ticks": [bench_tick(kind, args.size, args.mice, args.cheeses, args.seed) for kind in ("rooms", "dfs")],
+        "simulation": bench_simulation(args.sim_size, args.sim_mice, args.sim_cheeses, args.seed, max_ticks=500)
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    over = [tick for tick in report["ticks"] if tick["warm_tick_ms"] > args.budget_ms]
+    for tick in over:
+        print(f"{tick['maze']}: warm tick {tick['warm_tick_ms']} ms exceeds the {args.budget_ms} ms budget")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
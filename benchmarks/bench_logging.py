@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Per-request logging overhead benchmark.
+
+Compares the cost seen by request code when log entries are built, stored
+and fanned out inline (the previous behavior) with the cost of queueing
+them for the background consumer. SSE subscribers are simulated by
+LogSubscriber buffers on an event loop running in another thread.
+
+Usage:
+    python -m benchmarks.bench_logging --requests 5000 --subscribers 5
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict
+
+from app.services.log_service import LogService
+from app.services.log_subscriber import LogSubscriber
+
+# add_custom_log calls made by one /api/move request (route and AI service)
+LOGS_PER_REQUEST = 4
+
+
+def log_request(service: LogService, i: int):
+    """Emit the custom logs of one move request."""
+    for step in range(LOGS_PER_REQUEST):
+        service.add_custom_log(
+            message=f"Thread {i % 8} - step {step} for mouse souris{i % 8}",
+            level="INFO",
+            mouse_id=f"souris{i % 8}",
+            current_position=[i % 50, i % 37],
+            next_position=[i % 50 + 1, i % 37],
+            action="bench"
+        )
+
+
+def bench_mode(background: bool, requests: int, subscribers: int, loop: asyncio.AbstractEventLoop) -> Dict[str, Any]:
+    """Time the request-side logging cost and the time until everything is delivered."""
+    service = LogService(max_logs=1000, background=background)
+    service.subscribers = [LogSubscriber(loop, maxsize=1000) for _ in range(subscribers)]
+
+    log_request(service, 0)
+    service.flush(timeout=10.0)
+
+    started = time.perf_counter()
+    for i in range(requests):
+        log_request(service, i)
+    produced = time.perf_counter() - started
+    service.flush(timeout=60.0)
+    drained = time.perf_counter() - started
+
+    return {
+        "mode": "queued" if background else "inline",
+        "request_us": round(produced / requests * 1e6, 2),
+        "end_to_end_us_per_request": round(drained / requests * 1e6, 2),
+        "batches": service.batches_published
+    }
+
+
+def main():
+    """Run the logging benchmark and print a report."""
+    parser = argparse.ArgumentParser(description="Benchmark per-request logging overhead")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--subscribers", type=int, default=5, help="Simulated SSE clients")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        results = [bench_mode(background, args.requests, args.subscribers, loop) for background in (False, True)]
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    inline, queued = results
+    report = {
+        "requests": args.requests,
+        "logs_per_request": LOGS_PER_REQUEST,
+        "subscribers": args.subscribers,
+        "results": results,
+        "request_speedup": round(inline["request_us"] / queued["request_us"], 2)
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
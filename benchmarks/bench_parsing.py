@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Request parsing benchmark for the frontend /api/move payload.
+
+Compares the former hand-walking of ``Dict[str, Any]`` requests with the
+typed MouseMoveRequest model (validation plus grid decoding): from raw JSON
+bytes with pydantic, from a dict decoded by ``json.loads``, and from the
+body decoded by ``loads_with_grid`` as done by the /api/move route. The
+compact bitmask and RLE wire formats are parsed through the route path too.
+
+Usage:
+    python -m benchmarks.bench_parsing --size 100 --number 200
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.core.grid_codec import loads_with_grid
+from app.models.frontend import MouseMoveRequest
+from benchmarks.corpus import build_case
+from benchmarks.load_test import frontend_payload
+
+
+def legacy_parse(body: bytes) -> Dict[str, Any]:
+    """Parse a move request the way routes_mouse did before the typed model."""
+    request = json.loads(body)
+    position = request.get("position", {"x": 0, "y": 0})
+    environment = request.get("environment", {})
+    grid = environment.get("grid", [])
+    python_grid = []
+    for row in grid:
+        python_row = []
+        for cell in row:
+            if cell == "wall":
+                python_row.append(1)
+            else:
+                python_row.append(0)
+        python_grid.append(python_row)
+    cheeses = [[c["x"], c["y"]] for c in environment.get("cheesePositions", [])]
+    return {"grid": python_grid, "position": [position["x"], position["y"]], "cheeses": cheeses}
+
+
+def typed_parse_json(body: bytes) -> Dict[str, Any]:
+    """Validate raw JSON bytes with the typed model."""
+    request = MouseMoveRequest.model_validate_json(body)
+    cheeses = [c.to_list() for c in request.environment.cheesePositions]
+    return {"grid": request.environment.grid, "position": request.position.to_list(), "cheeses": cheeses}
+
+
+def typed_parse_dict(body: bytes) -> Dict[str, Any]:
+    """Decode JSON first, then validate the dict (FastAPI request path)."""
+    request = MouseMoveRequest.model_validate(json.loads(body))
+    cheeses = [c.to_list() for c in request.environment.cheesePositions]
+    return {"grid": request.environment.grid, "position": request.position.to_list(), "cheeses": cheeses}
+
+
+def typed_parse_grid_codec(body: bytes) -> Dict[str, Any]:
+    """Decode the grid from the body bytes, then validate (/api/move route path)."""
+    request = MouseMoveRequest.model_validate(loads_with_grid(body))
+    cheeses = [c.to_list() for c in request.environment.cheesePositions]
+    return {"grid": request.environment.grid, "position": request.position.to_list(), "cheeses": cheeses}
+
+
+# name -> (grid wire format of the body, parser)
+PARSERS: Dict[str, Tuple[str, Callable[[bytes], Dict[str, Any]]]] = {
+    "legacy_hand_walk": ("cells", legacy_parse),
+    "typed_model_json": ("cells", typed_parse_json),
+    "typed_model_dict": ("cells", typed_parse_dict),
+    "typed_grid_codec": ("cells", typed_parse_grid_codec),
+    "typed_bitmask": ("bitmask", typed_parse_grid_codec),
+    "typed_rle": ("rle", typed_parse_grid_codec)
+}
+
+
+def time_parser(parser: Callable[[bytes], Any], body: bytes, number: int) -> List[float]:
+    """Return per-call times in microseconds."""
+    parser(body)
+    times = []
+    for _ in range(number):
+        started = time.perf_counter()
+        parser(body)
+        times.append((time.perf_counter() - started) * 1e6)
+    return times
+
+
+def main():
+    """Run the parsing benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark /api/move request parsing")
+    parser.add_argument("--size", type=int, default=100, help="Grid width and height")
+    parser.add_argument("--number", type=int, default=200, help="Calls per parser")
+    args = parser.parse_args()
+
+    case = build_case("dfs", args.size + 1, seed=0)
+    labyrinth = [row[:args.size] for row in case.labyrinth[:args.size]]
+    bodies = {
+        grid_format: json.dumps(frontend_payload("souris1", labyrinth, case.start, case.cheeses, grid_format)).encode()
+        for grid_format in ("cells", "bitmask", "rle")
+    }
+
+    reference = legacy_parse(bodies["cells"])
+    for name, (grid_format, parse) in PARSERS.items():
+        result = parse(bodies[grid_format])
+        assert [list(row) for row in result["grid"]] == reference["grid"], name
+
+    sizes = ", ".join(f"{grid_format} {len(body)}" for grid_format, body in bodies.items())
+    print(f"Grid {len(labyrinth[0])}x{len(labyrinth)}, payload bytes: {sizes}")
+    baseline = None
+    for name, (grid_format, parse) in PARSERS.items():
+        times = sorted(time_parser(parse, bodies[grid_format], args.number))
+        median = times[len(times) // 2]
+        baseline = baseline or median
+        print(f"{name:<20} median {median:>9.1f} us   min {times[0]:>9.1f} us   x{baseline / median:.2f} vs legacy")
+
+
+if __name__ == "__main__":
+    main()
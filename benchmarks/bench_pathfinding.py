@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Pathfinding benchmark suite.
+
+Times the MouseAIService search functions and MovementService end to end
+on the reproducible maze corpus, and reports wall time, A* nodes expanded
+and memory allocations (tracemalloc). Results are written as JSON and can
+be compared to a previous run to fail on regressions.
+
+Usage:
+    python -m benchmarks.bench_pathfinding --output bench.json
+    python -m benchmarks.bench_pathfinding --baseline bench.json --threshold 0.2
+"""
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.services.mouse_ai_service import MouseAIService
+from app.services.movement_service import MovementService
+from benchmarks.corpus import DEFAULT_SIZES, MAZE_KINDS, MazeCase, build_corpus
+
+# Metrics compared against the baseline, all "lower is better"
+COMPARED_METRICS = ("wall_ms_median", "nodes_expanded", "alloc_peak_bytes")
+
+
+def _calculate_next_position(case: MazeCase) -> Tuple[Callable[[], Any], Callable[[], int]]:
+    service = MouseAIService("bench")
+
+    def run():
+        service.position_history.clear()
+        service.calculate_next_position(case.labyrinth, case.start, case.goal, "bench", case.cheeses)
+
+    return run, lambda: service.nodes_expanded
+
+
+def _find_path_astar(case: MazeCase) -> Tuple[Callable[[], Any], Callable[[], int]]:
+    service = MouseAIService("bench")
+    return lambda: service._find_path_astar(case.labyrinth, case.start, case.goal), lambda: service.nodes_expanded
+
+
+def _find_nearest_cheese(case: MazeCase) -> Tuple[Callable[[], Any], Callable[[], int]]:
+    service = MouseAIService("bench")
+    return lambda: service._find_nearest_cheese(case.start, case.cheeses, case.labyrinth), lambda: service.nodes_expanded
+
+
+def _movement_service(case: MazeCase) -> Tuple[Callable[[], Any], Callable[[], int]]:
+    service = MovementService()
+
+    def run():
+        service.calculate_next_position(case.labyrinth, case.start, case.goal, case.cheeses)
+
+    def nodes():
+        ai_service = service.ai_agent.mouse_ai_service
+        return ai_service.nodes_expanded if ai_service else 0
+
+    return run, nodes
+
+
+# Each target builds (run, nodes_expanded_counter) for a maze case
+TARGETS: Dict[str, Callable[[MazeCase], Tuple[Callable[[], Any], Callable[[], int]]]] = {
+    "calculate_next_position": _calculate_next_position,
+    "find_path_astar": _find_path_astar,
+    "find_nearest_cheese": _find_nearest_cheese,
+    "movement_service": _movement_service
+}
+
+
+def measure(target: str, case: MazeCase, repeat: int) -> Dict[str, Any]:
+    """
+    Benchmark one target on one maze case.
+
+    Wall time, nodes expanded and allocations are measured in separate runs
+    so that tracemalloc overhead does not distort the timings.
+
+    Args:
+        target: Name of the target in TARGETS
+        case: Maze case
+        repeat: Number of timed runs
+
+    Returns:
+        Dict[str, Any]: Measured metrics
+    """
+    random.seed(0)  # Greedy fallbacks shuffle with the global generator
+
+    run, nodes = TARGETS[target](case)
+    run()  # Warm up
+
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - started) * 1000)
+
+    run, nodes = TARGETS[target](case)
+    run()
+    nodes_expanded = nodes()
+
+    run, _ = TARGETS[target](case)
+    tracemalloc.start()
+    run()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "target": target,
+        "case": case.name,
+        "kind": case.kind,
+        "size": case.size,
+        "repeat": repeat,
+        "wall_ms_median": round(statistics.median(times), 4),
+        "wall_ms_min": round(min(times), 4),
+        "wall_ms_mean": round(statistics.fmean(times), 4),
+        "nodes_expanded": nodes_expanded,
+        "alloc_peak_bytes": peak,
+        "alloc_net_bytes": current
+    }
+
+
+def run_benchmarks(cases: List[MazeCase], targets: List[str], repeat: int) -> Dict[str, Any]:
+    """Run every target on every case and collect the results."""
+    results = []
+    for case in cases:
+        for target in targets:
+            result = measure(target, case, repeat)
+            results.append(result)
+            print(
+                f"{case.name:<16} {target:<24} {result['wall_ms_median']:>10.3f} ms "
+                f"{result['nodes_expanded']:>8} nodes {result['alloc_peak_bytes']:>10} B peak"
+            )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform()
+        },
+        "results": results
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare results to a baseline run.
+
+    Args:
+        current: Results of this run
+        baseline: Results of the reference run
+        threshold: Allowed relative increase (0.2 = +20%)
+
+    Returns:
+        List[str]: Description of every regression beyond the threshold
+    """
+    reference = {(r["target"], r["case"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        previous = reference.get((result["target"], result["case"]))
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = previous[metric], result[metric]
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append(
+                    f"{result['case']} {result['target']} {metric}: {before} -> {after} "
+                    f"(+{(after / before - 1) * 100:.1f}%)"
+                )
+    return regressions
+
+
+def main():
+    """Parse command line arguments, run the benchmarks and compare."""
+    parser = argparse.ArgumentParser(description="Benchmark the Mouse AI pathfinding")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare to the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--kinds", nargs="+", choices=MAZE_KINDS, default=list(MAZE_KINDS))
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # The services log every calculation, keep the benchmark output readable
+    logging.getLogger().setLevel(logging.WARNING)
+
+    cases = build_corpus(args.seed, args.sizes, args.kinds)
+    results = run_benchmarks(cases, args.targets, args.repeat)
+    results["meta"].update({"seed": args.seed, "sizes": args.sizes, "threshold": args.threshold})
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold * 100:.0f}%:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regression against baseline")
+
+
+if __name__ == "__main__":
+    main()
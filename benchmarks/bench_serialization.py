@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark: share of request time spent encoding responses.
+
+For /api/move and /api/logs/history, the full in-process request time
+(ASGI, no network) is compared with the time spent rendering the response
+body, once with FastAPI's stock ``json.dumps`` rendering and once with the
+shared serializer of ``app.core.serialization``. For the log stream, it
+compares encoding every entry for every client with the shared frame cache.
+
+The shared serializer is orjson (from requirements.txt); without it, the
+stdlib fallback is measured instead, and the report says so.
+
+Usage:
+    python -m benchmarks.bench_serialization --number 200 --sse-clients 20
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from app.core.serialization import HAS_ORJSON, SSEFrameCache, dumps
+from app.services.log_service import log_service
+from benchmarks.corpus import build_case
+from benchmarks.load_test import frontend_payload
+
+
+def stdlib_render(content: Any) -> bytes:
+    """Render a body the way ``fastapi.responses.JSONResponse`` does."""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def time_call(func: Callable[[], Any], number: int) -> float:
+    """Return the median duration of a call in microseconds."""
+    func()
+    times = []
+    for _ in range(number):
+        started = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - started) * 1e6)
+    times.sort()
+    return times[len(times) // 2]
+
+
+async def time_requests(app, method: str, url: str, number: int, **kwargs) -> Dict[str, Any]:
+    """Return the median in-process request time and the last response body."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.request(method, url, **kwargs)
+        times = []
+        for _ in range(number):
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            times.append((time.perf_counter() - started) * 1e6)
+    times.sort()
+    return {"request_us": times[len(times) // 2], "body": response.json()}
+
+
+def fill_logs(count: int) -> None:
+    """Publish log entries shaped like the ones of the move endpoint."""
+    for i in range(count):
+        log_service.add_custom_log(
+            message=f"Thread {i % 8} - Calculated move: east for mouse souris{i % 8}",
+            mouse_id=f"souris{i % 8}",
+            mouse_tag=i % 8,
+            move="east",
+            current_position=[i % 50, i % 37],
+            next_position=[i % 50 + 1, i % 37],
+            reasoning="Moving east towards cheese at (12, 4) - distance: 9",
+            cheese_target={"x": 12, "y": 4},
+            distance_to_cheese=9
+        )
+    log_service.flush()
+
+
+def bench_endpoints(number: int, size: int) -> List[Dict[str, Any]]:
+    """Measure serialization share for the JSON endpoints."""
+    from app.main import create_app
+
+    app = create_app()
+    case = build_case("dfs", size, seed=0)
+    payload = frontend_payload("souris1", case.labyrinth, case.start, case.cheeses)
+    fill_logs(200)
+
+    endpoints: List[Tuple[str, str, str, Dict[str, Any]]] = [
+        ("POST /api/move", "POST", "/api/move", {"json": payload}),
+        ("GET /api/logs/history", "GET", "/api/logs/history", {})
+    ]
+    results = []
+    for name, method, url, kwargs in endpoints:
+        measured = asyncio.run(time_requests(app, method, url, number, **kwargs))
+        body = measured["body"]
+        stdlib_us = time_call(lambda: stdlib_render(body), number)
+        shared_us = time_call(lambda: dumps(body), number)
+        results.append({
+            "endpoint": name,
+            "request_us": round(measured["request_us"], 1),
+            "stdlib_render_us": round(stdlib_us, 1),
+            "shared_render_us": round(shared_us, 1),
+            "stdlib_share": round(stdlib_us / measured["request_us"], 4),
+            "shared_share": round(shared_us / measured["request_us"], 4)
+        })
+    return results
+
+
+def bench_sse(clients: int, entries: int, number: int) -> Dict[str, Any]:
+    """Compare per-client SSE encoding with the shared frame cache."""
+    fill_logs(entries)
+    batch = log_service.get_recent_logs(entries)
+
+    def per_client():
+        for _ in range(clients):
+            for entry in batch:
+                f"data: {json.dumps(entry, default=str)}\n\n".encode("utf-8")
+
+    def shared():
+        cache = SSEFrameCache(max_entries=entries)
+        for _ in range(clients):
+            for entry in batch:
+                cache.frame(entry)
+
+    per_client_us = time_call(per_client, number)
+    shared_us = time_call(shared, number)
+    return {
+        "clients": clients,
+        "entries": entries,
+        "per_client_json_us": round(per_client_us, 1),
+        "shared_frames_us": round(shared_us, 1),
+        "speedup": round(per_client_us / shared_us, 2)
+    }
+
+
+def main():
+    """Run the serialization benchmarks and print a report."""
+    parser = argparse.ArgumentParser(description="Measure serialization as a share of request time")
+    parser.add_argument("--number", type=int, default=200, help="Repetitions per measurement")
+    parser.add_argument("--size", type=int, default=51, help="Maze size of the move payload")
+    parser.add_argument("--sse-clients", type=int, default=20)
+    parser.add_argument("--sse-entries", type=int, default=50)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = {
+        "orjson": HAS_ORJSON,
+        "endpoints": bench_endpoints(args.number, args.size),
+        "sse": bench_sse(args.sse_clients, args.sse_entries, max(1, args.number // 10))
+    }
+
+    print(f"Serializer: {'orjson' if HAS_ORJSON else 'json (fallback)'}")
+    for row in report["endpoints"]:
+        print(
+            f"{row['endpoint']:<24} request {row['request_us']:>8.1f} us   "
+            f"render stdlib {row['stdlib_render_us']:>7.1f} us ({row['stdlib_share']:.1%})   "
+            f"shared {row['shared_render_us']:>7.1f} us ({row['shared_share']:.1%})"
+        )
+    sse = report["sse"]
+    print(
+        f"SSE {sse['clients']} clients x {sse['entries']} entries: per-client json {sse['per_client_json_us']:.1f} us, "
+        f"shared frames {sse['shared_frames_us']:.1f} us (x{sse['speedup']})"
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Process startup profile: import time of the application, per module.
+
+Runs ``python -X importtime -c "import app.main"`` in fresh interpreters
+and reports the wall time of a cold import (process start to application
+created), the modules with the largest self import time and the cumulative
+import time of each ``app.*`` module.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5 --top 15
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+TARGET = "app.main"
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per module with ``module``,
+        ``self_us``, ``cumulative_us`` and ``depth`` (import nesting level)
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(name) - len(name.lstrip())) // 2
+        })
+    return modules
+
+
+def profile_once(target: str) -> Dict[str, Any]:
+    """Import the target in a new interpreter; return its wall time and module timings."""
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True, text=True, check=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    return {"wall_ms": wall_ms, "modules": parse_importtime(process.stderr)}
+
+
+def summarize_runs(runs: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    """Median timings over the runs."""
+    self_us: Dict[str, List[int]] = {}
+    cumulative_us: Dict[str, List[int]] = {}
+    for run in runs:
+        for module in run["modules"]:
+            self_us.setdefault(module["module"], []).append(module["self_us"])
+            cumulative_us.setdefault(module["module"], []).append(module["cumulative_us"])
+
+    def median_ms(values: List[int]) -> float:
+        return round(statistics.median(values) / 1000, 2)
+
+    slowest = sorted(self_us, key=lambda name: statistics.median(self_us[name]), reverse=True)[:top]
+    application = sorted(
+        (name for name in cumulative_us if name == "app" or name.startswith("app.")),
+        key=lambda name: statistics.median(cumulative_us[name]), reverse=True
+    )
+    return {
+        "cold_start_ms": round(statistics.median(run["wall_ms"] for run in runs), 2),
+        "modules_imported": len(runs[0]["modules"]),
+        "slowest_self_ms": [{"module": name, "self_ms": median_ms(self_us[name])} for name in slowest],
+        "application_cumulative_ms": [
+            {"module": name, "cumulative_ms": median_ms(cumulative_us[name])} for name in application
+        ]
+    }
+
+
+def main():
+    """Profile the application startup and print a report."""
+    parser = argparse.ArgumentParser(description="Profile the import time of the application")
+    parser.add_argument("--target", default=TARGET, help="Module to import")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules listed")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    profile_once(args.target)  # warm the bytecode cache
+    runs = [profile_once(args.target) for _ in range(args.runs)]
+    report = {"target": args.target, "runs": args.runs, **summarize_runs(runs, args.top)}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Per-move round-trip latency: WebSocket move channel against POST /api/move.
+
+Starts the application locally in a subprocess (see load_test), then for
+each number of mice lets every mouse request moves back to back, either
+with one HTTP request per move (full environment in every body) or on one
+shared WebSocket connection (environment registered once, moves pipelined
+and matched to their answers by request id).
+
+Usage:
+    python -m benchmarks.bench_websocket --mice 1 10 100 --moves 20 --size 21
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+import httpx
+import websockets
+
+from app.core.maze_generator import random_free_cells
+from benchmarks.corpus import build_case
+from benchmarks.load_test import _free_port, frontend_payload, start_server, summarize
+
+
+def build_mice(size: int, mice: int, seed: int):
+    """Maze, mouse payloads and registration message shared by both transports."""
+    case = build_case("rooms", size, seed)
+    cells = random_free_cells(case.labyrinth, mice, random.Random(seed))
+    payloads = [frontend_payload(f"souris{i + 1}", case.labyrinth, cell, case.cheeses) for i, cell in enumerate(cells)]
+    register = {
+        "type": "register",
+        "simulationId": f"bench-{size}-{mice}",
+        "environmentVersion": 1,
+        "environment": payloads[0]["environment"]
+    }
+    return payloads, register
+
+
+async def bench_http(base_url: str, payloads: List[Dict[str, Any]], moves: int) -> List[float]:
+    """Round-trip times (ms) of POST /api/move, each mouse sending its moves in sequence."""
+    latencies: List[float] = []
+    limits = httpx.Limits(max_connections=len(payloads), max_keepalive_connections=len(payloads))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def mouse(payload):
+            body = json.dumps(payload).encode()
+            headers = {"content-type": "application/json"}
+            for _ in range(moves):
+                started = time.perf_counter()
+                response = await client.post("/api/move", content=body, headers=headers)
+                latencies.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+
+        await asyncio.gather(*(mouse(payload) for payload in payloads))
+    return latencies
+
+
+async def bench_websocket(ws_url: str, payloads: List[Dict[str, Any]], register: Dict[str, Any], moves: int) -> List[float]:
+    """Round-trip times (ms) on one WebSocket, all mice sharing the connection."""
+    latencies: List[float] = []
+    request_ids = itertools.count()
+    waiting: Dict[int, asyncio.Future] = {}
+
+    async with websockets.connect(ws_url, max_size=None) as socket:
+        await socket.send(json.dumps(register))
+        json.loads(await socket.recv())
+
+        async def reader():
+            async for frame in socket:
+                message = json.loads(frame)
+                future = waiting.pop(message.get("requestId"), None)
+                if future is not None:
+                    future.set_result(message)
+
+        reading = asyncio.create_task(reader())
+
+        async def mouse(payload):
+            for _ in range(moves):
+                request_id = next(request_ids)
+                future = waiting[request_id] = asyncio.get_running_loop().create_future()
+                started = time.perf_counter()
+                await socket.send(json.dumps({
+                    "requestId": request_id,
+                    "mouseId": payload["mouseId"],
+                    "position": payload["position"]
+                }))
+                message = await future
+                latencies.append((time.perf_counter() - started) * 1000)
+                if message["type"] != "move":
+                    raise RuntimeError(f"Unexpected answer: {message}")
+
+        try:
+            await asyncio.gather(*(mouse(payload) for payload in payloads))
+        finally:
+            reading.cancel()
+    return latencies
+
+
+async def run(port: int, mice_counts: List[int], moves: int, size: int, seed: int) -> List[Dict[str, Any]]:
+    """Run both transports for each number of mice."""
+    results = []
+    for mice in mice_counts:
+        payloads, register = build_mice(size, mice, seed)
+        http = await bench_http(f"http://127.0.0.1:{port}", payloads, moves)
+        ws = await bench_websocket(f"ws://127.0.0.1:{port}/api/ws/move", payloads, register, moves)
+        results.append({
+            "mice": mice,
+            "http_rtt_ms": summarize(http),
+            "websocket_rtt_ms": summarize(ws),
+            "p50_speedup": round(summarize(http)["p50"] / max(summarize(ws)["p50"], 1e-6), 2)
+        })
+    return results
+
+
+def main():
+    """Start the server, run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description="Compare per-move latency on WebSocket and HTTP")
+    parser.add_argument("--mice", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--moves", type=int, default=20, help="Moves per mouse")
+    parser.add_argument("--size", type=int, default=21, help="Maze width and height")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    port = _free_port()
+    process = start_server(port)
+    try:
+        results = asyncio.run(run(port, args.mice, args.moves, args.size, args.seed))
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    report = {"size": args.size, "moves_per_mouse": args.moves, "results": results}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Reproducible maze corpus used by the benchmarks.
+"""
+import random
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+from app.core.maze_generator import (
+    generate_dfs_maze,
+    generate_open_rooms,
+    random_free_cells,
+    seal_cell
+)
+
+MAZE_KINDS = ("dfs", "rooms", "unreachable")
+DEFAULT_SIZES = (11, 31, 51)
+
+
+@dataclass
+class MazeCase:
+    """One benchmark maze with a start, a goal and a set of cheeses."""
+    name: str
+    kind: str
+    size: int
+    labyrinth: List[List[int]]
+    start: List[int]
+    goal: List[int]
+    cheeses: List[List[int]] = field(default_factory=list)
+
+
+def build_case(kind: str, size: int, seed: int, num_cheeses: int = 5) -> MazeCase:
+    """
+    Build one maze case deterministically from its kind, size and seed.
+
+    Args:
+        kind: One of MAZE_KINDS
+        size: Requested width and height
+        seed: Corpus seed
+        num_cheeses: Number of cheeses placed in the maze
+
+    Returns:
+        MazeCase: Generated case
+    """
+    rng = random.Random(f"{seed}:{kind}:{size}")
+
+    if kind == "rooms":
+        labyrinth = generate_open_rooms(size, size, rng)
+    elif kind in ("dfs", "unreachable"):
+        labyrinth = generate_dfs_maze(size, size, rng, loop_factor=0.05)
+    else:
+        raise ValueError(f"Unknown maze kind '{kind}', expected one of {MAZE_KINDS}")
+
+    free_cells = [[x, y] for y, row in enumerate(labyrinth) for x, cell in enumerate(row) if cell == 0]
+    start = free_cells[0]
+    goal = max(free_cells, key=lambda c: abs(c[0] - start[0]) + abs(c[1] - start[1]))
+    cheeses = [goal] + random_free_cells(labyrinth, num_cheeses - 1, rng, exclude=[start, goal])
+
+    if kind == "unreachable":
+        for cheese in cheeses:
+            seal_cell(labyrinth, cheese)
+        # Sealing may have walled the start, move it to a cell that is still free
+        start = next(c for c in free_cells if labyrinth[c[1]][c[0]] == 0 and c not in cheeses)
+
+    return MazeCase(f"{kind}_{size}", kind, len(labyrinth), labyrinth, start, goal, cheeses)
+
+
+def build_corpus(seed: int = 0, sizes: Sequence[int] = DEFAULT_SIZES, kinds: Sequence[str] = MAZE_KINDS) -> List[MazeCase]:
+    """Build every (kind, size) combination of the corpus."""
+    return [build_case(kind, size, seed) for size in sizes for kind in kinds]
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+HTTP load-test harness for /api/move and /api/logs/stream.
+
+Starts the application locally in a subprocess (with an event-loop lag
+probe), replays frontend move payloads at a configurable concurrency while
+SSE clients consume the log stream, and reports throughput, latency
+percentiles, error and fallback rates and event-loop lag.
+
+Everything runs on localhost.
+
+Usage:
+    python -m benchmarks.load_test --concurrency 50 --duration 10 --sse-clients 5
+    python -m benchmarks.load_test --concurrency 200 --tick-ms 100 --payloads exemple.http
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.core.grid import Grid
+from app.core.grid_codec import encode_bitmask, encode_rle
+from benchmarks.corpus import build_case
+
+LAG_PROBE_INTERVAL = 0.01
+FALLBACK_PREFIXES = ("Error occurred", "No cheese found")
+GRID_ENCODERS = {"bitmask": encode_bitmask, "rle": encode_rle}
+
+
+def create_probed_app():
+    """Build the application with an event-loop lag probe and its stats endpoint."""
+    from app.main import create_app
+
+    app = create_app()
+    samples: List[float] = []
+
+    async def probe_lag():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            samples.append(max(0.0, time.perf_counter() - started - LAG_PROBE_INTERVAL))
+
+    @app.get("/__loadtest/lag")
+    async def lag_stats(reset: bool = False) -> Dict[str, Any]:
+        # The probe starts with the first reset, right before the load begins
+        if getattr(app.state, "lag_probe", None) is None:
+            app.state.lag_probe = asyncio.create_task(probe_lag())
+        stats = summarize([s * 1000 for s in samples])
+        if reset:
+            samples.clear()
+        return stats
+
+    return app
+
+
+def serve(port: int) -> None:
+    """Run the probed application (entry point of the server subprocess)."""
+    import uvicorn
+
+    uvicorn.run(create_probed_app(), host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+def summarize(values: List[float]) -> Dict[str, Any]:
+    """Return count, mean and percentiles of a list of values."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def percentile(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 3)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": percentile(50),
+        "p90": percentile(90),
+        "p99": percentile(99),
+        "max": round(ordered[-1], 3)
+    }
+
+
+def frontend_payload(mouse_id: str, labyrinth: List[List[int]], position: List[int], cheeses: List[List[int]], grid_format: str = "cells") -> Dict[str, Any]:
+    """Build a /api/move request body in the frontend format, with the grid in the given wire format."""
+    grid: Any
+    if grid_format == "cells":
+        cheese_cells = {tuple(c) for c in cheeses}
+        grid = [
+            ["wall" if cell == 1 else "cheese" if (x, y) in cheese_cells else "path" for x, cell in enumerate(row)]
+            for y, row in enumerate(labyrinth)
+        ]
+    else:
+        grid = GRID_ENCODERS[grid_format](Grid.from_labyrinth(labyrinth))
+    return {
+        "mouseId": mouse_id,
+        "position": {"x": position[0], "y": position[1]},
+        "environment": {
+            "grid": grid,
+            "width": len(labyrinth[0]),
+            "height": len(labyrinth),
+            "cheesePositions": [{"x": x, "y": y} for x, y in cheeses],
+            "otherMice": [],
+            "walls": [],
+            "paths": []
+        },
+        "mouseState": {"health": 100, "happiness": 50, "energy": 100, "cheeseFound": 0},
+        "availableMoves": ["north", "south", "east", "west"]
+    }
+
+
+def synthetic_payloads(sizes: List[int], mice: int, seed: int, grid_format: str = "cells") -> List[Dict[str, Any]]:
+    """Build frontend payloads on the benchmark maze corpus, one per simulated mouse."""
+    payloads = []
+    for maze, (size, kind) in enumerate((size, kind) for size in sizes for kind in ("dfs", "rooms")):
+        case = build_case(kind, size, seed)
+        free_cells = [[x, y] for y, row in enumerate(case.labyrinth) for x, cell in enumerate(row) if cell == 0]
+        for i in range(mice):
+            position = free_cells[(i * 7919) % len(free_cells)]
+            # Ids are unique across mazes, each mouse keeps its own AI state
+            payloads.append(frontend_payload(f"maze{maze + 1}-souris{i + 1}", case.labyrinth, position, case.cheeses, grid_format))
+    return payloads
+
+
+def load_http_file_payloads(path: str) -> List[Dict[str, Any]]:
+    """
+    Extract the JSON bodies of ``POST .../api/move`` requests from a ``.http`` file.
+
+    Bodies in the legacy shape (``labyrinth``, ``position`` and ``goal`` as
+    lists) are converted to the frontend format, which /api/move requires.
+
+    Args:
+        path: REST client file such as exemple.http
+
+    Returns:
+        List[Dict[str, Any]]: Request bodies
+    """
+    with open(path) as f:
+        content = f.read()
+
+    payloads: List[Dict[str, Any]] = []
+    for block in re.split(r"^###.*$", content, flags=re.MULTILINE):
+        if not re.search(r"^POST\s+\S*/api/move\s*$", block, flags=re.MULTILINE):
+            continue
+        body_start = block.find("{")
+        if body_start >= 0:
+            payloads.append(_frontend_body(json.loads(block[body_start:]), len(payloads)))
+    return payloads
+
+
+def _frontend_body(body: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Convert a legacy move body to the frontend format (other bodies are returned as is)."""
+    if "labyrinth" not in body:
+        return body
+    cheeses = body.get("available_cheeses") or [body["goal"]]
+    return frontend_payload(f"http{index + 1}", body["labyrinth"], body["position"], cheeses)
+
+
+class LoadStats:
+    """Counters collected by the load generator."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.fallbacks = 0
+        self.over_budget = 0
+        self.sse_events = 0
+        self.sse_errors = 0
+        self.client_lag: List[float] = []
+
+
+async def move_worker(client: httpx.AsyncClient, payloads: List[Dict[str, Any]], worker: int, deadline: float, tick: Optional[float], stats: LoadStats):
+    """Send move requests until the deadline, paced at one per tick if requested."""
+    index = worker
+    while time.perf_counter() < deadline:
+        payload = payloads[index % len(payloads)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            response = await client.post("/api/move", json=payload)
+            elapsed = time.perf_counter() - started
+            stats.latencies.append(elapsed * 1000)
+            if response.status_code != 200:
+                stats.errors += 1
+            elif response.json().get("reasoning", "").startswith(FALLBACK_PREFIXES):
+                stats.fallbacks += 1
+        except httpx.HTTPError:
+            elapsed = time.perf_counter() - started
+            stats.errors += 1
+
+        if tick is not None:
+            if elapsed > tick:
+                stats.over_budget += 1
+            else:
+                await asyncio.sleep(tick - elapsed)
+
+
+async def sse_consumer(client: httpx.AsyncClient, deadline: float, stats: LoadStats):
+    """Consume the log stream until the deadline."""
+    try:
+        timeout = max(0.1, deadline - time.perf_counter())
+        async with client.stream("GET", "/api/logs/stream", timeout=None) as response:
+            async def read():
+                async for line in response.aiter_lines():
+                    if line.startswith("data: "):
+                        stats.sse_events += 1
+            await asyncio.wait_for(read(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    except httpx.HTTPError:
+        stats.sse_errors += 1
+
+
+async def client_lag_probe(deadline: float, stats: LoadStats):
+    """Measure the lag of the load generator's own event loop."""
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        stats.client_lag.append(max(0.0, time.perf_counter() - started - LAG_PROBE_INTERVAL) * 1000)
+
+
+async def run_load(base_url: str, payloads: List[Dict[str, Any]], concurrency: int, duration: float, sse_clients: int, tick_ms: Optional[float], probed: bool) -> Dict[str, Any]:
+    """
+    Run the load test against a running server.
+
+    Returns:
+        Dict[str, Any]: Report of the run
+    """
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=concurrency + sse_clients + 2)
+    tick = tick_ms / 1000 if tick_ms else None
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        if probed:
+            await client.get("/__loadtest/lag", params={"reset": True})
+
+        started = time.perf_counter()
+        deadline = started + duration
+        tasks = [move_worker(client, payloads, i, deadline, tick, stats) for i in range(concurrency)]
+        tasks += [sse_consumer(client, deadline, stats) for _ in range(sse_clients)]
+        tasks.append(client_lag_probe(deadline, stats))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+        server_lag = (await client.get("/__loadtest/lag")).json() if probed else None
+
+    requests = len(stats.latencies)
+    return {
+        "config": {
+            "concurrency": concurrency,
+            "duration": duration,
+            "sse_clients": sse_clients,
+            "tick_ms": tick_ms,
+            "payloads": len(payloads)
+        },
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms": summarize(stats.latencies),
+        "error_rate": round(stats.errors / requests, 4) if requests else 0.0,
+        "fallback_rate": round(stats.fallbacks / requests, 4) if requests else 0.0,
+        "over_tick_rate": round(stats.over_budget / requests, 4) if tick and requests else None,
+        "sse": {
+            "clients": sse_clients,
+            "events": stats.sse_events,
+            "events_per_second": round(stats.sse_events / elapsed, 1),
+            "errors": stats.sse_errors
+        },
+        "server_loop_lag_ms": server_lag,
+        "client_loop_lag_ms": summarize(stats.client_lag)
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """Start the probed application in a subprocess and wait until it answers."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.load_test", "--serve", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server process exited during startup")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/health", timeout=1.0).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not start within 20 seconds")
+
+
+def main():
+    """Parse command line arguments and run the load test."""
+    parser = argparse.ArgumentParser(description="Load test /api/move and /api/logs/stream on localhost")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help="Port of the local server (random if 0)")
+    parser.add_argument("--url", help="Target an already running server instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent simulated mice")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds")
+    parser.add_argument("--sse-clients", type=int, default=2)
+    parser.add_argument("--tick-ms", type=float, help="Pace each mouse at one request per tick")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[21, 51])
+    parser.add_argument("--payloads", nargs="*", default=[], help=".http files with extra /api/move bodies")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--grid-format", choices=["cells", *GRID_ENCODERS], default="cells", help="Wire format of the synthetic grids")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    payloads = synthetic_payloads(args.sizes, args.concurrency, args.seed, args.grid_format)
+    for path in args.payloads:
+        payloads.extend(load_http_file_payloads(path))
+
+    process = None
+    if args.url:
+        base_url = args.url
+    else:
+        port = args.port or _free_port()
+        process = start_server(port)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        report = asyncio.run(run_load(
+            base_url, payloads, args.concurrency, args.duration, args.sse_clients, args.tick_ms, probed=process is not None
+        ))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,34 @@
 """
 Script de démarrage du serveur Mouse AI API avec support des variables d'environnement.
 """
+import argparse
 import os
 import sys
 import uvicorn
 from app.core.config import settings
 
-def main():
-    """Démarre le serveur avec la configuration des variables d'environnement."""
+def main(argv=None):
+    """
+    Démarre le serveur avec la configuration des variables d'environnement.
+    
+    ``--production`` désactive le rechargement automatique (qui surveille les
+    fichiers et relance l'application dans un sous-processus, quelle que soit
+    la valeur de DEBUG) et démarre ``WORKERS`` processus.
+    """
+    parser = argparse.ArgumentParser(description="Démarre le serveur Mouse AI API")
+    parser.add_argument("--production", action="store_true", help="Sans rechargement automatique")
+    args = parser.parse_args(argv)
+    reload = settings.DEBUG and not args.production
+    workers = None if reload else settings.WORKERS
     
     print("🚀 Démarrage du serveur Mouse AI API")
     print("=" * 50)
     print(f"📡 Host: {settings.HOST}")
     print(f"🔌 Port: {settings.PORT}")
     print(f"🐛 Debug: {settings.DEBUG}")
+    print(f"🔁 Reload: {reload}")
+    if workers:
+        print(f"👷 Workers: {workers}")
     print(f"🌐 CORS Origins: {settings.CORS_ORIGINS}")
     print(f"📊 Log Level: {settings.LOG_LEVEL}")
     print(f"📝 Max Logs: {settings.MAX_LOGS}")
@@ -25,7 +40,8 @@ def main():
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG,
+        reload=reload,
+        workers=workers,
         log_level=settings.LOG_LEVEL.lower(),
         access_log=True
     )
@@ -0,0 +1,105 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.mouse_ai_service import MouseAIService
+from benchmarks.bench_pathfinding import compare
+from benchmarks.bench_startup import parse_importtime
+from benchmarks.corpus import build_case, build_corpus
+from benchmarks.load_test import load_http_file_payloads, summarize, synthetic_payloads
+
+client = TestClient(app)
+
+
+class TestMazeCorpus:
+    """Test cases for the benchmark maze corpus."""
+
+    def test_corpus_is_reproducible(self):
+        """Test the same seed always builds the same mazes."""
+        first = build_corpus(seed=1, sizes=[11])
+        second = build_corpus(seed=1, sizes=[11])
+
+        assert [c.labyrinth for c in first] == [c.labyrinth for c in second]
+        assert [c.name for c in first] == ["dfs_11", "rooms_11", "unreachable_11"]
+
+    def test_unreachable_case_has_no_route(self):
+        """Test cheeses of the unreachable kind cannot be reached."""
+        case = build_case("unreachable", 15, seed=0)
+        service = MouseAIService("test")
+
+        assert case.labyrinth[case.start[1]][case.start[0]] == 0
+        assert all(service._find_path_astar(case.labyrinth, case.start, c) == [] for c in case.cheeses)
+
+
+class TestRegressionCheck:
+    """Test cases for baseline comparison."""
+
+    def test_reports_metrics_beyond_threshold(self):
+        """Test only metrics above the threshold are reported."""
+        baseline = {"results": [{"target": "t", "case": "c", "wall_ms_median": 1.0, "nodes_expanded": 100, "alloc_peak_bytes": 10}]}
+        current = {"results": [{"target": "t", "case": "c", "wall_ms_median": 1.1, "nodes_expanded": 150, "alloc_peak_bytes": 10}]}
+
+        regressions = compare(current, baseline, threshold=0.2)
+
+        assert len(regressions) == 1
+        assert "nodes_expanded" in regressions[0]
+
+
+class TestLoadTestHelpers:
+    """Test cases for the load-test payloads and statistics."""
+
+    def test_http_file_payloads(self):
+        """Test move bodies are extracted from exemple.http and accepted by /api/move."""
+        payloads = load_http_file_payloads("exemple.http")
+
+        assert len(payloads) == 1 and payloads[0]["mouseId"] == "souris1"
+        response = client.post("/api/move", json=payloads[0])
+        assert response.status_code == 200 and response.json()["move"] in ("east", "south")
+
+    def test_legacy_http_payloads_are_converted(self, tmp_path):
+        """Test legacy labyrinth/position/goal bodies are replayed in the frontend format."""
+        http_file = tmp_path / "legacy.http"
+        http_file.write_text(
+            "POST http://127.0.0.1:8000/api/move\n"
+            "content-type: application/json\n\n"
+            '{"labyrinth": [[0, 0, 1], [0, 1, 0], [0, 0, 0]], "position": [0, 0], "goal": [2, 2]}\n'
+        )
+
+        payloads = load_http_file_payloads(str(http_file))
+
+        assert payloads[0]["position"] == {"x": 0, "y": 0}
+        assert payloads[0]["environment"]["cheesePositions"] == [{"x": 2, "y": 2}]
+        assert client.post("/api/move", json=payloads[0]).status_code == 200
+
+    def test_synthetic_mouse_ids_are_unique_across_mazes(self):
+        """Test each maze gets its own mouse ids, so no AI state is shared between mazes."""
+        payloads = synthetic_payloads([11], mice=3, seed=0)
+
+        ids = [payload["mouseId"] for payload in payloads]
+        assert len(ids) == 6 and len(set(ids)) == 6
+        assert ids[0] == "maze1-souris1" and ids[3] == "maze2-souris1"
+
+    def test_summarize_percentiles(self):
+        """Test latency summary percentiles."""
+        stats = summarize([float(i) for i in range(1, 101)])
+
+        assert stats["count"] == 100
+        assert stats["p50"] == 51.0 and stats["p99"] == 100.0 and stats["max"] == 100.0
+
+
+class TestStartupProfile:
+    """Test cases for the import time profile."""
+
+    def test_parse_importtime(self):
+        """Test -X importtime lines are parsed with their nesting level."""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     app.core.config\n"
+            "import time:      2000 |       2500 |   app.main\n"
+        )
+
+        modules = parse_importtime(stderr)
+
+        assert modules == [
+            {"module": "app.core.config", "self_us": 120, "cumulative_us": 120, "depth": 2},
+            {"module": "app.main", "self_us": 2000, "cumulative_us": 2500, "depth": 1}
+        ]
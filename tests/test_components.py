@@ -0,0 +1,148 @@
+from fastapi.testclient import TestClient
+
+from app.core.grid import Grid
+from app.main import app
+from app.services.components import NO_COMPONENT, ComponentIndex, label_components
+from app.services.distance_fields import PaddedGrid
+from app.services.mouse_ai_service import MouseAIService
+
+# Two rooms split by a wall column, the right one holding a walled-off cell
+GRID = Grid.from_labyrinth([
+    [0, 0, 1, 0, 1],
+    [0, 0, 1, 0, 1],
+    [0, 0, 1, 1, 0]
+])
+
+client = TestClient(app)
+
+
+class TestLabelComponents:
+    """Test cases for the flood fill labeling."""
+
+    def test_labels(self):
+        """Test cells get the same label exactly when a path joins them."""
+        padded = PaddedGrid(GRID)
+        labels, count = label_components(padded)
+
+        assert count == 3
+        left = {labels[padded.index([x, y])] for x in (0, 1) for y in range(3)}
+        right = {labels[padded.index([3, 0])], labels[padded.index([3, 1])]}
+        assert len(left) == 1 and len(right) == 1 and left != right
+        assert labels[padded.index([4, 2])] not in left | right
+        assert labels[padded.index([2, 0])] == NO_COMPONENT
+
+    def test_open_grid(self):
+        """Test a maze without walls is a single component."""
+        assert label_components(PaddedGrid(Grid.from_labyrinth([[0] * 6] * 4)))[1] == 1
+
+
+class TestComponentIndex:
+    """Test cases for the cached labels."""
+
+    def test_connected(self):
+        """Test reachability queries, walls and outside positions included."""
+        index = ComponentIndex()
+
+        assert index.connected(GRID, [0, 0], [1, 2])
+        assert not index.connected(GRID, [0, 0], [3, 0])
+        assert not index.connected(GRID, [3, 1], [4, 2])
+        assert not index.connected(GRID, [2, 0], [2, 1])
+        assert not index.connected(GRID, [0, 0], [9, 9])
+        assert index.component(GRID, [9, 9]) == NO_COMPONENT
+        assert index.stats() == {"layouts": 1, "computed": 1, "hits": 5}
+
+    def test_lru_bound(self):
+        """Test the number of layouts kept is bounded."""
+        index = ComponentIndex(max_layouts=1)
+        index.count(GRID)
+        index.count(Grid.from_labyrinth([[0, 0]]))
+        index.count(GRID)
+
+        assert index.stats()["layouts"] == 1 and index.stats()["computed"] == 3
+
+    def test_unreachable_goal_skips_the_search(self):
+        """Test no node is expanded towards a goal in another component."""
+        service = MouseAIService("test", components=ComponentIndex())
+
+        assert service._find_path(GRID, [0, 0], [3, 0], "astar") == []
+        assert service._search_path_anytime(GRID, [0, 0], [3, 0], 100) == ([], None)
+        assert service.nodes_expanded == 0
+        assert service._find_path(GRID, [0, 0], [1, 2], "astar")[-1] == [1, 2]
+
+
+class TestReachableCheeses:
+    """Test cases for the cheeses and goals filtered by component."""
+
+    def test_nearest_cheese_skips_walled_off_ones(self):
+        """Test a closer cheese in another component is neither searched nor chosen."""
+        searched = []
+
+        class RecordingService(MouseAIService):
+            def _find_path(self, labyrinth, start, goal, strategy):
+                searched.append(goal)
+                return super()._find_path(labyrinth, start, goal, strategy)
+
+        service = RecordingService("test", components=ComponentIndex())
+
+        nearest = service._find_nearest_cheese([1, 0], [[3, 0], [4, 2], [0, 2]], GRID)
+
+        assert nearest == [0, 2] and searched == [[0, 2]]
+        assert service._find_nearest_cheese([1, 0], [[3, 0], [4, 2]], GRID) is None
+
+    def test_unreachable_goal_is_replaced(self):
+        """Test the mouse heads for a reachable cheese instead of an unreachable goal."""
+        service = MouseAIService("test", components=ComponentIndex())
+
+        next_position = service.calculate_next_position(GRID, [1, 0], [3, 0], available_cheeses=[[3, 0], [1, 2]])
+
+        assert next_position == [1, 1]
+        assert service.last_path[-1] == [1, 2]
+
+    def test_nearest_valid_position_reaches_the_goal(self):
+        """Test a mouse on a wall is moved to a cell from which the goal can be reached."""
+        service = MouseAIService("test", components=ComponentIndex())
+
+        assert service._find_nearest_valid_position([2, 1], GRID, [3, 0]) == [3, 1]
+        assert service._find_nearest_valid_position([2, 1], GRID, [0, 0]) == [1, 1]
+        assert MouseAIService("test")._find_nearest_valid_position([2, 1], GRID, [0, 0]) == [3, 1]
+
+    def test_no_valid_position_in_another_component(self):
+        """Test free cells that cannot reach the goal are not used, and the mouse stays."""
+        corridor = Grid.from_labyrinth([[0, 1, 1, 1, 1, 1, 1, 0, 1, 0]])
+        service = MouseAIService("test", components=ComponentIndex())
+
+        assert service._find_nearest_valid_position([8, 0], corridor, [0, 0]) is None
+        assert service.calculate_next_position(corridor, [8, 0], [0, 0]) == [8, 0]
+        assert service._find_nearest_valid_position([8, 0], corridor, [9, 0]) == [9, 0]
+
+
+class TestRouteCheeses:
+    """Test cases for the cheeses POST /api/move targets."""
+
+    @staticmethod
+    def _request(mouse_id, x, y, cheeses):
+        cells = [["wall" if cell else "path" for cell in row] for row in GRID]
+        return {
+            "mouseId": mouse_id,
+            "position": {"x": x, "y": y},
+            "environment": {"grid": cells, "cheesePositions": [{"x": cx, "y": cy} for cx, cy in cheeses]}
+        }
+
+    def test_walled_off_cheeses_are_not_targeted(self):
+        """Test a mouse whose cheeses are all walled off explores instead of heading for one."""
+        data = client.post("/api/move", json=self._request("walled1", 1, 0, [[3, 0], [4, 2]])).json()
+
+        assert data["reasoning"] == "No reachable cheese, exploring"
+        assert data["move"] in ("south", "west") and data["strategy"] is None
+
+    def test_boxed_in_mouse_stays(self):
+        """Test a mouse in a one-cell component stays in place."""
+        data = client.post("/api/move", json=self._request("walled2", 4, 2, [[0, 0]])).json()
+
+        assert data["reasoning"] == "No reachable cheese, staying in place"
+
+    def test_mouse_on_wall_keeps_every_cheese(self):
+        """Test a mouse without a component still heads for a cheese."""
+        data = client.post("/api/move", json=self._request("walled3", 2, 0, [[3, 0]])).json()
+
+        assert "towards cheese at (3, 0)" in data["reasoning"]
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.core.grid import Grid
+from app.main import create_app
+from app.services.container import ServiceContainer, load_mazes
+from app.services.distance_fields import DistanceFieldStore
+from app.services.log_service import LogService
+from app.services.path_trees import PathTreeStore
+
+ENVIRONMENT = {"grid": [["path"] * 5, ["path", "wall", "wall", "wall", "path"]], "cheesePositions": [{"x": 4, "y": 1}]}
+
+
+class FakeService:
+    """Background service recording its lifecycle calls."""
+
+    def __init__(self, calls, name):
+        self.calls = calls
+        self.name = name
+
+    def start(self):
+        self.calls.append(f"start {self.name}")
+
+    def stop(self):
+        self.calls.append(f"stop {self.name}")
+
+
+def _container(**kwargs):
+    return ServiceContainer(LogService(max_logs=100), PathTreeStore(), DistanceFieldStore(), **kwargs)
+
+
+class TestServiceContainer:
+    """Test cases for the service lifecycle."""
+
+    def test_load_mazes(self, tmp_path):
+        """Test environments and request bodies are read, invalid files skipped."""
+        (tmp_path / "a.json").write_text(json.dumps(ENVIRONMENT))
+        (tmp_path / "b.json").write_text(json.dumps({"position": {"x": 0, "y": 0}, "environment": ENVIRONMENT}))
+        (tmp_path / "broken.json").write_text("{")
+        (tmp_path / "notes.txt").write_text("ignored")
+
+        mazes = load_mazes(str(tmp_path))
+
+        assert [maze[0] for maze in mazes] == ["a.json", "b.json"]
+        name, grid, cheeses, starts = mazes[1]
+        assert isinstance(grid, Grid) and cheeses == [[4, 1]] and starts == [[0, 0]]
+
+    def test_warm_fills_the_caches(self, tmp_path):
+        """Test warmed distance fields and path trees are cache hits afterwards."""
+        (tmp_path / "maze.json").write_text(json.dumps({"position": {"x": 0, "y": 0}, "environment": ENVIRONMENT}))
+        container = _container(warm_dir=str(tmp_path))
+
+        asyncio.run(container.start())
+
+        assert container.warm_stats["mazes"] == 1 and container.warm_stats["path_trees"] == 1
+        grid = load_mazes(str(tmp_path))[0][1]
+        assert container.path_trees.path(grid, [0, 0], [4, 1]) == [[0, 0], [1, 0], [2, 0], [3, 0], [4, 0], [4, 1]]
+        assert container.path_trees.stats()["built"] == 1 and container.path_trees.stats()["hits"] == 1
+        container.distance_fields.field(grid, [4, 1])
+        assert container.distance_fields.stats()["hits"] == 1
+
+    def test_background_services_order(self):
+        """Test services are started in order and stopped in reverse order."""
+        calls = []
+        container = _container(background=[FakeService(calls, "a"), FakeService(calls, "b")])
+
+        asyncio.run(container.start())
+        assert container.started
+        asyncio.run(container.stop())
+
+        assert calls == ["start a", "start b", "stop b", "stop a"]
+        assert not container.started
+
+    def test_stop_flushes_pending_logs(self):
+        """Test logs queued before shutdown are stored."""
+        container = _container()
+        container.log_service.add_custom_log("last words")
+
+        asyncio.run(container.stop())
+
+        assert container.log_service.get_recent_logs(1)[0]["message"] == "last words"
+
+    def test_application_lifespan(self):
+        """Test the application starts and stops its container."""
+        app = create_app()
+        with TestClient(app) as client:
+            assert app.state.services.started
+            assert client.get("/api/health").status_code == 200
+        assert not app.state.services.started
@@ -0,0 +1,135 @@
+import itertools
+import random
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.grid import Grid
+from app.main import app
+from app.services.coordinator import CheeseCoordinator, hungarian
+from app.services.distance_fields import UNREACHABLE, DistanceFieldStore
+from app.services.simulation import Simulation
+
+client = TestClient(app)
+
+LABYRINTH = [
+    [0, 0, 0, 0, 0],
+    [0, 1, 1, 1, 0],
+    [0, 0, 0, 1, 0],
+    [1, 1, 0, 1, 1]
+]
+
+
+class TestDistanceFields:
+    """Test cases for cached BFS distance fields."""
+
+    def test_distance_matrix(self):
+        """Test maze distances, walls and unreachable cells."""
+        store = DistanceFieldStore()
+        grid = Grid.from_labyrinth(LABYRINTH)
+
+        matrix = store.distance_matrix(grid, [[0, 0], [2, 3], [1, 1], [9, 9]], [[4, 0], [2, 2]])
+
+        assert matrix.tolist() == [[4, 4], [9, 1], [UNREACHABLE] * 2, [UNREACHABLE] * 2]
+        store.distance_matrix(grid, [[0, 0]], [[4, 0]])
+        assert store.stats()["computed"] == 2
+
+    def test_rebase_keeps_unaffected_fields(self):
+        """Test only fields the changed cells can affect are dropped."""
+        store = DistanceFieldStore()
+        grid = Grid.from_labyrinth([[0, 0, 1, 0], [0, 0, 1, 0]])
+        store.distance_matrix(grid, [[0, 0]], [[0, 0], [3, 0]])
+
+        # A new wall in the left region only affects the field of the left cheese
+        assert store.rebase(grid.digest, "closed", [(1, 1, True)]) == 1
+        assert store.stats()["fields"] == 1
+        # Opening the separating wall may give the right cheese shorter paths
+        assert store.rebase("closed", "opened", [(2, 0, False)]) == 1
+        assert store.stats()["fields"] == 0
+
+
+class TestHungarian:
+    """Test cases for the NumPy assignment solver."""
+
+    def test_matches_brute_force(self):
+        """Test optimal assignments on small random matrices."""
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            rows = int(rng.integers(1, 5))
+            columns = int(rng.integers(rows, 6))
+            cost = rng.integers(0, 20, (rows, columns)).astype(float)
+
+            assignment = hungarian(cost)
+
+            best = min(
+                sum(cost[r, p[r]] for r in range(rows))
+                for p in itertools.permutations(range(columns), rows)
+            )
+            assert len(set(assignment.tolist())) == rows
+            assert sum(cost[r, assignment[r]] for r in range(rows)) == best
+
+
+class TestCheeseCoordinator:
+    """Test cases for cooperative cheese assignment."""
+
+    grid = Grid.from_labyrinth([[0] * 6])
+
+    def test_mice_get_distinct_cheeses(self):
+        """Test two mice near the same cheese are split up."""
+        coordinator = CheeseCoordinator()
+
+        goals = coordinator.assign(self.grid, {"a": [1, 0], "b": [2, 0]}, [[0, 0], [5, 0]])
+
+        assert goals == {"a": [0, 0], "b": [5, 0]}
+
+    def test_more_mice_than_cheeses(self):
+        """Test extra mice fall back to their nearest cheese."""
+        coordinator = CheeseCoordinator()
+
+        goals = coordinator.assign(self.grid, {"a": [1, 0], "b": [2, 0], "c": [4, 0]}, [[0, 0]])
+
+        assert goals == {"a": [0, 0], "b": [0, 0], "c": [0, 0]}
+
+    def test_unreachable_mouse_has_no_goal(self):
+        """Test a walled-in mouse gets no goal."""
+        coordinator = CheeseCoordinator()
+        grid = Grid.from_labyrinth([[0, 1, 0, 0]])
+
+        goals = coordinator.assign(grid, {"a": [0, 0], "b": [2, 0]}, [[3, 0]])
+
+        assert goals == {"b": [3, 0]}
+
+    def test_scales_to_many_mice(self):
+        """Test 60 mice and 60 cheeses all get distinct goals."""
+        labyrinth = [[0] * 30 for _ in range(30)]
+        cells = random.Random(0).sample([[x, y] for y in range(30) for x in range(30)], 120)
+        mice = {f"m{i}": cell for i, cell in enumerate(cells[:60])}
+
+        goals = CheeseCoordinator().assign(Grid.from_labyrinth(labyrinth), mice, cells[60:])
+
+        assert len({tuple(goal) for goal in goals.values()}) == 60
+
+    def test_coordinated_simulation(self):
+        """Test a coordinated simulation eats every cheese."""
+        simulation = Simulation(LABYRINTH, [[4, 2], [2, 3]], {"m1": [0, 0], "m2": [4, 0]}, coordinator=CheeseCoordinator())
+
+        summary = simulation.run(max_ticks=30)
+
+        assert summary["cheeses_left"] == 0
+        assert simulation.tick < 30
+
+    def test_route_uses_other_mice(self):
+        """Test /api/move targets the assigned cheese when other mice are listed."""
+        payload = {
+            "mouseId": "souris21",
+            "position": {"x": 2, "y": 0},
+            "environment": {
+                "grid": [["path"] * 6],
+                "cheesePositions": [{"x": 0, "y": 0}, {"x": 5, "y": 0}],
+                "otherMice": [{"id": "souris22", "position": {"x": 1, "y": 0}}]
+            }
+        }
+
+        response = client.post("/api/move", json=payload)
+
+        assert response.json()["move"] == "east"
@@ -0,0 +1,186 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.grid import Grid
+from app.main import app
+from app.services.environment_store import EnvironmentStore, ResyncNeeded
+from app.services.mouse_ai_service import MouseAIService
+from app.services.path_cache import PathCache
+
+client = TestClient(app)
+
+LABYRINTH = [
+    [0, 0, 0, 0],
+    [0, 1, 1, 0],
+    [0, 0, 0, 0]
+]
+
+
+class TestPathCache:
+    """Test cases for the shared path cache."""
+
+    path = [[0, 0], [1, 0], [2, 0], [3, 0], [3, 1]]
+
+    def test_suffix_lookup(self):
+        """Test any cell of a cached path gets the remaining path."""
+        cache = PathCache()
+        cache.put("layout", [0, 0], [3, 1], self.path)
+
+        assert cache.get("layout", [2, 0], [3, 1]) == [[2, 0], [3, 0], [3, 1]]
+        assert cache.get("layout", [0, 1], [3, 1]) is None
+        assert cache.get("other", [0, 0], [3, 1]) is None
+
+    def test_rebase_drops_only_affected_paths(self):
+        """Test closed cells on a path and shortcuts invalidate, other paths are carried over."""
+        cache = PathCache()
+        cache.put("old", [0, 0], [3, 1], self.path)
+        cache.put("old", [0, 0], [0, 2], [[0, 0], [0, 1], [0, 2]])
+        cache.put("old", [0, 0], [2, 2], [])
+
+        dropped = cache.rebase("old", "new", [(2, 0, True)])
+
+        assert dropped == 1
+        assert cache.get("new", [0, 0], [3, 1]) is None
+        assert cache.get("new", [0, 0], [0, 2]) == [[0, 0], [0, 1], [0, 2]]
+        assert cache.get("new", [0, 0], [2, 2]) == []
+
+    def test_rebase_opened_cell(self):
+        """Test a freed cell only drops paths it could shorten and unreachable results."""
+        cache = PathCache()
+        cache.put("old", [0, 0], [3, 1], self.path)
+        cache.put("old", [0, 0], [0, 2], [[0, 0], [0, 1], [0, 2]])
+        cache.put("old", [0, 0], [2, 2], [])
+
+        dropped = cache.rebase("old", "new", [(1, 1, False)])
+
+        assert dropped == 0
+        assert cache.get("new", [0, 0], [3, 1]) == self.path
+        assert cache.get("new", [0, 0], [2, 2]) is None
+
+        long_path = [[0, 0], [0, 1], [0, 2], [1, 2], [2, 2]]
+        cache.put("new", [0, 0], [2, 2], long_path)
+        assert cache.rebase("new", "newer", [(1, 1, False)]) == 0
+        cache.put("newer", [1, 0], [1, 2], [[1, 0], [0, 0], [0, 1], [0, 2], [1, 2]])
+        assert cache.rebase("newer", "newest", [(1, 1, False)]) == 1
+
+    def test_service_uses_cache_for_grids(self):
+        """Test the AI service reuses cached paths on Grid labyrinths."""
+        cache = PathCache()
+        service = MouseAIService("m1", path_cache=cache)
+        grid = Grid.from_labyrinth(LABYRINTH)
+
+        first = service._find_path_astar(grid, [0, 0], [3, 2])
+        expanded = service.nodes_expanded
+        assert service._find_path_astar(grid, first[1], [3, 2]) == first[1:]
+        assert service.nodes_expanded == expanded
+
+
+class TestEnvironmentStore:
+    """Test cases for versioned environments."""
+
+    def test_apply_diffs(self):
+        """Test diffs update walls and cheeses and bump the version."""
+        store = EnvironmentStore()
+        store.put("sim", 1, Grid.from_labyrinth(LABYRINTH), [[3, 2]])
+
+        session = store.apply_diffs("sim", 1, 2, [(1, 1, "path"), (3, 2, "path"), (0, 2, "cheese")])
+
+        assert session.version == 2
+        assert [list(row) for row in session.grid] == [[0, 0, 0, 0], [0, 0, 1, 0], [0, 0, 0, 0]]
+        assert session.cheese_positions() == [[0, 2]]
+
+    def test_version_mismatch_needs_resync(self):
+        """Test unknown simulations and stale bases raise ResyncNeeded."""
+        store = EnvironmentStore()
+        with pytest.raises(ResyncNeeded):
+            store.apply_diffs("sim", 1, 2, [])
+
+        store.put("sim", 5, Grid.from_labyrinth(LABYRINTH), [])
+        with pytest.raises(ResyncNeeded) as excinfo:
+            store.apply_diffs("sim", 3, 4, [])
+        assert excinfo.value.server_version == 5
+
+    def test_same_update_applied_once(self):
+        """Test several mice sending the same turn update is accepted."""
+        store = EnvironmentStore()
+        store.put("sim", 1, Grid.from_labyrinth(LABYRINTH), [])
+
+        first = store.apply_diffs("sim", 1, 2, [(1, 1, "path")])
+
+        assert store.apply_diffs("sim", 1, 2, [(1, 1, "path")]) is first
+
+    def test_diffs_rebase_path_cache(self):
+        """Test layout changes invalidate the shared path cache cell by cell."""
+        store = EnvironmentStore()
+        grid = Grid.from_labyrinth(LABYRINTH)
+        store.put("sim", 1, grid, [])
+        store.path_cache.put(grid.digest, [0, 0], [0, 2], [[0, 0], [0, 1], [0, 2]])
+        store.path_cache.put(grid.digest, [0, 0], [3, 0], [[0, 0], [1, 0], [2, 0], [3, 0]])
+
+        session = store.apply_diffs("sim", 1, 2, [(2, 0, "wall")])
+
+        assert store.path_cache.get(session.grid.digest, [0, 0], [0, 2]) == [[0, 0], [0, 1], [0, 2]]
+        assert store.path_cache.get(session.grid.digest, [0, 0], [3, 0]) is None
+
+    def test_diff_outside_grid(self):
+        """Test out-of-grid diffs are rejected."""
+        store = EnvironmentStore()
+        store.put("sim", 1, Grid.from_labyrinth(LABYRINTH), [])
+
+        with pytest.raises(ValueError):
+            store.apply_diffs("sim", 1, 2, [(9, 0, "wall")])
+
+
+class TestDeltaMoveEndpoint:
+    """Test cases for delta updates on /api/move."""
+
+    grid = [["path", "path", "path"], ["wall", "wall", "path"], ["cheese", "path", "path"]]
+
+    def test_full_then_diff(self):
+        """Test a diff request moves on the environment held by the server."""
+        full = {
+            "mouseId": "souris7",
+            "simulationId": "delta-test",
+            "environmentVersion": 1,
+            "position": {"x": 0, "y": 0},
+            "environment": {"grid": self.grid, "cheesePositions": [{"x": 0, "y": 2}]}
+        }
+        response = client.post("/api/move", json=full)
+        assert response.json()["environmentVersion"] == 1
+        assert response.json()["move"] == "east"
+
+        # The wall below opens: the cheese is now straight south
+        delta = {
+            "mouseId": "souris7",
+            "simulationId": "delta-test",
+            "environmentVersion": 2,
+            "position": {"x": 0, "y": 0},
+            "environment": {"cellDiffs": [{"x": 0, "y": 1, "cell": "path"}]}
+        }
+        response = client.post("/api/move", json=delta)
+
+        assert response.status_code == 200
+        assert response.json()["gridFormat"] == "delta"
+        assert response.json()["environmentVersion"] == 2
+        assert response.json()["move"] == "south"
+
+    def test_resync_needed(self):
+        """Test a diff on an unknown version gets an explicit resync status."""
+        payload = {
+            "mouseId": "souris8",
+            "simulationId": "never-sent",
+            "environmentVersion": 4,
+            "environment": {"cellDiffs": []}
+        }
+
+        response = client.post("/api/move", json=payload)
+
+        assert response.status_code == 409
+        assert response.json()["status"] == "resync_needed"
+        assert response.json()["environmentVersion"] is None
+
+    def test_diffs_require_version(self):
+        """Test diffs without simulation and version are rejected."""
+        response = client.post("/api/move", json={"environment": {"cellDiffs": []}})
+
+        assert response.status_code == 422
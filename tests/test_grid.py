@@ -0,0 +1,207 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.grid import Grid
+from app.core.grid_codec import (
+    decode_bitmask, decode_encoded_grid, decode_grid_span, decode_rle, encode_bitmask, encode_rle, loads_with_grid, split_grid
+)
+from app.main import app
+
+client = TestClient(app)
+
+CELLS = [
+    ["path", "wall", "cheese"],
+    ["wall", "path", "path"]
+]
+
+
+def _large_body(cells, **extra):
+    """Build a move body big enough for the byte-level grid decoder."""
+    grid = [row * 400 for row in cells] * 20
+    body = {"mouseId": "souris1", "position": {"x": 0, "y": 0}, "environment": {"grid": grid, "width": len(grid[0])}}
+    body.update(extra)
+    return grid, body
+
+
+class TestGrid:
+    """Test cases for the compact grid."""
+
+    def test_from_cells_behaves_like_labyrinth(self):
+        """Test a decoded grid indexes like a List[List[int]] labyrinth."""
+        grid = Grid.from_cells(CELLS)
+
+        assert (grid.width, grid.height) == (3, 2)
+        assert [list(row) for row in grid] == [[0, 1, 0], [1, 0, 0]]
+        assert grid[1][0] == 1
+        assert grid.to_cells()[0] == ["path", "wall", "path"]
+
+    def test_digest_depends_on_layout(self):
+        """Test the digest identifies the layout and its shape."""
+        grid = Grid.from_cells(CELLS)
+
+        assert grid.digest == Grid.from_labyrinth([[0, 1, 0], [1, 0, 0]]).digest
+        assert grid.digest != Grid.from_labyrinth([[0, 1, 0, 1, 0, 0]]).digest
+
+    def test_rows_must_have_same_width(self):
+        """Test ragged rows are rejected."""
+        with pytest.raises(ValueError):
+            Grid([b"\x00\x01", b"\x00"])
+
+
+class TestGridCodec:
+    """Test cases for the byte-level grid decoder."""
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_decode_matches_json(self, indent):
+        """Test the decoded grid matches the regular JSON decoding."""
+        span = json.dumps(CELLS, indent=indent).encode()
+
+        assert decode_grid_span(span) == Grid.from_cells(CELLS)
+
+    @pytest.mark.parametrize("span", [
+        b'[["wall","pa\\"th"]]',
+        b'[["wall","path"],["wall"]]',
+        b'[["wall",1]]',
+        b'[["wall","path"]',
+    ])
+    def test_decode_rejects_unusual_grids(self, span):
+        """Test escapes, ragged rows and non-string cells are left to the JSON decoder."""
+        assert decode_grid_span(span) is None
+
+    def test_split_grid_replaces_grid_with_null(self):
+        """Test the grid span is cut out of the body."""
+        rest, grid = split_grid(b'{"environment": {"grid": [["wall"]], "width": 1}}')
+
+        assert json.loads(rest) == {"environment": {"grid": None, "width": 1}}
+        assert grid == Grid([b"\x01"])
+
+    def test_loads_with_grid_large_body(self):
+        """Test a large body gets its grid decoded from the bytes."""
+        grid, body = _large_body(CELLS)
+
+        data = loads_with_grid(json.dumps(body).encode())
+
+        assert isinstance(data["environment"]["grid"], Grid)
+        assert data["environment"]["grid"] == Grid.from_cells(grid)
+        assert data["environment"]["width"] == len(grid[0])
+
+    def test_loads_with_grid_falls_back(self):
+        """Test bodies outside the fast path decode exactly like json.loads."""
+        _, body = _large_body(CELLS, note='"grid": [["wall"]]')
+        body["environment"]["grid"][0][0] = 'wa"ll'
+        raw = json.dumps(body).encode()
+
+        assert loads_with_grid(raw) == json.loads(raw)
+        assert loads_with_grid(b'{"environment": {"grid": [["wall"]]}}') == {"environment": {"grid": [["wall"]]}}
+
+    def test_loads_with_grid_only_replaces_environment_grid(self):
+        """Test grid arrays of other fields are never decoded as the maze."""
+        grid, _ = _large_body(CELLS)
+        before = {"mouseState": {"grid": grid}, "environment": {"grid": None, "cellDiffs": []}}
+        nested = {"environment": {"otherMice": [{"grid": grid}], "grid": None, "cellDiffs": []}}
+
+        for body in (before, nested):
+            raw = json.dumps(body).encode()
+            assert loads_with_grid(raw) == json.loads(raw)
+
+
+class TestCompactGridFormats:
+    """Test cases for the bitmask and RLE grid encodings."""
+
+    labyrinth = [[0, 1, 1, 0, 0], [1, 0, 0, 0, 1], [0, 0, 0, 0, 0]]
+
+    @pytest.mark.parametrize("encode", [encode_bitmask, encode_rle])
+    def test_round_trip(self, encode):
+        """Test encoded grids decode back to the same layout."""
+        grid = Grid.from_labyrinth(self.labyrinth)
+
+        assert decode_encoded_grid(encode(grid)) == grid
+
+    def test_known_encodings(self):
+        """Test the documented bit order and run layout."""
+        assert encode_bitmask(Grid.from_labyrinth(self.labyrinth))["data"] == "ZEA="
+        assert encode_rle(Grid.from_labyrinth(self.labyrinth))["rows"] == ["1,2,2", "0,1,3,1", "5"]
+        assert decode_rle(3, 1, ["0,3"]) == Grid([b"\x01\x01\x01"])
+
+    @pytest.mark.parametrize("decode", [
+        lambda: decode_bitmask(5, 3, "not base64!"),
+        lambda: decode_bitmask(5, 3, "ZEAAAA=="),
+        lambda: decode_rle(5, 3, ["1,2,2", "5"]),
+        lambda: decode_rle(5, 3, ["1,2,2", "1,,4", "5"]),
+        lambda: decode_rle(5, 3, ["1,2,2", "1,4,1", "5"]),
+        lambda: decode_rle(5, 3, ["1,2,2", "-1,6", "5"]),
+        lambda: decode_encoded_grid({"format": "png", "width": 1, "height": 1}),
+    ])
+    def test_invalid_encodings(self, decode):
+        """Test inconsistent payloads are rejected."""
+        with pytest.raises(ValueError):
+            decode()
+
+
+class TestFrontendMoveEndpoint:
+    """Test cases for /api/move with the frontend payload."""
+
+    @pytest.mark.parametrize("repeat", [1, 60])
+    def test_move_towards_cheese(self, repeat):
+        """Test the mouse heads to the cheese with small and large grids."""
+        grid = [["path", "path", "cheese"] + ["wall"] * (repeat - 1) * 3] * 3
+        payload = {
+            "mouseId": "souris1",
+            "position": {"x": 0, "y": 0},
+            "environment": {"grid": grid * repeat, "cheesePositions": [{"x": 2, "y": 0}]},
+            "availableMoves": ["north", "south", "east", "west"]
+        }
+
+        response = client.post("/api/move", json=payload)
+
+        assert response.status_code == 200
+        assert response.json()["mouseId"] == "souris1"
+        assert response.json()["move"] == "east"
+
+    @pytest.mark.parametrize("encode", [encode_bitmask, encode_rle])
+    def test_move_with_compact_grid(self, encode):
+        """Test compact grids are accepted and reported in the response."""
+        grid = encode(Grid.from_labyrinth([[0, 0, 0], [1, 1, 0], [0, 0, 0]]))
+        payload = {
+            "mouseId": "souris2",
+            "position": {"x": 0, "y": 0},
+            "environment": {"grid": grid, "cheesePositions": [{"x": 0, "y": 2}]}
+        }
+
+        response = client.post("/api/move", json=payload)
+
+        assert response.status_code == 200
+        assert response.json()["move"] == "east"
+        assert response.json()["gridFormat"] == grid["format"]
+
+    def test_cells_grid_format_reported(self):
+        """Test the string grid is reported as cells."""
+        payload = {"environment": {"grid": CELLS, "cheesePositions": [{"x": 2, "y": 0}]}}
+
+        assert client.post("/api/move", json=payload).json()["gridFormat"] == "cells"
+
+    def test_invalid_compact_grid_returns_422(self):
+        """Test a malformed compact grid is rejected by validation."""
+        payload = {"environment": {"grid": {"format": "rle", "width": 2, "height": 1, "rows": ["3"]}}}
+
+        assert client.post("/api/move", json=payload).status_code == 422
+
+    @pytest.mark.parametrize("grid", [
+        {"format": "rle", "width": 200000000, "height": 1, "rows": ["200000000"]},
+        {"format": "rle", "width": 1, "height": 200000000, "rows": []},
+        {"format": "bitmask", "width": 101, "height": 2, "data": ""},
+        {"format": "rle", "width": 2, "height": 1, "rows": ["9223372036854775807,2"]}
+    ])
+    def test_oversized_compact_grid_returns_422(self, grid):
+        """Test declared sizes beyond MAX_LABYRINTH_SIZE are rejected before decoding."""
+        payload = {"mouseId": "souris1", "position": {"x": 0, "y": 0}, "environment": {"grid": grid}}
+
+        assert client.post("/api/move", json=payload).status_code == 422
+
+    def test_invalid_payload_returns_422(self):
+        """Test malformed requests are rejected by validation."""
+        response = client.post("/api/move", json={"position": {"x": "a"}})
+
+        assert response.status_code == 422
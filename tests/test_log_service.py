@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import os
+import threading
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from app.core.serialization import Timestamp
+from app.main import app
+from app.services import log_service as log_service_module
+from app.services.log_service import LogService
+from app.services.log_subscriber import LogSubscriber
+
+
+@pytest.fixture
+def service():
+    """Log service whose capture handler is removed after the test."""
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    service = LogService(max_logs=500)
+    service.install_handler()
+    yield service
+    root.handlers = handlers
+
+
+class TestLogQueue:
+    """Test cases for the background log ingestion queue."""
+
+    def test_custom_logs_are_built_by_the_consumer(self, service):
+        """Test queued logs are stored with their timestamp and extra fields."""
+        service.add_custom_log("hello", level="DEBUG", mouse_id="souris1")
+
+        assert service.flush()
+        entry = service.get_recent_logs(1)[0]
+        assert entry["type"] == "custom"
+        assert entry["message"] == "hello" and entry["level"] == "DEBUG"
+        assert entry["mouse_id"] == "souris1"
+        assert entry["thread_id"] == threading.get_ident()
+        assert "T" in str(entry["timestamp"])
+        assert service.get_stats()["newest_log_ns"] == entry["timestamp"].ns
+
+    def test_many_producers(self, service):
+        """Test no entry is lost with concurrent producers."""
+        def produce(n):
+            for i in range(20):
+                service.add_custom_log(f"{n}-{i}")
+
+        threads = [threading.Thread(target=produce, args=(n,)) for n in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert service.flush()
+        expected = {f"{n}-{i}" for n in range(5) for i in range(20)}
+        messages = [entry["message"] for entry in service.get_recent_logs(500) if entry["message"] in expected]
+        assert sorted(messages) == sorted(expected)
+        assert service.get_stats()["pending_logs"] == 0
+
+    def test_records_are_captured(self, service):
+        """Test logging records go through the queue."""
+        logging.getLogger("tests.log_queue").warning("captured %s", 42)
+
+        assert service.flush()
+        entry = service.get_recent_logs(1)[0]
+        assert entry["type"] == "log" and entry["message"] == "captured 42"
+
+    def test_subscribers_receive_batches_on_their_loop(self, service):
+        """Test entries are delivered to a subscriber's buffer on its loop."""
+        async def subscribe():
+            subscriber = LogSubscriber(asyncio.get_running_loop())
+            service.subscribers.append(subscriber)
+            threading.Thread(target=service.add_custom_log, args=("live",)).start()
+            while True:
+                entry = await asyncio.wait_for(subscriber.get(), timeout=5.0)
+                if entry["message"] == "live":
+                    return entry
+
+        assert asyncio.run(subscribe())["message"] == "live"
+
+    def test_queue_is_bounded_when_the_consumer_stalls(self, monkeypatch):
+        """Test logs beyond the queue capacity are dropped and counted, flush markers are not."""
+        service = LogService(max_pending=3)
+        monkeypatch.setattr(service, "_start_consumer", lambda: None)  # Consumer stalled
+
+        for i in range(5):
+            service.add_custom_log(f"log {i}")
+        assert not service.flush(timeout=0.01)
+
+        assert len(service._pending) == 4 and isinstance(service._pending[-1], threading.Event)
+        assert service.get_stats()["dropped_logs"] == 2
+
+    def test_inline_mode(self):
+        """Test logs are published immediately without the consumer."""
+        service = LogService(background=False)
+        service.add_custom_log("now")
+
+        assert service.get_recent_logs(1)[0]["message"] == "now"
+        assert service._consumer is None
+
+    def test_handler_is_installed_explicitly(self):
+        """Test creating the service leaves the root logger alone until installed."""
+        root = logging.getLogger()
+        handlers = list(root.handlers)
+        try:
+            service = LogService()
+            assert root.handlers == handlers
+
+            service.install_handler()
+            service.install_handler()
+            assert len(root.handlers) == len(handlers) + 1
+        finally:
+            root.handlers = handlers
+
+    def test_stats_do_not_format_timestamps(self):
+        """Test stats report the raw nanosecond timestamps, which jsonable_encoder accepts."""
+        service = LogService(background=False)
+        service.add_custom_log("first")
+        service.add_custom_log("last")
+        oldest, newest = (entry["timestamp"] for entry in service.get_recent_logs(2))
+
+        stats = jsonable_encoder(service.get_stats())
+
+        assert stats["oldest_log_ns"] == oldest.ns and stats["newest_log_ns"] == newest.ns
+        assert "oldest_log" not in stats and "newest_log" not in stats
+
+    def test_fork_hook_is_registered_once(self, monkeypatch):
+        """Test services do not register a fork hook each, and are reset by the module hook."""
+        registered = []
+        monkeypatch.setattr(os, "register_at_fork", lambda **hooks: registered.append(hooks), raising=False)
+        service = LogService()
+        service.add_custom_log("before fork")
+        assert service.flush()
+
+        log_service_module._reset_after_fork()
+
+        assert registered == [] and service in log_service_module._services
+        assert service._consumer is None and not service._pending
+
+
+def _entry(message, mouse_id=None):
+    entry = {"type": "custom", "message": message, "timestamp": Timestamp.now()}
+    if mouse_id is not None:
+        entry["mouse_id"] = mouse_id
+    return entry
+
+
+async def _drain(subscriber):
+    events = []
+    while len(subscriber) or subscriber._gap:
+        events.append(await subscriber.get())
+    return events
+
+
+class TestBackpressurePolicies:
+    """Test cases for the per-subscriber buffers of the log stream."""
+
+    def test_drop_oldest_reports_gap(self):
+        """Test a full buffer keeps the newest entries and announces the gap."""
+        async def run():
+            subscriber = LogSubscriber(asyncio.get_running_loop(), maxsize=3)
+            subscriber.deliver([_entry(str(i)) for i in range(5)])
+            assert subscriber.stats()["queue_depth"] == 3
+            assert subscriber.stats()["lag_ms"] >= 0
+            return await _drain(subscriber), subscriber.stats()
+
+        events, stats = asyncio.run(run())
+
+        assert events[0]["type"] == "gap" and events[0]["dropped"] == 2
+        assert [event["message"] for event in events[1:]] == ["2", "3", "4"]
+        assert stats["dropped"] == 2 and stats["delivered"] == 3 and stats["queue_depth"] == 0
+
+    def test_coalesce_keeps_latest_per_mouse(self):
+        """Test only the latest entry of each mouse is kept."""
+        async def run():
+            subscriber = LogSubscriber(asyncio.get_running_loop(), policy="coalesce")
+            subscriber.deliver([
+                _entry("a1", "souris1"), _entry("b1", "souris2"), _entry("server"), _entry("a2", "souris1")
+            ])
+            return await _drain(subscriber), subscriber.stats()
+
+        events, stats = asyncio.run(run())
+
+        assert [event["message"] for event in events] == ["b1", "server", "a2"]
+        assert stats["coalesced"] == 1 and stats["dropped"] == 0
+
+    def test_sample(self):
+        """Test one entry out of N is kept."""
+        async def run():
+            subscriber = LogSubscriber(asyncio.get_running_loop(), policy="sample", sample_every=3)
+            subscriber.deliver([_entry(str(i)) for i in range(7)])
+            return await _drain(subscriber), subscriber.stats()
+
+        events, stats = asyncio.run(run())
+
+        assert [event["message"] for event in events] == ["0", "3", "6"]
+        assert stats["sampled_out"] == 4
+
+    def test_invalid_policy(self):
+        """Test unknown policies are rejected, also by the stream endpoint."""
+        loop = asyncio.new_event_loop()
+        try:
+            with pytest.raises(ValueError):
+                LogSubscriber(loop, policy="latest")
+        finally:
+            loop.close()
+
+        response = TestClient(app).get("/api/logs/stream", params={"policy": "latest"})
+        assert response.status_code == 400
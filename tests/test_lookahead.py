@@ -0,0 +1,65 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+# Corridor along the top row, the cheese at its far end
+GRID = [["path"] * 8, ["wall"] * 7 + ["path"]]
+
+
+def _request(**extra):
+    return {
+        "mouseId": "souris1",
+        "position": {"x": 0, "y": 0},
+        "environment": {"grid": GRID, "cheesePositions": [{"x": 7, "y": 0}]},
+        **extra
+    }
+
+
+class TestLookahead:
+    """Test cases for multi-step lookahead responses."""
+
+    def test_moves_follow_the_path(self):
+        """Test the response holds up to K moves, the first being the move."""
+        response = client.post("/api/move", json=_request(mouseId="lookahead1", horizon=4))
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["move"] == "east"
+        assert data["moves"] == ["east"] * 4
+
+    def test_moves_stop_at_the_goal(self):
+        """Test the plan is cut at the goal when the horizon is longer."""
+        data = client.post("/api/move", json=_request(mouseId="lookahead2", horizon=64)).json()
+
+        assert data["moves"] == ["east"] * 7
+
+    def test_plan_token(self):
+        """Test the token names the environment version, the goal and the layout."""
+        data = client.post("/api/move", json=_request(mouseId="lookahead3", horizon=2, environmentVersion=5)).json()
+
+        version, goal, digest = data["planToken"].split(":")
+        assert version == "5" and goal == "7,0" and len(digest) == 16
+
+        other = client.post("/api/move", json=_request(mouseId="lookahead4", horizon=2)).json()
+        assert other["planToken"].split(":")[2] == digest
+
+    def test_without_horizon(self):
+        """Test responses are unchanged when no horizon is asked."""
+        data = client.post("/api/move", json=_request(mouseId="lookahead5")).json()
+
+        assert data["moves"] is None and data["planToken"] is None
+
+    def test_horizon_bounds(self):
+        """Test out of range horizons are rejected."""
+        assert client.post("/api/move", json=_request(horizon=0)).status_code == 422
+        assert client.post("/api/move", json=_request(horizon=65)).status_code == 422
+
+    def test_move_channel(self):
+        """Test the WebSocket move channel also returns the lookahead."""
+        with client.websocket_connect("/api/ws/move") as ws:
+            ws.send_json({**_request(mouseId="lookahead6", horizon=3), "requestId": 1})
+            answer = ws.receive_json()
+
+        assert answer["moves"] == ["east"] * 3 and answer["planToken"]
@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+
+from app.core.grid import Grid
+from app.services.distance_fields import DistanceFieldStore, PaddedGrid, bfs_distances
+from app.services.maze_cache import MazeDiskCache
+
+GRID = Grid.from_labyrinth([
+    [0, 0, 0, 1],
+    [1, 1, 0, 1],
+    [0, 0, 0, 0]
+])
+
+
+class TestMazeDiskCache:
+    """Test cases for the on-disk maze artifact cache."""
+
+    def test_round_trip_is_memory_mapped(self, tmp_path):
+        """Test stored arrays are read back memory-mapped and read-only."""
+        cache = MazeDiskCache(str(tmp_path))
+        cache.store_field("ab" * 16, [1, 2], np.arange(6, dtype=np.int32))
+
+        field = cache.load_field("ab" * 16, [1, 2])
+
+        assert isinstance(field, np.memmap) and not field.flags.writeable
+        assert field.tolist() == [0, 1, 2, 3, 4, 5]
+        assert cache.load_field("ab" * 16, [2, 1]) is None
+        assert (tmp_path / "ab" / ("ab" * 16) / "field-1-2.npy").exists()
+
+    def test_writes_leave_no_temporary_files(self, tmp_path):
+        """Test files appear only once complete, under their final name."""
+        cache = MazeDiskCache(str(tmp_path))
+        cache.store_free("cd" * 16, np.ones((3, 4), dtype=np.uint8))
+        cache.store_free("cd" * 16, np.ones((3, 4), dtype=np.uint8))
+
+        files = [path.name for path in (tmp_path / "cd" / ("cd" * 16)).iterdir()]
+        assert files == ["free.npy"]
+
+    def test_eviction_by_total_size(self, tmp_path):
+        """Test the least recently used files are removed above max_bytes."""
+        field = np.zeros(1000, dtype=np.int32)
+        cache = MazeDiskCache(str(tmp_path))
+        cache.store_field("ef" * 16, [0, 0], field)
+        cache.max_bytes = 3 * cache.stats()["bytes"]
+        for x in range(1, 3):
+            cache.store_field("ef" * 16, [x, 0], field)
+        cache.load_field("ef" * 16, [0, 0])  # Most recently used from now on
+        os.utime(tmp_path / "ef" / ("ef" * 16) / "field-1-0.npy", (0, 0))
+
+        cache.store_field("ef" * 16, [3, 0], field)
+
+        assert cache.stats()["evicted"] == 1
+        assert cache.stats()["bytes"] <= cache.max_bytes
+        assert cache.load_field("ef" * 16, [1, 0]) is None
+        assert cache.load_field("ef" * 16, [0, 0]) is not None
+        assert cache.load_field("ef" * 16, [3, 0]) is not None
+
+    def test_corrupted_file_is_ignored(self, tmp_path):
+        """Test unreadable files are treated as missing."""
+        cache = MazeDiskCache(str(tmp_path))
+        path = tmp_path / "12" / ("12" * 16)
+        path.mkdir(parents=True)
+        (path / "free.npy").write_bytes(b"not an array")
+
+        assert cache.load_free("12" * 16) is None
+
+
+class TestDistanceFieldsOnDisk:
+    """Test cases for distance fields shared through the disk cache."""
+
+    def test_other_process_loads_instead_of_computing(self, tmp_path):
+        """Test a second store reads the fields written by the first one."""
+        first = DistanceFieldStore(disk=MazeDiskCache(str(tmp_path)))
+        computed = list(first.field(GRID, [3, 2]))
+
+        second = DistanceFieldStore(disk=MazeDiskCache(str(tmp_path)))
+        loaded = second.field(GRID, [3, 2])
+
+        assert list(loaded) == computed
+        assert second.stats()["computed"] == 0 and second.stats()["loaded"] == 1
+        assert second.distance_matrix(GRID, [[0, 0], [0, 2]], [[3, 2]]).tolist() == [[5], [3]]
+
+    def test_padded_grid_from_bitmap(self, tmp_path):
+        """Test the persisted passability bitmap gives the same BFS."""
+        DistanceFieldStore(disk=MazeDiskCache(str(tmp_path))).padded(GRID)
+
+        padded = DistanceFieldStore(disk=MazeDiskCache(str(tmp_path))).padded(GRID)
+
+        assert (padded.width, padded.height, padded.stride) == (4, 3, 6)
+        expected = PaddedGrid(GRID)
+        assert bytes(padded.free) == expected.free
+        assert list(bfs_distances(padded, padded.index([0, 0]))) == list(bfs_distances(expected, expected.index([0, 0])))
@@ -0,0 +1,157 @@
+import threading
+import time
+
+from app.core.grid import Grid
+from app.services.distance_fields import PaddedGrid, bfs_distances, bfs_parents, UNREACHABLE
+from app.services.mouse_ai_service import MouseAIService
+from app.services import path_trees
+from app.services.path_trees import PathTreeStore
+from app.services.single_flight import SingleFlight
+from benchmarks.corpus import build_case
+
+GRID = Grid.from_labyrinth([
+    [0, 0, 0, 1],
+    [1, 1, 0, 1],
+    [0, 0, 0, 0],
+    [0, 1, 1, 1]
+])
+
+
+class TestBfsParents:
+    """Test cases for the shortest-path tree of a cell."""
+
+    def test_parents_step_one_cell_closer(self):
+        """Test every reachable cell points to a neighbor one step closer to the root."""
+        padded = PaddedGrid(GRID)
+        root = padded.index([3, 2])
+        parents = bfs_parents(padded, root)
+        distances = bfs_distances(padded, root)
+
+        assert parents[root] == root
+        for i, parent in enumerate(parents):
+            if distances[i] == UNREACHABLE:
+                assert parent == UNREACHABLE
+            elif i != root:
+                assert distances[parent] == distances[i] - 1
+                assert abs(parent - i) in (1, padded.stride)
+
+    def test_wall_root(self):
+        """Test a tree rooted on a wall reaches nothing."""
+        padded = PaddedGrid(GRID)
+
+        assert set(bfs_parents(padded, padded.index([3, 0]))) == {UNREACHABLE}
+
+
+class TestPathTreeStore:
+    """Test cases for the per-cheese trees shared by the mice."""
+
+    def test_path_matches_astar_length(self):
+        """Test paths follow the tree and are as short as the A* ones."""
+        case = build_case("dfs", 61, 0)
+        grid = Grid.from_labyrinth(case.labyrinth)
+        store = PathTreeStore()
+
+        path = store.path(grid, case.start, case.cheeses[0])
+        expected = MouseAIService("reference")._find_path_astar(grid, case.start, case.cheeses[0])
+
+        assert path[0] == case.start and path[-1] == case.cheeses[0]
+        assert len(path) == len(expected)
+        assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+
+    def test_one_tree_per_cheese(self):
+        """Test every start position reuses the tree built for the cheese."""
+        store = PathTreeStore()
+
+        assert store.next_step(GRID, [0, 0], [3, 2]) == [1, 0]
+        assert store.next_step(GRID, [0, 3], [3, 2]) == [0, 2]
+        assert store.next_step(GRID, [3, 2], [3, 2]) == [3, 2]
+        assert store.path(GRID, [3, 0], [3, 2]) == []
+        assert store.stats()["built"] == 1 and store.stats()["hits"] == 3
+
+    def test_retain_drops_eaten_cheeses(self):
+        """Test trees of the cheeses missing from the request are dropped."""
+        store = PathTreeStore()
+        store.path(GRID, [0, 0], [3, 2])
+        store.path(GRID, [0, 0], [0, 3])
+
+        assert store.retain("sim1", GRID.digest, [[0, 3]]) == 1
+        assert store.stats()["trees"] == 1
+        assert store.retain("sim1", "other", [[0, 3]]) == 0
+
+    def test_retain_per_simulation(self):
+        """Test two simulations on one layout keep each other's trees."""
+        store = PathTreeStore()
+        store.path(GRID, [0, 0], [3, 2])
+        store.path(GRID, [0, 0], [0, 3])
+
+        assert store.retain("sim1", GRID.digest, [[3, 2]]) == 1  # Nobody else needs [0, 3] yet
+        store.path(GRID, [0, 0], [0, 3])
+        assert store.retain("sim2", GRID.digest, [[0, 3]]) == 0
+        assert store.retain("sim1", GRID.digest, [[3, 2]]) == 0
+        assert store.stats()["built"] == 3 and store.stats()["trees"] == 2
+
+        assert store.retain("sim2", GRID.digest, []) == 1
+        assert store.stats()["trees"] == 1
+
+    def test_lru_bound(self):
+        """Test the number of trees kept is bounded."""
+        store = PathTreeStore(max_trees=2)
+        for cheese in ([0, 0], [3, 2], [0, 3]):
+            store.path(GRID, [2, 0], cheese)
+
+        assert store.stats()["trees"] == 2
+        store.path(GRID, [2, 0], [0, 0])
+        assert store.stats()["built"] == 4
+
+    def test_rebase_keeps_unaffected_trees(self):
+        """Test a change outside the reachable area keeps the tree, others drop it."""
+        grid = Grid.from_labyrinth([[0, 0, 1, 0], [1, 0, 1, 0], [0, 0, 1, 0]])
+        store = PathTreeStore()
+        store.path(grid, [1, 2], [0, 0])
+
+        # The right column cannot be reached from the cheese
+        assert store.rebase(grid.digest, "walled", [(3, 1, True)]) == 0
+        assert store.stats()["trees"] == 1
+        assert store.rebase("walled", "opened", [(3, 0, True), (2, 0, True)]) == 0
+        assert store.rebase("opened", "blocked", [(1, 1, True)]) == 1
+        assert store.stats()["trees"] == 0
+
+    def test_concurrent_builds_coalesce(self, monkeypatch):
+        """Test mice asking at once for the same cheese wait for a single BFS."""
+        bfs_parents = path_trees.bfs_parents
+
+        def slow_bfs_parents(padded, source):
+            time.sleep(0.2)
+            return bfs_parents(padded, source)
+
+        monkeypatch.setattr(path_trees, "bfs_parents", slow_bfs_parents)
+        flight = SingleFlight()
+        store = PathTreeStore(flight=flight)
+        barrier = threading.Barrier(4)
+        paths = []
+
+        def follow(start):
+            barrier.wait()
+            paths.append(store.path(GRID, start, [3, 2]))
+
+        threads = [threading.Thread(target=follow, args=(start,)) for start in ([0, 0], [1, 0], [2, 0], [0, 3])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert len(paths) == 4 and all(path[-1] == [3, 2] for path in paths)
+        assert store.stats()["built"] == 1
+        assert flight.stats()["executions"] == 1
+        assert flight.stats()["calls"] + store.stats()["hits"] == 4
+
+    def test_mouse_ai_service_uses_trees(self):
+        """Test the intelligent move follows the shared tree instead of A*."""
+        store = PathTreeStore()
+        service = MouseAIService("test", path_trees=store)
+
+        next_position = service._intelligent_move(GRID, [0, 0], [3, 2])
+
+        assert next_position == [1, 0]
+        assert service.last_path == [[0, 0], [1, 0], [2, 0], [2, 1], [2, 2], [3, 2]]
+        assert service.nodes_expanded == 0 and store.stats()["built"] == 1
@@ -0,0 +1,148 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.grid import Grid
+from app.main import app
+from app.services.mouse_ai_service import MouseAIService
+from app.services.path_trees import PathTreeStore
+from app.services.planner import ASTAR, BOUNDED, GREEDY, PATH_TREE, PlannerSelector
+from benchmarks.corpus import build_case
+
+client = TestClient(app)
+
+
+class TestPlannerSelector:
+    """Test cases for the choice of a strategy from the latency budget."""
+
+    def test_no_budget_runs_the_exact_pipeline(self):
+        """Test path trees, or A* without them, run when no budget is set."""
+        selector = PlannerSelector()
+
+        assert selector.select(40000, missing_trees=3) == (PATH_TREE, None)
+        assert selector.select(40000) == (ASTAR, None)
+
+    def test_budget_degrades_the_strategy(self):
+        """Test larger mazes under the same budget get cheaper strategies."""
+        selector = PlannerSelector(default_budget_ms=5.0)
+
+        assert selector.select(10000, missing_trees=1)[0] == PATH_TREE
+        assert selector.select(10000, missing_trees=0, budget_ms=0.001)[0] == PATH_TREE  # Trees already built
+        assert selector.select(100, missing_trees=None)[0] == ASTAR
+        assert selector.select(40000, missing_trees=None) == (BOUNDED, 500)
+        assert selector.select(40000, missing_trees=None, budget_ms=0.1) == (GREEDY, None)
+        assert selector.stats()["selected"] == {PATH_TREE: 2, ASTAR: 1, BOUNDED: 1, GREEDY: 1}
+
+    def test_measured_costs(self):
+        """Test recorded runs move the cost estimates."""
+        selector = PlannerSelector(default_budget_ms=5.0, smoothing=1.0)
+        selector.record(ASTAR, 1000, 1.0)
+
+        assert selector.estimate(ASTAR, 4000) == pytest.approx(4.0)
+        assert selector.select(4000)[0] == ASTAR
+        selector.record(GREEDY, 1, 1.0)  # Not measured
+        assert set(selector.stats()["costs_ms"]) == {PATH_TREE, ASTAR}
+
+
+class TestStrategies:
+    """Test cases for the strategies run by MouseAIService."""
+
+    def test_bounded_search(self):
+        """Test a bounded search moves towards the goal within its node limit."""
+        case = build_case("dfs", 101, 0)
+        grid = Grid.from_labyrinth(case.labyrinth)
+        service = MouseAIService("test")
+
+        partial = service._search_path_bounded(grid, case.start, case.cheeses[0], 50)
+        assert service.nodes_expanded == 50
+        assert partial[0] == case.start and len(partial) > 1
+
+        full = service._search_path_bounded(grid, case.start, case.cheeses[0], grid.width * grid.height)
+        assert full[-1] == case.cheeses[0]
+        assert len(full) == len(service._find_path_astar(grid, case.start, case.cheeses[0]))
+
+    def test_anytime_search(self):
+        """Test the anytime search reports the bound of its path, or a partial path."""
+        open_grid = Grid.from_labyrinth([[0] * 20 for _ in range(20)])
+        service = MouseAIService("test")
+
+        path, bound = service._search_path_anytime(open_grid, [0, 0], [19, 19], 10000)
+        assert len(path) == 39 and bound == 1.0  # As long as the Manhattan distance
+
+        case = build_case("dfs", 101, 0)
+        grid = Grid.from_labyrinth(case.labyrinth)
+        path, bound = service._search_path_anytime(grid, case.start, case.cheeses[0], 100000)
+        assert path[-1] == case.cheeses[0] and bound >= 1.0
+        shortest = len(service._find_path_astar(grid, case.start, case.cheeses[0]))
+        assert len(path) <= bound * (shortest - 1) + 1
+
+        partial, bound = service._search_path_anytime(grid, case.start, case.cheeses[0], 20)
+        assert bound is None and partial[0] == case.start
+
+    def test_anytime_bound_tightens_with_equal_paths(self):
+        """Test every search reaching the goal tightens the bound, even without a shorter path."""
+        # The wall forces a detour: every weight finds the shortest path, 3 times the Manhattan distance
+        grid = Grid.from_labyrinth([
+            [0, 0, 1, 0, 0],
+            [0, 0, 1, 0, 0],
+            [0, 0, 1, 0, 0],
+            [0, 0, 1, 0, 0],
+            [0, 0, 0, 0, 0]
+        ])
+        service = MouseAIService("test")
+
+        path, bound = service._search_path_anytime(grid, [1, 0], [3, 0], 10000)
+
+        assert len(path) == len(service._find_path_astar(grid, [1, 0], [3, 0])) == 11
+        assert bound == 1.0
+
+    def test_deadline(self):
+        """Test a search stops at its deadline whatever its node limit."""
+        case = build_case("dfs", 201, 0)
+        grid = Grid.from_labyrinth(case.labyrinth)
+        service = MouseAIService("test")
+
+        service._search_path_anytime(grid, case.start, case.cheeses[0], 10 ** 9, deadline=time.perf_counter())
+
+        assert service.nodes_expanded == 256
+
+    def test_reported_strategy(self):
+        """Test the service reports the strategy that ran, greedy after a failed search."""
+        grid = Grid.from_labyrinth([[0, 0, 0], [1, 1, 1], [0, 0, 0]])
+        service = MouseAIService("test", path_trees=PathTreeStore())
+
+        service.calculate_next_position(grid, [0, 0], [2, 0])
+        assert service.last_strategy == PATH_TREE and service.last_bound == 1.0
+        service.calculate_next_position(grid, [0, 0], [2, 0], strategy=BOUNDED, node_limit=10)
+        assert service.last_strategy == BOUNDED and service.last_path == [[0, 0], [1, 0], [2, 0]]
+        walled = Grid.from_labyrinth([[0, 0, 1, 0]])
+        service.calculate_next_position(walled, [0, 0], [3, 0], strategy=ASTAR)
+        assert service.last_strategy == GREEDY and service.last_bound is None
+
+
+class TestBudgetHeader:
+    """Test cases for the latency budget of POST /api/move."""
+
+    @staticmethod
+    def _request(mouse_id, cheese_x=7):
+        grid = [["path"] * 8, ["wall"] * 7 + ["path"]]
+        return {
+            "mouseId": mouse_id,
+            "position": {"x": 0, "y": 0},
+            "environment": {"grid": grid, "cheesePositions": [{"x": cheese_x, "y": 0}]}
+        }
+
+    def test_strategy_in_response(self):
+        """Test the response names the strategy, degraded by a tiny budget."""
+        exact = client.post("/api/move", json=self._request("budget1")).json()
+        degraded = client.post("/api/move", json=self._request("budget2", cheese_x=6), headers={"X-Move-Budget-Ms": "0.000001"}).json()
+
+        assert exact["strategy"] == PATH_TREE and exact["optimalityBound"] == 1.0
+        assert degraded["strategy"] == GREEDY and degraded["move"] == "east"
+
+    def test_invalid_budget(self):
+        """Test a non-positive budget is rejected."""
+        response = client.post("/api/move", json=self._request("budget3"), headers={"X-Move-Budget-Ms": "0"})
+
+        assert response.status_code == 422
@@ -0,0 +1,84 @@
+import pytest
+
+from app.services.mouse_ai_service import MouseAIService
+from app.services.position_history import PositionHistory, pack_position, unpack_position
+
+
+class TestPositionHistory:
+    """Test cases for the fixed-size position ring."""
+
+    def test_pack_round_trip(self):
+        """Test positions survive packing, including out-of-grid ones."""
+        for position in ([0, 0], [3, 7], [-1, 2], [100000, 5]):
+            assert unpack_position(pack_position(position)) == position
+
+    def test_ring_keeps_last_positions(self):
+        """Test the oldest entries are overwritten once full."""
+        history = PositionHistory(capacity=4)
+        for x in range(6):
+            history.append([x, 0])
+
+        assert len(history) == 4
+        assert list(history) == [[2, 0], [3, 0], [4, 0], [5, 0]]
+        assert history[-1] == [5, 0]
+        assert history[0] == [2, 0]
+        with pytest.raises(IndexError):
+            history[-5]
+
+    def test_repeats(self):
+        """Test trailing repetitions of a position."""
+        history = PositionHistory()
+        for position in ([0, 0], [1, 0], [1, 0], [1, 0]):
+            history.append(position)
+
+        assert history.repeats([1, 0]) == 3
+        assert history.repeats([0, 0]) == 0
+        history.clear()
+        assert history.repeats([1, 0]) == 0
+
+    def test_cycle_length(self):
+        """Test cycles are detected after two laps only."""
+        history = PositionHistory()
+        square = [[0, 0], [1, 0], [1, 1], [0, 1]]
+        for position in square + square[:3]:
+            history.append(position)
+
+        assert history.cycle_length([0, 1]) == 4
+        assert history.cycle_length([2, 1]) == 0
+        history.clear()
+        for position in ([0, 0], [1, 0], [0, 0]):
+            history.append(position)
+        assert history.cycle_length([1, 0]) == 2
+
+    def test_waiting_is_not_a_cycle(self):
+        """Test staying in place is reported by repeats only."""
+        history = PositionHistory()
+        for _ in range(6):
+            history.append([2, 2])
+
+        assert history.cycle_length([2, 2]) == 0
+        assert history.repeats([2, 2]) == 6
+
+
+class TestStuckDetection:
+    """Test cases for the history checks of the mouse AI."""
+
+    def test_is_stuck(self):
+        """Test a mouse on the same cell for three turns is stuck."""
+        service = MouseAIService("m")
+        for _ in range(3):
+            service._update_position_history([1, 1], [1, 1])
+
+        assert service._is_stuck("m", [1, 1])
+        assert not service._is_stuck("m", [2, 1])
+
+    def test_cycle_follows_shortest_path(self):
+        """Test a looping mouse follows its A* path even if it goes back."""
+        labyrinth = [[0, 0, 0], [0, 1, 0], [0, 0, 0]]
+        service = MouseAIService("m")
+        for position in ([0, 0], [1, 0], [0, 0]):
+            service._update_position_history(position, position)
+
+        next_position = service.calculate_next_position(labyrinth, [1, 0], [0, 2], "m")
+
+        assert next_position == [0, 0]
@@ -0,0 +1,147 @@
+from fastapi.testclient import TestClient
+
+from app.api import routes_mouse
+from app.main import app
+from app.services.mouse_ai_service import MouseAIService
+from app.services.reservations import ReservationRegistry, ReservationTable
+from app.services.simulation import Simulation
+
+client = TestClient(app)
+
+CORRIDOR = [[0] * 5, [1, 1, 0, 1, 1]]
+
+
+class TestReservationTable:
+    """Test cases for the space-time reservation table."""
+
+    def test_reserve_path_and_expiry(self):
+        """Test cells are reserved per tick and expire as ticks advance."""
+        table = ReservationTable(horizon=2)
+        table.reserve_path("a", [[0, 0], [1, 0]], start_tick=0)
+
+        assert table.owner([0, 0], 0) == "a"
+        assert table.owner([1, 0], 1) == "a"
+        # The last cell is held until the end of the horizon
+        assert table.owner([1, 0], 2) == "a"
+        assert table.has_plan("a", 2) and not table.has_plan("a", 3)
+
+        table.advance(2)
+        assert table.owner([0, 0], 0) is None
+        assert table.owner([1, 0], 1) == "a"
+        assert len(table) == 2
+
+    def test_first_come_first_served(self):
+        """Test a later plan does not take cells reserved by another mouse."""
+        table = ReservationTable(horizon=1)
+        table.reserve_position("a", [1, 0], tick=0)
+        table.reserve_path("b", [[0, 0], [1, 0]], start_tick=0)
+
+        assert table.owner([1, 0], 1) == "a"
+        # Replacing a plan releases the previous reservations
+        table.reserve_position("a", [2, 0], tick=0)
+        assert table.owner([1, 0], 1) is None
+
+    def test_release_cleans_tick_index(self):
+        """Test replaced reservations leave no key behind in the per-tick index."""
+        table = ReservationTable(horizon=2)
+        table.reserve_path("a", [[0, 0], [1, 0]], start_tick=0)
+        table.reserve_path("a", [[5, 0]], start_tick=10)
+
+        assert set(table._by_tick) == {10, 11, 12}
+        assert all(key[:2] == (5, 0) for keys in table._by_tick.values() for key in keys)
+
+    def test_conflicts(self):
+        """Test vertex and swap conflicts."""
+        table = ReservationTable()
+        table.reserve_path("a", [[1, 0], [0, 0]], start_tick=0)
+
+        assert table.conflicts("b", [2, 0], [0, 0], tick=0)
+        # b at (0, 0) moving to (1, 0) would swap cells with a
+        assert table.conflicts("b", [0, 0], [1, 0], tick=0)
+        assert not table.conflicts("b", [2, 0], [3, 0], tick=0)
+        assert not table.conflicts("a", [1, 0], [0, 0], tick=0)
+
+    def test_registry_evicts_least_recently_used(self):
+        """Test the registry keeps a bounded number of tables."""
+        registry = ReservationRegistry(max_simulations=2)
+        first = registry.table("s1")
+        registry.table("s2")
+        registry.table("s1")
+        registry.table("s3")
+
+        assert registry.table("s1") is first
+        assert registry.table("s2") is not None
+        assert len(registry._tables) == 2
+
+
+class TestCollisionAvoidance:
+    """Test cases for mice avoiding each other's reserved cells."""
+
+    def test_waits_for_reserved_cell(self):
+        """Test a mouse waits rather than entering a cell reserved by another mouse."""
+        table = ReservationTable()
+        table.reserve_position("other", [1, 0], tick=0)
+        service = MouseAIService("m")
+
+        next_position = service.calculate_next_position(
+            CORRIDOR, [0, 0], [4, 0], mouse_id="m", reservations=table, tick=0
+        )
+
+        assert next_position == [0, 0]
+        assert table.owner([0, 0], 1) == "m"
+
+    def test_simulation_without_collisions(self):
+        """Test two mice heading for the same corridor cell never share it."""
+        labyrinth = [[0] * 7, [1, 1, 1, 0, 1, 1, 1]]
+        simulation = Simulation(
+            labyrinth, [[3, 1]], {"m1": [2, 0], "m2": [4, 0]}, reservations=ReservationTable()
+        )
+        shared = []
+        simulation.add_hook(
+            "tick_end",
+            lambda sim, stats: shared.append(len({tuple(m.position) for m in sim.mice.values()}) < len(sim.mice))
+        )
+
+        summary = simulation.run(max_ticks=30)
+
+        assert summary["cheeses_left"] == 0
+        assert not any(shared)
+
+    def test_route_reserves_other_mice(self):
+        """Test /api/move does not step onto a cell held by another mouse."""
+        payload = {
+            "mouseId": "souris31",
+            "simulationId": "reservations-test",
+            "environmentVersion": 1,
+            "position": {"x": 0, "y": 0},
+            "environment": {
+                "grid": [["path"] * 3],
+                "cheesePositions": [{"x": 2, "y": 0}],
+                "otherMice": [{"id": "souris32", "position": {"x": 1, "y": 0}}]
+            }
+        }
+
+        response = client.post("/api/move", json=payload)
+
+        assert response.status_code == 200
+        assert response.json()["move"] != "east"
+
+    def test_route_without_simulation_reserves_nothing(self):
+        """Test unversioned requests or requests without simulationId share no reservation table."""
+        tables = len(routes_mouse.reservation_registry._tables)
+        payload = {
+            "mouseId": "souris33",
+            "environmentVersion": 1,
+            "position": {"x": 0, "y": 0},
+            "environment": {
+                "grid": [["path"] * 3],
+                "cheesePositions": [{"x": 2, "y": 0}],
+                "otherMice": [{"id": "souris34", "position": {"x": 2, "y": 0}}]
+            }
+        }
+
+        assert client.post("/api/move", json=payload).status_code == 200
+        payload.pop("environmentVersion")
+        payload["simulationId"] = "unversioned-test"
+        assert client.post("/api/move", json=payload).status_code == 200
+        assert len(routes_mouse.reservation_registry._tables) == tables
@@ -0,0 +1,73 @@
+import json
+from datetime import datetime
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.core.serialization import SSEFrameCache, Timestamp, dumps, iso_timestamp, iso_timestamp_ns, sse_frame
+from app.main import app
+
+client = TestClient(app)
+
+
+class TestSerialization:
+    """Test cases for the shared serialization layer."""
+
+    def test_dumps_is_compact_json(self):
+        """Test output round-trips through json and extra types are encoded."""
+        value = {"a": [1, 2], "when": datetime(2024, 5, 1, 12, 30), "cells": (1, 2), "n": np.int64(3), "s": "é"}
+
+        encoded = dumps(value)
+
+        assert b" " not in encoded.replace("é".encode(), b"")
+        assert json.loads(encoded) == {"a": [1, 2], "when": "2024-05-01T12:30:00", "cells": [1, 2], "n": 3, "s": "é"}
+
+    def test_sse_frame(self):
+        """Test SSE frames are data lines terminated by a blank line."""
+        assert sse_frame({"type": "log"}) == b'data: {"type":"log"}\n\n'
+
+    def test_frame_cache_encodes_entry_once(self):
+        """Test frames are shared per entry and bounded."""
+        cache = SSEFrameCache(max_entries=2)
+        first, second, third = {"i": 1}, {"i": 2}, {"i": 3}
+
+        frame = cache.frame(first)
+        assert cache.frame(first) is frame
+        cache.frame(second)
+        cache.frame(third)
+
+        assert cache.stats() == {"size": 2, "hits": 1, "misses": 3}
+        assert cache.frame(first) == frame
+
+    def test_iso_timestamp_matches_isoformat(self):
+        """Test cached timestamps equal datetime.isoformat()."""
+        for timestamp in (1700000000.0, 1700000000.5, 1700000000.123456, 1700000001.9999996):
+            assert iso_timestamp(timestamp) == datetime.fromtimestamp(timestamp).isoformat()
+
+    def test_timestamps_are_formatted_when_serialized(self):
+        """Test nanosecond timestamps serialize to the same ISO strings."""
+        for timestamp_ns in (1700000000_000000000, 1700000000_123456789, 1700000001_999999999):
+            expected = datetime.fromtimestamp(timestamp_ns // 1000 / 1e6).isoformat()
+            assert iso_timestamp_ns(timestamp_ns) == expected
+            assert dumps({"timestamp": Timestamp(timestamp_ns)}) == f'{{"timestamp":"{expected}"}}'.encode()
+
+    def test_timestamps_in_pydantic_models(self):
+        """Test Timestamp fields of pydantic models serialize to ISO strings."""
+        class Entry(BaseModel):
+            timestamp: Timestamp
+
+        timestamp_ns = 1700000000_123456789
+        entry = Entry(timestamp=timestamp_ns)
+
+        assert entry.timestamp == Timestamp(timestamp_ns)
+        assert jsonable_encoder(entry) == {"timestamp": iso_timestamp_ns(timestamp_ns)}
+        assert entry.model_dump_json() == f'{{"timestamp":"{iso_timestamp_ns(timestamp_ns)}"}}'
+
+    def test_responses_use_shared_serializer(self):
+        """Test endpoints render compact JSON through the default response class."""
+        response = client.get("/api/logs/history")
+
+        assert response.status_code == 200
+        assert response.content.startswith(b'{"success":true,"logs":')
@@ -0,0 +1,124 @@
+import multiprocessing
+import uuid
+
+import numpy as np
+import pytest
+
+from app.core.grid import Grid
+from app.services.distance_fields import DistanceFieldStore, bfs_distances, PaddedGrid
+from app.services.mouse_ai_service import MouseAIService
+from app.services.shared_mazes import SharedMazeRegistry
+
+GRID = Grid.from_labyrinth([
+    [0, 0, 0, 1],
+    [1, 1, 0, 1],
+    [0, 0, 0, 0]
+])
+
+
+@pytest.fixture
+def registries(tmp_path):
+    """Two registries standing for two workers, with their own segment prefix."""
+    prefix = f"t{uuid.uuid4().hex[:6]}-"
+    created = [SharedMazeRegistry(prefix=prefix, field_capacity=4, lock_path=str(tmp_path / "lock")) for _ in range(2)]
+    yield created
+    for registry in created:
+        registry.close()
+
+
+def _field_sum(prefix, lock_path, digest, cheese):
+    registry = SharedMazeRegistry(prefix=prefix, lock_path=lock_path)
+    maze = registry.attach(digest)
+    total = int(maze.field(cheese).sum())
+    registry.close()
+    return total
+
+
+class TestSharedMazeRegistry:
+    """Test cases for mazes published in shared memory."""
+
+    def test_attach_by_digest(self, registries):
+        """Test another registry sees the grid and the fields of the publisher."""
+        first, second = registries
+        maze = first.publish(GRID)
+        field = bfs_distances(PaddedGrid(GRID), PaddedGrid(GRID).index([3, 2]))
+        first.add_field(maze, [3, 2], field)
+
+        attached = second.attach(GRID.digest)
+
+        assert attached.grid == GRID and attached.grid.digest == GRID.digest
+        assert attached.free.tolist() == PaddedGrid(GRID).bitmap().tolist()
+        assert attached.field([3, 2]).tolist() == list(field)
+        assert not attached.field([3, 2]).flags.writeable
+        assert second.stats() == {"mazes": 1, "fields": 1, "published": 0, "attached": 1}
+
+    def test_views_are_zero_copy(self, registries):
+        """Test a field published later is visible through the same segment."""
+        first, second = registries
+        maze = first.publish(GRID)
+        attached = second.publish(GRID)
+        assert attached.field([0, 0]) is None
+
+        first.add_field(maze, [0, 0], np.arange(30, dtype=np.int32))
+
+        assert attached.field([0, 0])[29] == 29
+        assert attached.cells.ctypes.data != maze.cells.ctypes.data  # Two mappings of the same pages
+        assert second.published == 0
+
+    def test_reference_counting(self, registries):
+        """Test the segment is unlinked by the last process releasing it."""
+        first, second = registries
+        first.publish(GRID)
+        second.attach(GRID.digest)
+
+        assert not first.release(GRID.digest)
+        assert second.release(GRID.digest)
+        assert first.attach(GRID.digest) is None
+
+    def test_capacity_limits(self, registries):
+        """Test full field slots and too many mazes fall back to private copies."""
+        first, _ = registries
+        first.max_mazes = 1
+        maze = first.publish(GRID)
+        field = np.zeros(30, dtype=np.int32)
+        assert all(first.add_field(maze, [x, 0], field) is not None for x in range(4))
+
+        assert first.add_field(maze, [0, 2], field) is None
+        assert first.publish(Grid.from_labyrinth([[0, 0]])) is None
+
+    def test_grid_is_usable_by_mouse_ai_service(self, registries):
+        """Test pathfinding runs on the shared grid rows."""
+        first, _ = registries
+        grid = first.publish(GRID).grid
+
+        path = MouseAIService("test")._find_path_astar(grid, [0, 0], [3, 2])
+
+        assert path == [[0, 0], [1, 0], [2, 0], [2, 1], [2, 2], [3, 2]]
+
+    def test_other_process(self, registries, tmp_path):
+        """Test a spawned process attaches to the segment and reads a field."""
+        first, _ = registries
+        maze = first.publish(GRID)
+        first.add_field(maze, [1, 1], np.arange(30, dtype=np.int32))
+
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(1) as pool:
+            total = pool.apply(_field_sum, (first.prefix, first.lock_path, GRID.digest, [1, 1]))
+
+        assert total == sum(range(30))
+        assert first.attach(GRID.digest) is maze
+
+
+class TestDistanceFieldsInSharedMemory:
+    """Test cases for distance fields shared between stores."""
+
+    def test_second_worker_reuses_fields(self, registries):
+        """Test a store attached to the same segment does not recompute fields."""
+        first, second = registries
+        computed = list(DistanceFieldStore(shared=first).field(GRID, [3, 2]))
+
+        store = DistanceFieldStore(shared=second)
+
+        assert list(store.field(GRID, [3, 2])) == computed
+        assert store.stats()["computed"] == 0 and store.stats()["loaded"] == 1
+        assert store.distance_matrix(GRID, [[0, 0]], [[3, 2]]).tolist() == [[5]]
@@ -0,0 +1,62 @@
+import pytest
+
+from app.services import mouse_ai_service
+from app.services.simulation import Simulation
+
+
+class TestSimulation:
+    """Test cases for the headless simulation engine."""
+
+    labyrinth = [
+        [0, 0, 0, 0],
+        [0, 1, 1, 0],
+        [0, 0, 0, 0]
+    ]
+
+    def test_mouse_reaches_and_eats_cheese(self):
+        """Test a single mouse walks to the cheese and consumes it."""
+        simulation = Simulation(self.labyrinth, [[3, 0]], {"m1": [0, 0]})
+
+        summary = simulation.run(max_ticks=20)
+
+        assert simulation.finished
+        assert summary["ticks"] == 3
+        assert summary["mice"]["m1"]["cheese_found"] == 1
+        assert summary["mice"]["m1"]["position"] == [3, 0]
+
+    def test_hooks_receive_tick_timings(self):
+        """Test tick hooks are called with per-tick stats."""
+        simulation = Simulation(self.labyrinth, [[3, 2], [0, 2]], {"m1": [0, 0], "m2": [3, 0]})
+        started, ended, decisions = [], [], []
+        simulation.add_hook("tick_start", lambda sim, tick: started.append(tick))
+        simulation.add_hook("decision", lambda sim, mouse, pos, seconds: decisions.append(mouse.mouse_id))
+        simulation.add_hook("tick_end", lambda sim, stats: ended.append(stats))
+
+        simulation.step()
+
+        assert started == [0]
+        assert decisions == ["m1", "m2"]
+        assert ended[0].tick == 0 and ended[0].moved == 2
+        assert ended[0].duration >= ended[0].decision_time > 0
+
+    def test_mice_share_the_simulation_stores(self, monkeypatch):
+        """Test the mice follow shared path trees and skip the log service by default."""
+        logged = []
+        monkeypatch.setattr(mouse_ai_service.log_service, "add_custom_log", lambda *args, **kwargs: logged.append(kwargs))
+        simulation = Simulation(self.labyrinth, [[3, 2]], {"m1": [0, 0], "m2": [3, 0]})
+
+        simulation.run(max_ticks=20)
+
+        assert simulation.finished and not logged
+        assert simulation.path_trees.stats()["built"] == 1
+        assert all(m.service.path_trees is simulation.path_trees for m in simulation.mice.values())
+
+        Simulation(self.labyrinth, [[3, 2]], {"m1": [0, 0]}, log_decisions=True).step()
+        assert [entry["action"] for entry in logged] == ["ai_calculation_start", "ai_calculation_complete"]
+
+    def test_rejects_mouse_on_wall(self):
+        """Test mice cannot be placed on walls."""
+        simulation = Simulation(self.labyrinth, [[3, 0]])
+
+        with pytest.raises(ValueError):
+            simulation.add_mouse("m1", [1, 1])
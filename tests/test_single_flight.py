@@ -0,0 +1,146 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.grid import Grid
+from app.api import routes_mouse
+from app.main import app
+from app.services.mouse_ai_service import MouseAIService
+from app.services.path_cache import PathCache
+from app.services.single_flight import SingleFlight
+from benchmarks.corpus import build_case
+
+
+class TestSingleFlight:
+    """Test cases for the coalescing of identical concurrent calls."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test callers arriving during a computation get its result."""
+        flight = SingleFlight()
+        release = threading.Event()
+        results = []
+
+        def compute():
+            release.wait(timeout=5)
+            return "path"
+
+        def caller():
+            results.append(flight.do("key", compute))
+
+        leader = threading.Thread(target=caller)
+        leader.start()
+        while not flight.stats()["in_flight"]:
+            pass
+        followers = [threading.Thread(target=caller) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        while flight.stats()["coalesced"] < 4:
+            pass
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(timeout=5)
+
+        assert results == ["path"] * 5
+        assert flight.stats() == {"calls": 5, "executions": 1, "coalesced": 4, "in_flight": 0, "coalescing_ratio": 0.8}
+
+    def test_errors_reach_every_caller(self):
+        """Test an exception of the computation is raised in waiting callers too."""
+        flight = SingleFlight()
+        release = threading.Event()
+        errors = []
+
+        def compute():
+            release.wait(timeout=5)
+            raise ValueError("no path")
+
+        def caller():
+            try:
+                flight.do("key", compute)
+            except ValueError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=caller) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while flight.stats()["calls"] < 3:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert errors == ["no path"] * 3
+        with pytest.raises(ValueError):
+            flight.do("key", compute)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Test a key is only shared while its computation runs."""
+        flight = SingleFlight()
+
+        assert flight.do("a", lambda: 1) == 1
+        assert flight.do("a", lambda: 2) == 2
+        assert flight.stats()["executions"] == 2 and flight.stats()["coalesced"] == 0
+
+
+class TestCoalescedPathfinding:
+    """Test cases for the single-flight layer of MouseAIService."""
+
+    def test_identical_searches_run_once(self):
+        """Test mice asking for the same path at once share one A* search."""
+        case = build_case("dfs", 101, 0)
+        grid = Grid.from_labyrinth(case.labyrinth)
+        cache, flight = PathCache(), SingleFlight()
+        services = [MouseAIService(f"m{i}", path_cache=cache, path_flight=flight) for i in range(8)]
+        paths = {}
+        barrier = threading.Barrier(len(services))
+
+        def search(service):
+            barrier.wait()
+            paths[service.mouse_id] = service._find_path_astar(grid, case.start, case.cheeses[0])
+
+        threads = [threading.Thread(target=search, args=(service,)) for service in services]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        expected = MouseAIService("reference")._find_path_astar(grid, case.start, case.cheeses[0])
+        assert all(path == expected for path in paths.values())
+        searches = sum(1 for service in services if service.nodes_expanded)
+        assert searches == 1
+        paths["m0"].append([0, 0])  # Every caller owns its copy
+        assert paths["m1"] == expected
+
+    def test_http_moves_run_concurrently(self, monkeypatch):
+        """Test POST /api/move computes off the event loop, so identical requests can overlap."""
+        barrier = threading.Barrier(2, timeout=5)
+        compute_move = routes_mouse.compute_move
+
+        def overlapping_compute_move(request, **kwargs):
+            barrier.wait()  # Broken (BrokenBarrierError) if the two requests run one after the other
+            return compute_move(request, **kwargs)
+
+        monkeypatch.setattr(routes_mouse, "compute_move", overlapping_compute_move)
+        body = {
+            "mouseId": "concurrent",
+            "position": {"x": 0, "y": 0},
+            "environment": {"grid": [["path"] * 4], "cheesePositions": [{"x": 3, "y": 0}]}
+        }
+
+        async def post_twice():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                return await asyncio.gather(*(http.post("/api/move", json=body) for _ in range(2)))
+
+        responses = asyncio.run(post_twice())
+
+        assert [response.json()["move"] for response in responses] == ["east", "east"]
+
+    def test_stats_endpoint(self):
+        """Test the counters are exposed by the API."""
+        data = TestClient(app).get("/api/pathfinding/stats").json()
+
+        assert set(data) == {"path_cache", "coalescing", "path_trees", "distance_fields", "components", "planner"}
+        assert "coalescing_ratio" in data["coalescing"]
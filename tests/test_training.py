@@ -0,0 +1,57 @@
+import random
+
+from app.core.maze_generator import generate_dfs_maze, random_free_cells
+from app.training.dataset import encode_state, load_manifest, load_shard
+from app.training.generate_dataset import generate_dataset
+
+
+class TestMazeGenerator:
+    """Test cases for random maze generation."""
+
+    def test_dfs_maze_is_deterministic_and_walled(self):
+        """Test same seed gives same maze with a closed border."""
+        maze = generate_dfs_maze(11, 9, random.Random(3))
+
+        assert maze == generate_dfs_maze(11, 9, random.Random(3))
+        assert all(cell == 1 for cell in maze[0] + maze[-1])
+        assert all(row[0] == 1 and row[-1] == 1 for row in maze)
+
+    def test_random_free_cells_excludes_positions(self):
+        """Test picked cells are free and not excluded."""
+        maze = generate_dfs_maze(9, 9, random.Random(1))
+        excluded = [[1, 1]]
+        cells = random_free_cells(maze, 5, random.Random(2), exclude=excluded)
+
+        assert len(cells) == 5
+        assert all(maze[y][x] == 0 and [x, y] not in excluded for x, y in cells)
+
+
+class TestDatasetGeneration:
+    """Test cases for the self-play dataset writer."""
+
+    config = {
+        "width": 9, "height": 9, "loop_factor": 0.1, "mice": 2, "cheeses": 3,
+        "max_steps": 30, "view_radius": 2, "episodes_per_shard": 1, "seed": 7
+    }
+
+    def test_encode_state_marks_outside_as_wall(self):
+        """Test the egocentric view pads the border with walls."""
+        state = encode_state([[0, 0], [0, 0]], [0, 0], [[1, 1]], [], view_radius=1)
+
+        assert state.shape == (3, 3, 3)
+        assert state[0, 0].tolist() == [1, 1, 1]
+        assert state[0, 1].tolist() == [1, 0, 0]
+        assert state[1, 2, 2] == 1
+
+    def test_generate_and_resume(self, tmp_path):
+        """Test shards are written once and reused when resuming."""
+        manifest = generate_dataset(str(tmp_path), 2, 1, self.config)
+        first_run = {e["index"]: e["seconds"] for e in manifest["shards"]}
+
+        manifest = generate_dataset(str(tmp_path), 3, 1, self.config)
+
+        assert len(manifest["shards"]) == 3
+        assert {e["index"]: e["seconds"] for e in manifest["shards"][:2]} == first_run
+        arrays = load_shard(str(tmp_path), manifest["shards"][0])
+        assert len(arrays["states"]) == len(arrays["actions"]) == manifest["shards"][0]["samples"]
+        assert load_manifest(str(tmp_path))["total_samples"] == manifest["total_samples"]
@@ -0,0 +1,68 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+REGISTER = {
+    "type": "register",
+    "simulationId": "ws-test",
+    "environmentVersion": 1,
+    "environment": {"grid": [["path"] * 5, ["path", "wall", "wall", "wall", "path"]], "cheesePositions": [{"x": 4, "y": 0}]}
+}
+
+
+class TestMoveChannel:
+    """Test cases for the WebSocket move channel."""
+
+    def test_register_then_pipelined_moves(self):
+        """Test moves for several mice are answered with their request ids."""
+        with client.websocket_connect("/api/ws/move") as ws:
+            ws.send_json(REGISTER)
+            assert ws.receive_json() == {
+                "type": "registered", "simulationId": "ws-test", "environmentVersion": 1, "gridFormat": "cells"
+            }
+
+            for i in range(4):
+                ws.send_json({"requestId": f"r{i}", "mouseId": f"souris{i}", "position": {"x": i, "y": 0}})
+            answers = {answer["requestId"]: answer for answer in (ws.receive_json() for _ in range(4))}
+
+        assert set(answers) == {"r0", "r1", "r2", "r3"}
+        assert all(answer["type"] == "move" and answer["move"] == "east" for answer in answers.values())
+        assert answers["r2"]["mouseId"] == "souris2" and answers["r2"]["environmentVersion"] == 1
+
+    def test_update_and_resync(self):
+        """Test cell diffs update the registered environment."""
+        with client.websocket_connect("/api/ws/move") as ws:
+            ws.send_json({**REGISTER, "simulationId": "ws-update"})
+            ws.receive_json()
+
+            ws.send_json({"type": "update", "environmentVersion": 2, "cellDiffs": [{"x": 3, "y": 0, "cell": "wall"}]})
+            assert ws.receive_json() == {"type": "updated", "environmentVersion": 2}
+            ws.send_json({"requestId": 1, "mouseId": "souris1", "position": {"x": 2, "y": 0}})
+            answer = ws.receive_json()
+            assert answer["environmentVersion"] == 2 and answer["move"] != "east"
+
+            ws.send_json({"type": "update", "environmentVersion": 7, "baseVersion": 6, "cellDiffs": []})
+            assert ws.receive_json()["type"] == "resync_needed"
+
+    def test_full_environment_move(self):
+        """Test a move carrying its own grid works without registration."""
+        with client.websocket_connect("/api/ws/move") as ws:
+            ws.send_json({"requestId": 7, "mouseId": "souris1", "position": {"x": 0, "y": 0}, "environment": REGISTER["environment"]})
+            answer = ws.receive_json()
+
+        assert answer["requestId"] == 7 and answer["move"] == "east"
+
+    def test_errors(self):
+        """Test invalid messages are answered without closing the connection."""
+        with client.websocket_connect("/api/ws/move") as ws:
+            ws.send_json({"requestId": 1, "mouseId": "souris1", "position": {"x": 0, "y": 0}})
+            assert ws.receive_json() == {
+                "type": "error", "status": 409, "requestId": 1,
+                "detail": "Register an environment before sending moves without a grid"
+            }
+            ws.send_text("{not json")
+            assert ws.receive_json()["status"] == 400
+            ws.send_json({"type": "teleport"})
+            assert ws.receive_json()["status"] == 400